@@ -0,0 +1,103 @@
+# Memory blocks allocated and time per converted line, before and after
+# writing `m_log.Log` tuples with a positional csv writer.
+from pathlib import Path
+from timeit import timeit
+from typing import Callable, List, Tuple
+import csv
+import io
+import sys
+
+project_main_path = Path(__file__).parent.parent.parent.parent
+sys.path.append(str(project_main_path.joinpath("python", "src")))
+
+import m_log  # noqa: E402
+
+LINE = (
+    '8.8.8.8 - abc [28/Nov/2021:00:18:22 +0100] "GET /foo/bar HTTP/1.1" 200 77 "-"'
+    ' "Mozilla/5.0 (Windows NT 10.0; WOW64) AppleWebKit/537.36'
+    ' (KHTML, like Gecko) Chrome/51.0.2704.103 Safari/537.36"'
+)
+NUMBER_OF_LINES = 100_000
+
+
+class LogWithDict:
+    # The `Log` class before being a tuple.
+    def __init__(
+        self,
+        remote_addr: str,
+        remote_user: str,
+        time_local: str,
+        request: str,
+        status: str,
+        body_bytes_sent: str,
+        http_referer: str,
+        http_user_agent: str,
+    ):
+        self.remote_addr = remote_addr
+        self.remote_user = remote_user
+        self.time_local = time_local
+        self.request = request
+        self.status = status
+        self.body_bytes_sent = body_bytes_sent
+        self.http_referer = http_referer
+        self.http_user_agent = http_user_agent
+
+    def asdict(self) -> dict:
+        return {
+            "remote_addr": self.remote_addr,
+            "remote_user": self.remote_user,
+            "time_local": self.time_local,
+            "request": self.request,
+            "status": self.status,
+            "body_bytes_sent": self.body_bytes_sent,
+            "http_referer": self.http_referer,
+            "http_user_agent": self.http_user_agent,
+        }
+
+
+def get_row_before(values: Tuple[str, ...]) -> Tuple[object, dict]:
+    log = LogWithDict(*values)
+    return log, log.asdict()
+
+
+def get_row_after(values: Tuple[str, ...]) -> Tuple[object, tuple]:
+    log = m_log.Log(*values)
+    return log, log
+
+
+def get_blocks_per_line(get_row: Callable) -> float:
+    # The objects of each line are kept to count them with the allocated blocks.
+    values = tuple(m_log.get_log(LINE))
+    rows: List[tuple] = []
+    blocks_start = sys.getallocatedblocks()
+    for _ in range(NUMBER_OF_LINES):
+        rows.append(get_row(values))
+    blocks_end = sys.getallocatedblocks()
+    # Each appended result is a tuple created by the function call, not counted.
+    return (blocks_end - blocks_start) / NUMBER_OF_LINES - 1
+
+
+def get_seconds_per_line(get_row: Callable, writer) -> float:
+    values = tuple(m_log.get_log(LINE))
+
+    def write_row():
+        writer.writerow(get_row(values)[1])
+
+    return timeit(write_row, number=NUMBER_OF_LINES) / NUMBER_OF_LINES
+
+
+def main():
+    writer_before = csv.DictWriter(io.StringIO(), fieldnames=m_log.Log.DICT_KEYS)
+    writer_after = csv.writer(io.StringIO())
+    print("version,blocks_per_line,microseconds_per_line")
+    for version, get_row, writer in (
+        ("before", get_row_before, writer_before),
+        ("after", get_row_after, writer_after),
+    ):
+        blocks = get_blocks_per_line(get_row)
+        microseconds = get_seconds_per_line(get_row, writer) * 10**6
+        print(f"{version},{blocks:.2f},{microseconds:.3f}")
+
+
+if __name__ == "__main__":
+    main()
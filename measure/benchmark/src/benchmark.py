@@ -0,0 +1,220 @@
+# Time of the stages of the converter (read, parse and write the lines) and of
+# a complete run, with synthetic logs. As pyperf, each benchmark is run some
+# times without saving the time (warmup) and then `repeat` times, and the
+# times are saved to compare them with other runs.
+# https://pyperf.readthedocs.io/en/latest/run_benchmark.html
+from pathlib import Path
+from timeit import default_timer as timer
+from typing import Callable, Dict, List, NamedTuple
+import argparse
+import contextlib
+import csv
+import datetime
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import tracemalloc
+
+project_main_path = Path(__file__).parent.parent.parent.parent
+sys.path.append(str(project_main_path.joinpath("python", "src")))
+
+from generate_logs import LogsConfig  # noqa: E402
+from read_file import FileReader  # noqa: E402
+import generate_logs  # noqa: E402
+import lib  # noqa: E402
+import m_log  # noqa: E402
+import write_file  # noqa: E402
+
+# Version of the format of the results file.
+RESULTS_VERSION = 1
+REPEAT = 5
+WARMUP = 1
+
+
+class Benchmark(NamedTuple):
+    # Function to measure and the number of lines that it converts.
+    run: Callable[[], None]
+    lines: int
+
+
+class BenchmarkResult(NamedTuple):
+    lines: int
+    bytes: int
+    # Seconds of each repetition.
+    values: List[float]
+    # Maximum bytes allocated by Python in a run.
+    peak_memory: int
+
+    def asdict(self) -> dict:
+        mean = statistics.mean(self.values)
+        return {
+            **self._asdict(),
+            "mean": mean,
+            "median": statistics.median(self.values),
+            "stdev": statistics.stdev(self.values) if len(self.values) > 1 else 0.0,
+            "lines_per_second": self.lines / mean if mean > 0 else 0.0,
+        }
+
+
+def get_benchmarks(pathnames: List[Path]) -> Dict[str, Callable[[], Benchmark]]:
+    # Each benchmark prepares its input before the time is measured.
+    def read() -> Benchmark:
+        def run():
+            reader = FileReader("zlib")
+            for pathname in pathnames:
+                for _ in reader.get_lines_in_pathname(str(pathname)):
+                    pass
+
+        return Benchmark(run, len(lines))
+
+    def parse() -> Benchmark:
+        get_log = m_log.get_log
+
+        def run():
+            for line in lines:
+                get_log(line)
+
+        return Benchmark(run, len(lines))
+
+    def write() -> Benchmark:
+        logs = [log for log in map(m_log.get_log, lines) if log is not None]
+
+        def run():
+            with open(os.devnull, "w", newline="") as file:
+                write_file.write_to_file_results(logs, csv.writer(file))
+
+        return Benchmark(run, len(logs))
+
+    def run_all() -> Benchmark:
+        path = pathnames[0].parent
+
+        def run():
+            lib.run(lib.get_args_parsed([str(path), "--quiet"]))
+
+        return Benchmark(run, len(lines))
+
+    lines = _get_lines(pathnames)
+    return {"read": read, "parse": parse, "write": write, "run": run_all}
+
+
+def run_benchmark(
+    benchmark: Benchmark, repeat: int = REPEAT, warmup: int = WARMUP
+) -> List[float]:
+    values = []
+    for index in range(warmup + repeat):
+        start = timer()
+        benchmark.run()
+        seconds = timer() - start
+        if index >= warmup:
+            values.append(seconds)
+    return values
+
+
+def get_peak_memory(benchmark: Benchmark) -> int:
+    # In other run, tracemalloc makes the allocations slower.
+    # https://docs.python.org/3/library/tracemalloc.html
+    tracemalloc.start()
+    try:
+        benchmark.run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def get_results(
+    pathnames: List[Path],
+    names: List[str],
+    config: LogsConfig,
+    repeat: int = REPEAT,
+    warmup: int = WARMUP,
+) -> dict:
+    benchmarks = get_benchmarks(pathnames)
+    bytes_in = sum(pathname.stat().st_size for pathname in pathnames)
+    results = {}
+    for name in names:
+        print(f"Init benchmark: {name}")
+        benchmark = benchmarks[name]()
+        # The converter shows the files read.
+        with contextlib.redirect_stdout(io.StringIO()):
+            values = run_benchmark(benchmark, repeat, warmup)
+            peak_memory = get_peak_memory(benchmark)
+        result = BenchmarkResult(benchmark.lines, bytes_in, values, peak_memory)
+        results[name] = result.asdict()
+        print(
+            f"{name}: mean {results[name]['mean']:.3f}s, stdev"
+            f" {results[name]['stdev']:.3f}s,"
+            f" {results[name]['lines_per_second']:.0f} lines/s"
+        )
+    return {
+        "version": RESULTS_VERSION,
+        "metadata": {
+            "date": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "python_implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "repeat": repeat,
+            "warmup": warmup,
+            "logs": config._asdict(),
+        },
+        "benchmarks": results,
+    }
+
+
+def _get_lines(pathnames: List[Path]) -> List[str]:
+    reader = FileReader("zlib")
+    with contextlib.redirect_stdout(io.StringIO()):
+        return [
+            line
+            for pathname in pathnames
+            for line in reader.get_lines_in_pathname(str(pathname))
+        ]
+
+
+def get_args_parsed(args=None):
+    parser = argparse.ArgumentParser(
+        description="Measure the time of the converter with synthetic logs."
+    )
+    parser.add_argument(
+        "--output", default="benchmark.json", help="file with the results"
+    )
+    parser.add_argument(
+        "--benchmark",
+        action="append",
+        choices=["read", "parse", "write", "run"],
+        help="benchmark to run, can be used several times. All by default",
+    )
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--warmup", type=int, default=WARMUP)
+    parser.add_argument(
+        "--path",
+        help="folder where the log files are created, a temporary one by default",
+    )
+    generate_logs.add_config_arguments(parser)
+    return parser.parse_args(args)
+
+
+def main(args):
+    config = generate_logs.get_config(args)
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory if args.path is None else args.path)
+        print(f"Init generate logs: {path}")
+        pathnames = generate_logs.generate_logs(path, config)
+        results = get_results(
+            pathnames,
+            args.benchmark or ["read", "parse", "write", "run"],
+            config,
+            args.repeat,
+            args.warmup,
+        )
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+    print(f"File with the results: {args.output}")
+
+
+if __name__ == "__main__":
+    main(get_args_parsed())
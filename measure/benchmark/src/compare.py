@@ -0,0 +1,228 @@
+# Compare the results of `benchmark.py` with the results of a baseline and exit
+# with an error if a benchmark is slower or uses more memory. A benchmark is
+# slower if its lines per second are lower than the threshold and the
+# difference of the times is significant with a Welch's t-test, so the noise
+# between runs is not a regression.
+# https://en.wikipedia.org/wiki/Welch%27s_t-test
+from typing import List, NamedTuple, Optional
+import argparse
+import json
+import math
+import statistics
+import sys
+
+# Ratios.
+THRESHOLD = 0.05
+MEMORY_THRESHOLD = 0.10
+# Significance level of the t-test.
+ALPHA = 0.05
+
+
+class Comparison(NamedTuple):
+    name: str
+    lines_per_second_baseline: float
+    lines_per_second: float
+    # None if there are not enough repetitions to run the test.
+    p_value: Optional[float]
+    peak_memory_baseline: int
+    peak_memory: int
+
+    @property
+    def change(self) -> float:
+        return self.lines_per_second / self.lines_per_second_baseline - 1
+
+    @property
+    def memory_change(self) -> float:
+        return self.peak_memory / self.peak_memory_baseline - 1
+
+    def is_significant(self, alpha: float) -> bool:
+        return self.p_value is None or self.p_value < alpha
+
+    def is_slower(self, threshold: float, alpha: float) -> bool:
+        return self.change < -threshold and self.is_significant(alpha)
+
+    def is_faster(self, threshold: float, alpha: float) -> bool:
+        return self.change > threshold and self.is_significant(alpha)
+
+    def is_more_memory(self, memory_threshold: float) -> bool:
+        return self.memory_change > memory_threshold
+
+
+def get_comparisons(baseline: dict, results: dict) -> List[Comparison]:
+    if baseline["version"] != results["version"]:
+        raise ValueError(
+            f"Different version of the results files: {baseline['version']}"
+            f" and {results['version']}"
+        )
+    if baseline["metadata"]["logs"] != results["metadata"]["logs"]:
+        raise ValueError(
+            "The logs of the benchmarks are not the same:"
+            f" {baseline['metadata']['logs']} and {results['metadata']['logs']}"
+        )
+    result = []
+    for name, values in results["benchmarks"].items():
+        if name not in baseline["benchmarks"]:
+            continue
+        values_baseline = baseline["benchmarks"][name]
+        result.append(
+            Comparison(
+                name,
+                values_baseline["lines_per_second"],
+                values["lines_per_second"],
+                get_p_value(values_baseline["values"], values["values"]),
+                values_baseline["peak_memory"],
+                values["peak_memory"],
+            )
+        )
+    return result
+
+
+def get_p_value(values_1: List[float], values_2: List[float]) -> Optional[float]:
+    # Two-sided p-value of Welch's t-test.
+    if len(values_1) < 2 or len(values_2) < 2:
+        return None
+    variance_mean_1 = statistics.variance(values_1) / len(values_1)
+    variance_mean_2 = statistics.variance(values_2) / len(values_2)
+    difference = statistics.mean(values_1) - statistics.mean(values_2)
+    variance = variance_mean_1 + variance_mean_2
+    if variance == 0:
+        return 1.0 if difference == 0 else 0.0
+    t = difference / math.sqrt(variance)
+    # Welch–Satterthwaite equation.
+    degrees_of_freedom = variance**2 / (
+        variance_mean_1**2 / (len(values_1) - 1)
+        + variance_mean_2**2 / (len(values_2) - 1)
+    )
+    return _get_incomplete_beta(
+        degrees_of_freedom / 2, 0.5, degrees_of_freedom / (degrees_of_freedom + t**2)
+    )
+
+
+def _get_incomplete_beta(a: float, b: float, x: float) -> float:
+    # Regularized incomplete beta function, to get the probability of the
+    # Student's t-distribution without scipy. Numerical Recipes, section 6.4.
+    if x <= 0 or x >= 1:
+        return max(0.0, min(1.0, x))
+    log_front = (
+        math.lgamma(a + b)
+        - math.lgamma(a)
+        - math.lgamma(b)
+        + a * math.log(x)
+        + b * math.log(1 - x)
+    )
+    if x < (a + 1) / (a + b + 2):
+        return math.exp(log_front) * _get_continued_fraction(a, b, x) / a
+    return 1 - math.exp(log_front) * _get_continued_fraction(b, a, 1 - x) / b
+
+
+def _get_continued_fraction(a: float, b: float, x: float) -> float:
+    # Lentz's method.
+    tiny = 1e-300
+    c = 1.0
+    d = 1 - (a + b) * x / (a + 1)
+    d = 1 / (d if abs(d) > tiny else tiny)
+    result = d
+    for m in range(1, 200):
+        for numerator in (
+            m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+            -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1)),
+        ):
+            d = 1 + numerator * d
+            d = 1 / (d if abs(d) > tiny else tiny)
+            c = 1 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            delta = c * d
+            result *= delta
+        if abs(delta - 1) < 1e-12:
+            break
+    return result
+
+
+def get_report(
+    comparisons: List[Comparison],
+    threshold: float = THRESHOLD,
+    memory_threshold: float = MEMORY_THRESHOLD,
+    alpha: float = ALPHA,
+) -> str:
+    lines = [
+        f"{'Benchmark':<10} {'Baseline':>12} {'Current':>12} {'Change':>8}"
+        f" {'p-value':>8} {'Memory':>8}  Result",
+    ]
+    for comparison in comparisons:
+        results = []
+        if comparison.is_slower(threshold, alpha):
+            results.append("SLOWER")
+        elif comparison.is_faster(threshold, alpha):
+            results.append("faster")
+        elif abs(comparison.change) > threshold:
+            results.append("not significant")
+        if comparison.is_more_memory(memory_threshold):
+            results.append("MORE MEMORY")
+        p_value = "-" if comparison.p_value is None else f"{comparison.p_value:.3f}"
+        lines.append(
+            f"{comparison.name:<10} {comparison.lines_per_second_baseline:>12,.0f}"
+            f" {comparison.lines_per_second:>12,.0f} {comparison.change:>+8.1%}"
+            f" {p_value:>8} {comparison.memory_change:>+8.1%}"
+            f"  {', '.join(results) or 'ok'}"
+        )
+    lines.append(
+        f"Lines per second in the baseline and current run. Thresholds: time"
+        f" {threshold:.0%} (p-value < {alpha}), memory {memory_threshold:.0%}."
+    )
+    return "\n".join(lines)
+
+
+def is_regression(
+    comparisons: List[Comparison],
+    threshold: float = THRESHOLD,
+    memory_threshold: float = MEMORY_THRESHOLD,
+    alpha: float = ALPHA,
+) -> bool:
+    return any(
+        comparison.is_slower(threshold, alpha)
+        or comparison.is_more_memory(memory_threshold)
+        for comparison in comparisons
+    )
+
+
+def get_args_parsed(args=None):
+    parser = argparse.ArgumentParser(
+        description="Compare the results of a benchmark with a baseline."
+    )
+    parser.add_argument("baseline", help="results file of the baseline")
+    parser.add_argument("results", help="results file to compare")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=THRESHOLD,
+        help="ratio of lines per second lower than the baseline to fail",
+    )
+    parser.add_argument(
+        "--memory-threshold",
+        type=float,
+        default=MEMORY_THRESHOLD,
+        help="ratio of peak memory higher than the baseline to fail",
+    )
+    parser.add_argument("--alpha", type=float, default=ALPHA, help="significance level")
+    return parser.parse_args(args)
+
+
+def main(args) -> int:
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    with open(args.results) as file:
+        results = json.load(file)
+    try:
+        comparisons = get_comparisons(baseline, results)
+    except ValueError as exception:
+        print(exception)
+        return 2
+    print(get_report(comparisons, args.threshold, args.memory_threshold, args.alpha))
+    if is_regression(comparisons, args.threshold, args.memory_threshold, args.alpha):
+        print("Regression")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(get_args_parsed()))
@@ -0,0 +1,119 @@
+# Synthetic nginx logs with the same content for the same arguments, to
+# benchmark the converter with logs of any size and shape.
+from pathlib import Path
+from typing import Iterator, List, NamedTuple
+import argparse
+import gzip
+import random
+import time
+
+TIME_START = 1635379200
+USER_AGENTS = [
+    "curl/7.81.0",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like"
+    " Gecko) Chrome/118.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64; rv:109.0) Gecko/20100101 Firefox/119.0",
+    "Googlebot/2.1 (+http://www.google.com/bot.html)",
+]
+PATHS = ["/", "/index.html", "/api/users", "/api/orders", "/static/app.js", "/login"]
+STATUSES = ["200"] * 16 + ["301", "304", "404", "500"]
+
+
+class LogsConfig(NamedTuple):
+    files: int = 5
+    lines_per_file: int = 100_000
+    # Ratio of lines that are not logs.
+    malformed_ratio: float = 0.01
+    # Ratio of logs with a user agent of `long_user_agent_length` characters.
+    long_user_agent_ratio: float = 0.05
+    long_user_agent_length: int = 2000
+    # Number of rotated files that are not compressed, like logrotate with the
+    # delaycompress option.
+    plain_files: int = 2
+    seed: int = 1
+
+
+def generate_logs(path: Path, config: LogsConfig = LogsConfig()) -> List[Path]:
+    # Files like the ones of logrotate: access.log, access.log.1,
+    # access.log.2.gz... The oldest file has the oldest logs.
+    path.mkdir(parents=True, exist_ok=True)
+    result = []
+    random_generator = random.Random(config.seed)
+    seconds_per_file = 24 * 3600
+    for number in range(config.files):
+        filename = "access.log" if number == 0 else f"access.log.{number}"
+        time_start = TIME_START + (config.files - 1 - number) * seconds_per_file
+        lines = get_lines(random_generator, config, time_start, seconds_per_file)
+        content = "".join(f"{line}\n" for line in lines).encode()
+        if number < config.plain_files:
+            pathname = path.joinpath(filename)
+            pathname.write_bytes(content)
+        else:
+            pathname = path.joinpath(f"{filename}.gz")
+            # Without the time in the header, the file is the same in each run.
+            pathname.write_bytes(gzip.compress(content, mtime=0))
+        result.append(pathname)
+    return result
+
+
+def get_lines(
+    random_generator: random.Random,
+    config: LogsConfig,
+    time_start: int,
+    seconds: int,
+) -> Iterator[str]:
+    for index in range(config.lines_per_file):
+        epoch = time_start + index * seconds // max(config.lines_per_file, 1)
+        if random_generator.random() < config.malformed_ratio:
+            yield _get_line_malformed(random_generator)
+        else:
+            yield get_line(random_generator, config, epoch)
+
+
+def get_line(random_generator: random.Random, config: LogsConfig, epoch: int) -> str:
+    choice = random_generator.choice
+    remote_addr = ".".join(str(random_generator.randint(1, 254)) for _ in range(4))
+    time_local = time.strftime("%d/%b/%Y:%H:%M:%S +0000", time.gmtime(epoch))
+    request = f"{choice(['GET'] * 8 + ['POST', 'HEAD'])} {choice(PATHS)} HTTP/1.1"
+    if random_generator.random() < config.long_user_agent_ratio:
+        user_agent = "".join(
+            choice("abcdefghijklmnopqrstuvwxyz ;/.()")
+            for _ in range(config.long_user_agent_length)
+        )
+    else:
+        user_agent = choice(USER_AGENTS)
+    return (
+        f'{remote_addr} - - [{time_local}] "{request}" {choice(STATUSES)}'
+        f' {random_generator.randint(0, 50_000)} "-" "{user_agent}"'
+    )
+
+
+def _get_line_malformed(random_generator: random.Random) -> str:
+    return random_generator.choice(
+        [
+            "not a log",
+            '8.8.8.8 - - [28/Oct/2021:00:18:22 +0000 "GET / HTTP/1.1" 200 77 "-" "-"',
+            "\x16\x03\x01\x02\x00\x01\x00\x01\xfc\x03\x03",
+        ]
+    )
+
+
+def add_config_arguments(parser: argparse.ArgumentParser):
+    for field, value in LogsConfig()._asdict().items():
+        parser.add_argument(
+            f"--{field.replace('_', '-')}", type=type(value), default=value
+        )
+
+
+def get_config(args) -> LogsConfig:
+    return LogsConfig(**{field: getattr(args, field) for field in LogsConfig._fields})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic nginx logs.")
+    parser.add_argument("path", help="folder where the log files are created")
+    add_config_arguments(parser)
+    args = parser.parse_args()
+    pathnames = generate_logs(Path(args.path), get_config(args))
+    for pathname in pathnames:
+        print(f"Created file: {pathname}")
@@ -0,0 +1,207 @@
+# Run a command and save its resources each `--interval` seconds, reading the
+# files of the process in /proc, until the command ends. The files are opened
+# once and read again from the start, so a sample does not create a process
+# like `ps` and the CPU used to measure is low.
+# https://man7.org/linux/man-pages/man5/proc.5.html
+from timeit import default_timer as timer
+from typing import Callable, List, NamedTuple, Optional, TextIO, Tuple
+import argparse
+import os
+import select
+import signal
+import subprocess
+import sys
+import time
+
+INTERVAL = 0.01
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+FIELDNAMES = [
+    "time",
+    "cpu_time",
+    "rss",
+    "read_bytes",
+    "write_bytes",
+    "voluntary_context_switches",
+    "involuntary_context_switches",
+]
+
+
+class Sample(NamedTuple):
+    # Seconds since the command started.
+    time: float
+    # Seconds of CPU in user and kernel mode, with the children waited.
+    cpu_time: float
+    # Bytes.
+    rss: Optional[int]
+    read_bytes: Optional[int]
+    write_bytes: Optional[int]
+    voluntary_context_switches: Optional[int]
+    involuntary_context_switches: Optional[int]
+
+    def get_line(self) -> str:
+        values = [f"{self.time:.6f}", f"{self.cpu_time:.2f}", *self[2:]]
+        return ",".join("" if value is None else str(value) for value in values)
+
+
+class ProcessFiles:
+    def __init__(self, pid: int):
+        # Maximum RSS of the command in the samples (VmHWM).
+        self.rss_max: Optional[int] = None
+        self._file_descriptors = {}
+        for filename in ("stat", "status", "io"):
+            try:
+                self._file_descriptors[filename] = os.open(
+                    f"/proc/{pid}/{filename}", os.O_RDONLY
+                )
+            except OSError:
+                # The io file requires permissions, like ptrace.
+                pass
+
+    def get_sample(self, seconds: float) -> Optional[Sample]:
+        try:
+            stat = self._read("stat")
+            status = self._get_values(self._read("status"), ":")
+            io = self._get_values(self._read("io"), ":")
+        except OSError:
+            return None
+        # The command name is between parentheses and can have spaces.
+        stat_values = stat[stat.rindex(")") + 2 :].split()
+        # Fields utime, stime, cutime and cstime.
+        cpu_ticks = sum(int(value) for value in stat_values[11:15])
+        rss = status.get("VmRSS")
+        rss_max = status.get("VmHWM")
+        if rss_max is not None:
+            self.rss_max = max(self.rss_max or 0, int(rss_max.split()[0]) * 1024)
+        return Sample(
+            seconds,
+            cpu_ticks / CLOCK_TICKS,
+            None if rss is None else int(rss.split()[0]) * 1024,
+            _get_int(io.get("read_bytes")),
+            _get_int(io.get("write_bytes")),
+            _get_int(status.get("voluntary_ctxt_switches")),
+            _get_int(status.get("nonvoluntary_ctxt_switches")),
+        )
+
+    def close(self):
+        for file_descriptor in self._file_descriptors.values():
+            os.close(file_descriptor)
+
+    def _read(self, filename: str) -> str:
+        if filename not in self._file_descriptors:
+            return ""
+        return os.pread(self._file_descriptors[filename], 4096, 0).decode()
+
+    @staticmethod
+    def _get_values(content: str, separator: str) -> dict:
+        result = {}
+        for line in content.splitlines():
+            key, _, value = line.partition(separator)
+            result[key] = value.strip()
+        return result
+
+
+def _get_int(value: Optional[str]) -> Optional[int]:
+    return None if value is None else int(value)
+
+
+def _get_sample_from_rusage(seconds: float, rusage, rss_max: Optional[int]) -> Sample:
+    # The resources of the command when it ends, so a command that ends before
+    # the first interval has a sample too. The RSS is the maximum of the
+    # samples, empty without them: ru_maxrss is not used because on Linux the
+    # RSS of a child starts with the RSS of the process that forked it, the
+    # sampler.
+    # https://man7.org/linux/man-pages/man2/getrusage.2.html
+    return Sample(
+        seconds,
+        rusage.ru_utime + rusage.ru_stime,
+        rss_max,
+        rusage.ru_inblock * 512,
+        rusage.ru_oublock * 512,
+        rusage.ru_nvcsw,
+        rusage.ru_nivcsw,
+    )
+
+
+def _get_wait_end_functions(pid: int) -> Tuple[Callable, Callable]:
+    # The sleep ends when the command ends, with a file descriptor of the
+    # process that is readable then (Linux 5.3).
+    try:
+        pid_file_descriptor = os.pidfd_open(pid)
+    except (AttributeError, OSError):
+        return time.sleep, lambda: None
+
+    def wait_end(seconds: float):
+        select.select([pid_file_descriptor], [], [], seconds)
+
+    return wait_end, lambda: os.close(pid_file_descriptor)
+
+
+def sample(command: List[str], file: TextIO, interval: float = INTERVAL) -> int:
+    print(",".join(FIELDNAMES), file=file)
+    process = subprocess.Popen(command)
+    time_start = timer()
+    process_files = ProcessFiles(process.pid)
+    next_time = time_start
+    # As `time`, Ctrl+C stops the command and the sampler waits it to save the
+    # last sample.
+    wait_end, close_wait_end = _get_wait_end_functions(process.pid)
+    sigint_handler = signal.signal(signal.SIGINT, signal.SIG_IGN)
+    try:
+        while True:
+            process_sample = process_files.get_sample(timer() - time_start)
+            # The command is not waited after reading the files, so they exist
+            # until the command ends.
+            pid, exit_status, rusage = os.wait4(process.pid, os.WNOHANG)
+            if pid != 0:
+                break
+            if process_sample is not None:
+                print(process_sample.get_line(), file=file)
+            # A fixed interval, without adding the time to read the files.
+            next_time += interval
+            wait_end(max(0.0, next_time - timer()))
+    finally:
+        signal.signal(signal.SIGINT, sigint_handler)
+        process_files.close()
+        close_wait_end()
+    # The values of the last sample are the totals of the command.
+    print(
+        _get_sample_from_rusage(
+            timer() - time_start, rusage, process_files.rss_max
+        ).get_line(),
+        file=file,
+    )
+    process.returncode = os.waitstatus_to_exitcode(exit_status)
+    return process.returncode
+
+
+def get_args_parsed(args=None):
+    parser = argparse.ArgumentParser(
+        description="Run a command and save its CPU time, memory, I/O bytes and"
+        " context switches."
+    )
+    parser.add_argument("--output", required=True, help="csv file with the samples")
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=INTERVAL,
+        help=f"seconds between samples, {INTERVAL} by default",
+    )
+    parser.add_argument("command", nargs=argparse.REMAINDER)
+    args_parsed = parser.parse_args(args)
+    if args_parsed.command[:1] == ["--"]:
+        args_parsed.command = args_parsed.command[1:]
+    if len(args_parsed.command) == 0:
+        parser.error("the command to run is required")
+    if args_parsed.interval <= 0:
+        parser.error("--interval must be greater than 0")
+    return args_parsed
+
+
+def main(args) -> int:
+    print(f"Init sample command: {' '.join(args.command)}. File: {args.output}")
+    with open(args.output, "w") as file:
+        return sample(args.command, file, args.interval)
+
+
+if __name__ == "__main__":
+    sys.exit(main(get_args_parsed()))
@@ -0,0 +1,61 @@
+from pathlib import Path
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import unittest
+
+project_main_path = Path(__file__).parent.parent
+sys.path.append(str(project_main_path.joinpath("src")))
+
+from src import benchmark
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_main_writes_results(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = Path(directory).joinpath("benchmark.json")
+            args = benchmark.get_args_parsed(
+                [
+                    "--output",
+                    str(output),
+                    "--path",
+                    str(Path(directory).joinpath("logs")),
+                    "--repeat",
+                    "2",
+                    "--files",
+                    "2",
+                    "--lines-per-file",
+                    "100",
+                    "--malformed-ratio",
+                    "0.1",
+                ]
+            )
+            with contextlib.redirect_stdout(io.StringIO()):
+                benchmark.main(args)
+            result = json.loads(output.read_text())
+        self.assertEqual(benchmark.RESULTS_VERSION, result["version"])
+        self.assertEqual(100, result["metadata"]["logs"]["lines_per_file"])
+        self.assertEqual(["read", "parse", "write", "run"], list(result["benchmarks"]))
+        for name, values in result["benchmarks"].items():
+            with self.subTest(name=name):
+                self.assertEqual(2, len(values["values"]))
+                self.assertGreater(values["lines_per_second"], 0)
+                self.assertGreater(values["peak_memory"], 0)
+        self.assertEqual(200, result["benchmarks"]["read"]["lines"])
+        self.assertLess(
+            result["benchmarks"]["write"]["lines"],
+            result["benchmarks"]["read"]["lines"],
+        )
+
+    def test_benchmark_result_asdict(self):
+        result = benchmark.BenchmarkResult(10, 100, [1.0, 3.0], 5).asdict()
+        self.assertEqual(2.0, result["mean"])
+        self.assertEqual(2.0, result["median"])
+        self.assertAlmostEqual(1.414214, result["stdev"], places=6)
+        self.assertEqual(5.0, result["lines_per_second"])
+
+
+if __name__ == "__main__":
+    unittest.main()
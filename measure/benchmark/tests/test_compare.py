@@ -0,0 +1,104 @@
+from pathlib import Path
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import unittest
+
+project_main_path = Path(__file__).parent.parent
+sys.path.append(str(project_main_path.joinpath("src")))
+
+from src import compare
+
+
+def _get_results(values: list, peak_memory: int = 1000, lines: int = 100) -> dict:
+    mean = sum(values) / len(values)
+    return {
+        "version": 1,
+        "metadata": {"logs": {"files": 1}},
+        "benchmarks": {
+            "parse": {
+                "lines": lines,
+                "values": values,
+                "mean": mean,
+                "lines_per_second": lines / mean,
+                "peak_memory": peak_memory,
+            }
+        },
+    }
+
+
+class TestGetPValue(unittest.TestCase):
+    def test_get_p_value(self):
+        # Values of a table of the Student's t-distribution.
+        for values_1, values_2, expected_result in (
+            ([1, 2, 3, 4, 5], [3, 4, 5, 6, 7], 0.0805),
+            ([1, 2, 3], [1, 2, 3], 1.0),
+            ([1.0, 1.0], [2.0, 2.0], 0.0),
+            ([1.0], [2.0, 2.0], None),
+        ):
+            with self.subTest(values_1=values_1, values_2=values_2):
+                result = compare.get_p_value(values_1, values_2)
+                if expected_result is None:
+                    self.assertIsNone(result)
+                else:
+                    self.assertAlmostEqual(expected_result, result, places=4)
+
+    def test_get_incomplete_beta_is_p_value_of_t(self):
+        for degrees_of_freedom, t in ((1, 12.706), (3, 3.182), (30, 2.042)):
+            with self.subTest(degrees_of_freedom=degrees_of_freedom):
+                self.assertAlmostEqual(
+                    0.05,
+                    compare._get_incomplete_beta(
+                        degrees_of_freedom / 2,
+                        0.5,
+                        degrees_of_freedom / (degrees_of_freedom + t**2),
+                    ),
+                    places=4,
+                )
+
+
+class TestCompare(unittest.TestCase):
+    def test_is_regression(self):
+        baseline = _get_results([1.0, 1.01, 0.99, 1.0, 1.02])
+        for values, peak_memory, expected_result in (
+            ([1.0, 1.01, 0.99, 1.0, 1.01], 1000, False),
+            ([1.2, 1.21, 1.19, 1.2, 1.22], 1000, True),
+            ([0.8, 0.81, 0.79, 0.8, 0.82], 1000, False),
+            ([1.0, 1.01, 0.99, 1.0, 1.01], 1200, True),
+            # Slower but not significant.
+            ([0.5, 1.8, 0.6, 1.9, 1.2], 1000, False),
+        ):
+            with self.subTest(values=values, peak_memory=peak_memory):
+                comparisons = compare.get_comparisons(
+                    baseline, _get_results(values, peak_memory)
+                )
+                self.assertEqual(expected_result, compare.is_regression(comparisons))
+
+    def test_get_comparisons_with_other_logs(self):
+        results = _get_results([1.0, 1.0])
+        results["metadata"]["logs"]["files"] = 2
+        with self.assertRaises(ValueError):
+            compare.get_comparisons(_get_results([1.0, 1.0]), results)
+
+    def test_main(self):
+        with tempfile.TemporaryDirectory() as directory:
+            baseline = Path(directory).joinpath("baseline.json")
+            results = Path(directory).joinpath("benchmark.json")
+            baseline.write_text(json.dumps(_get_results([1.0, 1.01, 0.99])))
+            results.write_text(json.dumps(_get_results([1.5, 1.51, 1.49], 1050)))
+            args = compare.get_args_parsed([str(baseline), str(results)])
+            with contextlib.redirect_stdout(io.StringIO()) as stdout:
+                exit_code = compare.main(args)
+        self.assertEqual(1, exit_code)
+        report = stdout.getvalue().splitlines()
+        self.assertEqual(
+            "parse               100           67   -33.3%    0.000    +5.0%  SLOWER",
+            report[1],
+        )
+        self.assertEqual("Regression", report[-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
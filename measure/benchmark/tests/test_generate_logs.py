@@ -0,0 +1,49 @@
+from pathlib import Path
+import gzip
+import sys
+import tempfile
+import unittest
+
+project_main_path = Path(__file__).parent.parent
+sys.path.append(str(project_main_path.joinpath("src")))
+
+from src import generate_logs
+
+CONFIG = generate_logs.LogsConfig(
+    files=3, lines_per_file=200, malformed_ratio=0.1, long_user_agent_ratio=0.1
+)
+
+
+class TestGenerateLogs(unittest.TestCase):
+    def test_generate_logs_has_same_files_with_same_config(self):
+        with tempfile.TemporaryDirectory() as directory_1:
+            with tempfile.TemporaryDirectory() as directory_2:
+                pathnames_1 = generate_logs.generate_logs(Path(directory_1), CONFIG)
+                pathnames_2 = generate_logs.generate_logs(Path(directory_2), CONFIG)
+                self.assertEqual(
+                    ["access.log", "access.log.1", "access.log.2.gz"],
+                    [pathname.name for pathname in pathnames_1],
+                )
+                for pathname_1, pathname_2 in zip(pathnames_1, pathnames_2):
+                    self.assertEqual(pathname_1.read_bytes(), pathname_2.read_bytes())
+                other_seed = CONFIG._replace(seed=2)
+                pathnames_2 = generate_logs.generate_logs(Path(directory_2), other_seed)
+                self.assertNotEqual(
+                    pathnames_1[0].read_bytes(), pathnames_2[0].read_bytes()
+                )
+
+    def test_generate_logs_content(self):
+        with tempfile.TemporaryDirectory() as directory:
+            pathnames = generate_logs.generate_logs(Path(directory), CONFIG)
+            lines = gzip.decompress(pathnames[2].read_bytes()).decode().splitlines()
+        self.assertEqual(CONFIG.lines_per_file, len(lines))
+        self.assertTrue(lines[0].endswith('"'), lines[0])
+        self.assertIn("[28/Oct/2021:00:00:00 +0000]", lines[0])
+        long_lines = [
+            line for line in lines if len(line) > CONFIG.long_user_agent_length
+        ]
+        self.assertTrue(0 < len(long_lines) < len(lines))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+from pathlib import Path
+import io
+import sys
+import unittest
+
+project_main_path = Path(__file__).parent.parent
+sys.path.append(str(project_main_path.joinpath("src")))
+
+from src import sampler
+
+COMMAND_CPU = [
+    sys.executable,
+    "-c",
+    "import time\nstart = time.time()\nwhile time.time() - start < 0.2: pass",
+]
+
+
+class TestSampler(unittest.TestCase):
+    def test_sample(self):
+        file = io.StringIO()
+        exit_code = sampler.sample(COMMAND_CPU, file, 0.02)
+        self.assertEqual(0, exit_code)
+        lines = file.getvalue().splitlines()
+        self.assertEqual(",".join(sampler.FIELDNAMES), lines[0])
+        samples = [
+            [float(value or 0) for value in line.split(",")] for line in lines[1:]
+        ]
+        self.assertGreater(len(samples), 5)
+        times = [values[0] for values in samples]
+        self.assertEqual(sorted(times), times)
+        self.assertGreaterEqual(times[-1], 0.2)
+        cpu_times = [values[1] for values in samples]
+        self.assertEqual(sorted(cpu_times), cpu_times)
+        self.assertGreater(cpu_times[-1], 0.1)
+        # The maximum RSS of the samples.
+        self.assertGreaterEqual(
+            samples[-1][2], max(values[2] for values in samples[:-1])
+        )
+
+    def test_sample_command_that_ends_before_interval(self):
+        file = io.StringIO()
+        exit_code = sampler.sample(["sh", "-c", "exit 3"], file, 10)
+        self.assertEqual(3, exit_code)
+        self.assertGreaterEqual(len(file.getvalue().splitlines()), 2)
+
+    def test_get_args_parsed(self):
+        args = sampler.get_args_parsed(
+            ["--output", "foo.csv", "--", "python", "main.py", "--jobs", "2"]
+        )
+        self.assertEqual(["python", "main.py", "--jobs", "2"], args.command)
+        self.assertEqual(sampler.INTERVAL, args.interval)
+
+
+if __name__ == "__main__":
+    unittest.main()
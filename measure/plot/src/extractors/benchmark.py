@@ -0,0 +1,17 @@
+import json
+
+import pandas as pd
+
+
+class FileParser:
+    def __init__(self, pathname: str):
+        self._pathname = pathname
+
+    @property
+    def df(self) -> pd.DataFrame:
+        with open(self._pathname) as file:
+            benchmarks = json.load(file)["benchmarks"]
+        result = pd.DataFrame.from_dict(benchmarks, orient="index")
+        result = result.drop(columns=["values"])
+        result.index.name = "benchmark"
+        return result.reset_index()
@@ -1,6 +1,6 @@
 import pandas as pd
 
-from extractors import ps as ps_extractor, massif as massif_extractor, execution_time as execution_time_extractor
+from extractors import benchmark as benchmark_extractor, sampler as sampler_extractor, massif as massif_extractor, execution_time as execution_time_extractor
 
 
 def get_df_from_pathname(metrics_pathname: str) -> pd.DataFrame:
@@ -8,4 +8,6 @@ def get_df_from_pathname(metrics_pathname: str) -> pd.DataFrame:
         return massif_extractor.FileParser(metrics_pathname).df
     elif "execution-time" in metrics_pathname:
         return execution_time_extractor.FileParser(metrics_pathname).df
-    return ps_extractor.FileParser(metrics_pathname).df
+    elif "benchmark" in metrics_pathname:
+        return benchmark_extractor.FileParser(metrics_pathname).df
+    return sampler_extractor.FileParser(metrics_pathname).df
@@ -288,104 +288,117 @@ def export_execution_time():
     plt.savefig(path_name, dpi=300)
 
 
+def export_benchmark():
+    figure = Figure(
+        axis_labels=AxisLabels("Benchmark", "Lines per second"),
+        title="Benchmark Python (mean and standard deviation)",
+    )
+    df = get_df_from_file(get_metrics_pathname(["benchmark.json"])[0])
+    x_pos = np.arange(len(df))
+    # Error of the lines per second from the standard deviation of the time.
+    lines_per_second_min = df["lines"] / (df["mean"] + df["stdev"])
+    _, ax = plt.subplots()
+    ax.bar(
+        x_pos,
+        df["lines_per_second"].round(),
+        yerr=df["lines_per_second"] - lines_per_second_min,
+        color="b",
+        width=0.5,
+        edgecolor="k",
+        capsize=4,
+    )
+    ax.bar_label(ax.containers[0], label_type="edge")
+    plt.xticks(x_pos, df["benchmark"], rotation=0)
+    plt.title(figure.title)
+    plt.xlabel(figure.axis_labels.x)
+    plt.ylabel(figure.axis_labels.y)
+    plt.grid(color="black", axis="y", linestyle="-", linewidth=0.1)
+    path_name = str(ResultsPath().get_image_pathname("benchmark.png"))
+    print(f"Init export to {path_name}")
+    plt.savefig(path_name, dpi=300)
+
+
 def get_metrics_pathname(metrics_filenames: List[str]) -> List[str]:
     this_script_path = Path(__file__).parent.absolute()
     metrics_path = this_script_path.joinpath("../../measure/results/")
     return [str(metrics_path.joinpath(filename)) for filename in metrics_filenames]
 
 
-def export_cpu_rust():
-    df_column_names_axis = DfColumnNamesAxis("time_elapsed", "cpu_percentage")
-    figure = Figure(
-        axis_labels=AxisLabels("Time (s)", "CPU (%)"),
-        title="CPU Rust",
-    )
-    x_axis_config = AxisConfig(
-        label=figure.axis_labels.x,
-        label_values=np.arange(0, 0.7, 0.1),
-        max_lim=0.4,
-        min_lim=-0.01,
-    )
-    y_axis_config = AxisConfig(
-        label=figure.axis_labels.y,
-        label_values=np.arange(0, 70, 10),
-        max_lim=60,
-        min_lim=-1,
-    )
-    annotate_configs = [
+def get_sampler_metrics_pathnames(name: str) -> List[str]:
+    # The last files saved by `measure-cpu NAME`, the date of the name sorts
+    # them by time.
+    this_script_path = Path(__file__).parent.absolute()
+    metrics_path = this_script_path.joinpath("../../measure/results/")
+    pathnames = sorted(metrics_path.glob(f"metrics-sampler-{name}-*.csv"))
+    if len(pathnames) == 0:
+        raise FileNotFoundError(f"No metrics-sampler-{name}-*.csv in {metrics_path}")
+    return [str(pathname) for pathname in pathnames[-len(LEGENDS) :]]
+
+
+def get_annotate_configs_max(subplots: Subplots) -> AnnotateConfigs:
+    # Points to the maximum value of all the subplots.
+    subplot = max(subplots, key=lambda subplot: subplot.y_axis_values.max())
+    index = subplot.y_axis_values.idxmax()
+    return [
         AnnotateConfig(
-            xy=(0.39, 50),
-            xytext=(0.8, 0.6),
+            xy=(subplot.x_axis_values[index], subplot.y_axis_values[index]),
+            xytext=(0.3, 0.9),
         )
     ]
-    subplots_config = SubplotsConfig(
-        metrics_pathnames=get_metrics_pathname(
-            [
-                "metrics-cpu-rust-measure-1.txt",
-                "metrics-cpu-rust-measure-2.txt",
-                "metrics-cpu-rust-measure-3.txt",
-            ]
-        ),
-        legends=LEGENDS,
-        colors=["b", "limegreen", "r"],
-        markers=["o", "o", "o"],
-        markerssize=[4.5, 2.5, 0.7],
-    )
-    export_image(
-        annotate_configs,
-        "metrics-cpu-rust.png",
-        figure,
-        get_subplots(df_column_names_axis, subplots_config),
-        AxisConfigs(x_axis_config, y_axis_config),
-    )
 
 
-def export_cpu_python():
+def export_cpu(name: str, title: str, image_filename: str):
     df_column_names_axis = DfColumnNamesAxis("time_elapsed", "cpu_percentage")
     figure = Figure(
         axis_labels=AxisLabels("Time (s)", "CPU (%)"),
-        title="CPU Python",
+        title=title,
+    )
+    metrics_pathnames = get_sampler_metrics_pathnames(name)
+    subplots_config = SubplotsConfig(
+        metrics_pathnames=metrics_pathnames,
+        legends=LEGENDS[: len(metrics_pathnames)],
+        colors=["b", "limegreen", "r"],
+        markers=["o", "o", "o"],
+        markerssize=[4.5, 2.5, 0.7],
     )
+    subplots = get_subplots(df_column_names_axis, subplots_config)
+    # The limits of the axis are the ones of the values, that depend on the
+    # machine where they are measured.
+    x_max = SubplotsAxisValues(
+        [subplot.x_axis_values for subplot in subplots]
+    ).max_value
+    y_max = SubplotsAxisValues(
+        [subplot.y_axis_values for subplot in subplots]
+    ).max_value
     x_axis_config = AxisConfig(
         label=figure.axis_labels.x,
-        label_values=np.arange(0, 12, 1),
-        max_lim=11,
-        min_lim=-0.3,
+        label_values=None,
+        max_lim=x_max * 1.05,
+        min_lim=-x_max * 0.02,
     )
     y_axis_config = AxisConfig(
         label=figure.axis_labels.y,
-        label_values=np.arange(0, 180, 20),
-        max_lim=170,
-        min_lim=-5,
-    )
-    annotate_configs = [
-        AnnotateConfig(
-            xy=(1.9, 165),
-            xytext=(0.3, 0.9),
-        )
-    ]
-    subplots_config = SubplotsConfig(
-        metrics_pathnames=get_metrics_pathname(
-            [
-                "metrics-cpu-python-measure-1.txt",
-                "metrics-cpu-python-measure-2.txt",
-                "metrics-cpu-python-measure-3.txt",
-            ]
-        ),
-        legends=LEGENDS,
-        colors=["b", "limegreen", "r"],
-        markers=["o", "o", "o"],
-        markerssize=[4.5, 2.5, 0.7],
+        label_values=None,
+        max_lim=y_max * 1.1,
+        min_lim=-1,
     )
     export_image(
-        annotate_configs,
-        "metrics-cpu-python.png",
+        get_annotate_configs_max(subplots),
+        image_filename,
         figure,
-        get_subplots(df_column_names_axis, subplots_config),
+        subplots,
         AxisConfigs(x_axis_config, y_axis_config),
     )
 
 
+def export_cpu_rust():
+    export_cpu("nginx_logs", "CPU Rust", "metrics-cpu-rust.png")
+
+
+def export_cpu_python():
+    export_cpu("python", "CPU Python", "metrics-cpu-python.png")
+
+
 def export_memory_rust_heap_only():
     df_column_names_axis = DfColumnNamesAxis("time_s", "mem_total_kb")
     figure = Figure(
@@ -668,7 +681,7 @@ def export_memory_python_add_pages_as_heap():
 
 if __name__ == "__main__":
     what_to_plot = "" if len(sys.argv) == 1 else sys.argv[1]
-    valid_arguments = ["time", "memory", "cpu", "all"]
+    valid_arguments = ["time", "memory", "cpu", "benchmark", "all"]
     if len(sys.argv) == 1 or what_to_plot not in valid_arguments:
         if len(sys.argv) == 1:
             error_msg = "No arguments supplied"
@@ -692,3 +705,6 @@ if __name__ == "__main__":
             print("[DEBUG] Init CPU")
             export_cpu_rust()
             export_cpu_python()
+        if what_to_plot == "benchmark":
+            print("[DEBUG] Init benchmark")
+            export_benchmark()
@@ -0,0 +1,14 @@
+import pandas as pd
+
+
+class DfToPlot:
+    def __call__(self, df: pd.DataFrame) -> pd.DataFrame:
+        result = df
+        result = self._get_df_set_peak_memory_mb(result)
+        return result
+
+    def _get_df_set_peak_memory_mb(self, df: pd.DataFrame) -> pd.DataFrame:
+        result = df
+        result["peak_memory_mb"] = result["peak_memory"] / 1024 / 1024
+        result["peak_memory_mb"] = result["peak_memory_mb"].round(decimals=3)
+        return result
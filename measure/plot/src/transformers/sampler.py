@@ -0,0 +1,30 @@
+import pandas as pd
+
+
+class DfToPlot:
+    def __call__(self, df: pd.DataFrame) -> pd.DataFrame:
+        result = df
+        result = self._get_df_set_time_elapsed(result)
+        result = self._get_df_set_cpu_percentage(result)
+        result = self._get_df_set_rss_mb(result)
+        return result
+
+    def _get_df_set_time_elapsed(self, df: pd.DataFrame) -> pd.DataFrame:
+        result = df
+        result["time_elapsed"] = result["time"]
+        return result
+
+    def _get_df_set_cpu_percentage(self, df: pd.DataFrame) -> pd.DataFrame:
+        # CPU time between samples, as `ps` shows.
+        result = df
+        result["cpu_percentage"] = (
+            result["cpu_time"].diff() / result["time"].diff() * 100
+        )
+        result["cpu_percentage"] = result["cpu_percentage"].fillna(0).round(decimals=1)
+        return result
+
+    def _get_df_set_rss_mb(self, df: pd.DataFrame) -> pd.DataFrame:
+        result = df
+        result["rss_mb"] = result["rss"] / 1024 / 1024
+        result["rss_mb"] = result["rss_mb"].round(decimals=3)
+        return result
@@ -1,6 +1,6 @@
 import pandas as pd
 
-from transformers import ps as ps_transformer, massif as massif_transformer, execution_time as execution_time_extractor
+from transformers import benchmark as benchmark_transformer, sampler as sampler_transformer, massif as massif_transformer, execution_time as execution_time_extractor
 
 
 def get_df_transformed(metrics_pathname: str, df: pd.DataFrame) -> pd.DataFrame:
@@ -8,4 +8,6 @@ def get_df_transformed(metrics_pathname: str, df: pd.DataFrame) -> pd.DataFrame:
         return massif_transformer.DfToPlot()(df)
     elif "execution-time" in metrics_pathname:
         return execution_time_extractor.DfToPlot()(df)
-    return ps_transformer.DfToPlot()(df)
+    elif "benchmark" in metrics_pathname:
+        return benchmark_transformer.DfToPlot()(df)
+    return sampler_transformer.DfToPlot()(df)
@@ -0,0 +1,24 @@
+from pathlib import Path
+import unittest
+
+import pandas as pd
+
+from src.extractors import benchmark
+
+
+class TestFileParser(unittest.TestCase):
+    def test_df(self):
+        this_script_path = Path(__file__).parent.absolute()
+        file_path = this_script_path.joinpath("files/benchmark.json")
+        parser = benchmark.FileParser(str(file_path))
+        df = parser.df
+        self.assertEqual(["read", "parse"], df["benchmark"].tolist())
+        self.assertEqual([6000, 6000], df["lines"].tolist())
+        self.assertEqual([0.007, 0.1], df["mean"].tolist())
+        self.assertEqual([857142.857143, 60000.0], df["lines_per_second"].tolist())
+        self.assertNotIn("values", df.columns)
+        self.assertIsInstance(df, pd.DataFrame)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -15,7 +15,7 @@ class TestRunCompletePlot(unittest.TestCase):
         this_script_path = plot_results.Path(__file__).parent.absolute()
         self.files_path = this_script_path.joinpath("files")
 
-    def test_plot_ps_metrics(self):
+    def test_plot_sampler_metrics(self):
         df_column_names_axis = plot_results.DfColumnNamesAxis(
             "time_elapsed", "cpu_percentage"
         )
@@ -26,37 +26,34 @@ class TestRunCompletePlot(unittest.TestCase):
         )
         x_axis_config = plot_results.AxisConfig(
             label=figure.axis_labels.x,
-            label_values=np.arange(0, 0.08, 0.01),
-            max_lim=0.07,
-            min_lim=-0.001,
+            label_values=np.arange(0, 0.2, 0.05),
+            max_lim=0.16,
+            min_lim=-0.005,
         )
         y_axis_config = plot_results.AxisConfig(
             label=figure.axis_labels.y,
-            label_values=np.arange(0, 70, 10),
-            max_lim=60,
+            label_values=np.arange(0, 120, 20),
+            max_lim=110,
             min_lim=-1,
         )
-        annotate_configs = [
-            plot_results.AnnotateConfig(
-                xy=(0.05, 55),
-                xytext=(0.55, 0.8),
-            ),
-        ]
         subplots_config = plot_results.SubplotsConfig(
             metrics_pathnames=[
                 str(self.files_path.joinpath(filename))
-                for filename in ["metrics-ps.txt"] * 3
+                for filename in ["metrics-sampler.csv"] * 3
             ],
             legends=legends,
             colors=["b", "limegreen", "r"],
             markers=["o", "o", "o"],
             markerssize=[4.5, 2.5, 0.7],
         )
+        subplots = plot_results.get_subplots(df_column_names_axis, subplots_config)
+        annotate_configs = plot_results.get_annotate_configs_max(subplots)
+        self.assertEqual((0.100106, 100.0), annotate_configs[0].xy)
         plot_results.export_image(
             annotate_configs,
-            "/tmp/metrics-ps.png",
+            "/tmp/metrics-sampler.png",
             figure,
-            plot_results.get_subplots(df_column_names_axis, subplots_config),
+            subplots,
             plot_results.AxisConfigs(x_axis_config, y_axis_config),
         )
 
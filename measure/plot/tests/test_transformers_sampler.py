@@ -0,0 +1,22 @@
+from pathlib import Path
+import unittest
+
+from src.extractors import sampler as sampler_extractor
+from src.transformers import sampler as sampler_transformer
+
+
+class TestDfToPlot(unittest.TestCase):
+    def test_df(self):
+        this_script_path = Path(__file__).parent.absolute()
+        file_path = this_script_path.joinpath("files/metrics-sampler.csv")
+        df = sampler_extractor.FileParser(str(file_path)).df
+        result = sampler_transformer.DfToPlot()(df)
+        self.assertEqual(
+            [0.000092, 0.050119, 0.100106, 0.150442], result["time_elapsed"].tolist()
+        )
+        self.assertEqual([0.0, 80.0, 100.0, 59.6], result["cpu_percentage"].tolist())
+        self.assertEqual(86.641, result["rss_mb"].iloc[-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
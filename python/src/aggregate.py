@@ -0,0 +1,199 @@
+from collections import Counter
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Tuple
+import calendar
+import heapq
+import json
+import time
+
+from m_log import get_request_values
+from m_time import TimeParser
+from sketch import SPACE_SAVING_SIZE, CountMinSketch, HyperLogLog, SpaceSaving
+
+TOP_SIZE = 10
+MINUTE_FORMAT = "%Y-%m-%dT%H:%MZ"
+
+
+class Aggregator:
+    # Counts the logs instead of writing them. It has the `writerows` method
+    # of the csv writer, so the logs are converted in the same way, and the
+    # aggregators of different files or parts of files can be merged.
+    def __init__(self, top_size: int = TOP_SIZE, pathname: Optional[str] = None):
+        self.name = pathname
+        self.top_size = top_size
+        self.logs = 0
+        self.bytes = 0
+        self.statuses: Counter = Counter()
+        # Keys are the epoch of the start of the minute, in UTC.
+        self.bytes_per_minute: Counter = Counter()
+        self.remote_addrs: Counter = Counter()
+        self.paths: Counter = Counter()
+        self.user_agents: Counter = Counter()
+        self._time_parser = TimeParser()
+
+    def __enter__(self) -> "Aggregator":
+        return self
+
+    def __exit__(self, exception_type, exception, traceback):
+        # A summary of only part of the logs is not written.
+        if exception_type is None:
+            self.close()
+
+    def writerows(self, rows: Iterable[tuple]):
+        # The rows start with the values of the log.
+        rows = list(rows)
+        get_epoch = self._time_parser.get_epoch
+        self.logs += len(rows)
+        self.statuses.update([row[4] for row in rows])
+        paths = [get_request_values(row[3])[1] for row in rows]
+        self._add_values(
+            [row[0] for row in rows],
+            [path for path in paths if path is not None],
+            [row[7] for row in rows],
+        )
+        for row in rows:
+            body_bytes_sent = int(row[5])
+            self.bytes += body_bytes_sent
+            epoch = get_epoch(row[2])
+            if epoch is not None:
+                self.bytes_per_minute[epoch - epoch % 60] += body_bytes_sent
+
+    def flush(self):
+        pass
+
+    def merge(self, aggregator: "Aggregator"):
+        self.logs += aggregator.logs
+        self.bytes += aggregator.bytes
+        self.statuses.update(aggregator.statuses)
+        self.bytes_per_minute.update(aggregator.bytes_per_minute)
+        self.remote_addrs.update(aggregator.remote_addrs)
+        self.paths.update(aggregator.paths)
+        self.user_agents.update(aggregator.user_agents)
+
+    def get_summary(self) -> dict:
+        return {
+            "logs": self.logs,
+            "bytes": self.bytes,
+            "statuses": dict(sorted(self.statuses.items())),
+            "distinct_remote_addrs": len(self.remote_addrs),
+            "top_remote_addrs": get_top(self.remote_addrs, self.top_size),
+            "top_paths": get_top(self.paths, self.top_size),
+            "top_user_agents": get_top(self.user_agents, self.top_size),
+            "bytes_per_minute": {
+                time.strftime(MINUTE_FORMAT, time.gmtime(minute)): body_bytes_sent
+                for minute, body_bytes_sent in sorted(self.bytes_per_minute.items())
+            },
+        }
+
+    def close(self):
+        if self.name is not None:
+            with open(self.name, "w") as file:
+                json.dump(self.get_summary(), file, indent=2)
+
+    def _add_values(
+        self, remote_addrs: List[str], paths: List[str], user_agents: List[str]
+    ):
+        self.remote_addrs.update(remote_addrs)
+        self.paths.update(paths)
+        self.user_agents.update(user_agents)
+
+
+class SketchAggregator(Aggregator):
+    # The remote addresses, paths and user agents are counted with sketches
+    # of fixed memory instead of a counter per value. The sketches are saved in
+    # the summary, so the summaries of different runs can be merged.
+    # The counts of the paths are the minimum of the Space-Saving and the
+    # Count-Min sketches, both are never less than the real count.
+    def __init__(
+        self,
+        top_size: int = TOP_SIZE,
+        pathname: Optional[str] = None,
+        sketch_size: int = SPACE_SAVING_SIZE,
+    ):
+        super().__init__(top_size, pathname)
+        self.remote_addrs_distinct = HyperLogLog()
+        self.remote_addrs_top = SpaceSaving(sketch_size)
+        self.paths_top = SpaceSaving(sketch_size)
+        self.paths_counts = CountMinSketch()
+        self.user_agents_top = SpaceSaving(sketch_size)
+
+    def merge(self, aggregator: Aggregator):
+        if not isinstance(aggregator, SketchAggregator):
+            raise TypeError("Only aggregators with sketches can be merged")
+        super().merge(aggregator)
+        for name in SKETCHES:
+            getattr(self, name).merge(getattr(aggregator, name))
+
+    def get_summary(self) -> dict:
+        paths_top = [
+            (value, min(count, self.paths_counts.get_count(value)))
+            for value, count, _ in self.paths_top.get_top(self.top_size)
+        ]
+        return {
+            **super().get_summary(),
+            "distinct_remote_addrs": self.remote_addrs_distinct.count(),
+            "top_remote_addrs": _get_top_counts(self.remote_addrs_top, self.top_size),
+            "top_paths": sorted(paths_top, key=itemgetter(1), reverse=True),
+            "top_user_agents": _get_top_counts(self.user_agents_top, self.top_size),
+            "sketches": {name: getattr(self, name).asdict() for name in SKETCHES},
+        }
+
+    @classmethod
+    def from_summary(cls, summary: dict) -> "SketchAggregator":
+        if "sketches" not in summary:
+            raise ValueError("The summary has not sketches")
+        result = cls()
+        result.logs = summary["logs"]
+        result.bytes = summary["bytes"]
+        result.statuses.update(summary["statuses"])
+        for minute, body_bytes_sent in summary["bytes_per_minute"].items():
+            epoch = calendar.timegm(time.strptime(minute, MINUTE_FORMAT))
+            result.bytes_per_minute[epoch] = body_bytes_sent
+        for name, sketch_type in SKETCHES.items():
+            setattr(result, name, sketch_type.from_dict(summary["sketches"][name]))
+        return result
+
+    def _add_values(
+        self, remote_addrs: List[str], paths: List[str], user_agents: List[str]
+    ):
+        for remote_addr in remote_addrs:
+            self.remote_addrs_distinct.add(remote_addr)
+            self.remote_addrs_top.add(remote_addr)
+        for path in paths:
+            self.paths_top.add(path)
+            self.paths_counts.add(path)
+        for user_agent in user_agents:
+            self.user_agents_top.add(user_agent)
+
+
+# Attributes of the sketch aggregator with a sketch, and their type.
+SKETCHES = {
+    "remote_addrs_distinct": HyperLogLog,
+    "remote_addrs_top": SpaceSaving,
+    "paths_top": SpaceSaving,
+    "paths_counts": CountMinSketch,
+    "user_agents_top": SpaceSaving,
+}
+
+
+def get_aggregator(
+    top_size: int = TOP_SIZE, sketch: bool = False, pathname: Optional[str] = None
+) -> Aggregator:
+    if sketch:
+        return SketchAggregator(top_size, pathname)
+    return Aggregator(top_size, pathname)
+
+
+def load_summary(pathname: str) -> SketchAggregator:
+    with open(pathname, "r") as file:
+        return SketchAggregator.from_summary(json.load(file))
+
+
+def get_top(counter: Dict[str, int], size: int) -> List[Tuple[str, int]]:
+    # Only `size` items are in the heap, the items are not sorted.
+    # https://docs.python.org/3/library/heapq.html#heapq.nlargest
+    return heapq.nlargest(size, counter.items(), key=itemgetter(1))
+
+
+def _get_top_counts(sketch: SpaceSaving, size: int) -> List[Tuple[str, int]]:
+    return [(value, count) for value, count, _ in sketch.get_top(size)]
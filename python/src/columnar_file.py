@@ -0,0 +1,156 @@
+from typing import Iterable, Iterator, List, Sequence
+
+from m_log import Log
+from m_time import TimeParser
+import log_format
+
+FORMATS = ("csv", "arrow", "parquet")
+# Each format writes to a file with this extension.
+FORMATS_EXTENSIONS = {"csv": "csv", "arrow": "arrows", "parquet": "parquet"}
+ROW_GROUP_SIZE = 64 * 1024
+
+
+class ColumnarFile:
+    # Writes the logs as typed columns, by row groups of `row_group_size`
+    # logs. It has the `writerows` method of the csv writer, so the logs are
+    # written in the same way to all the formats.
+    # - arrow: Arrow IPC streaming format, which allows a different dictionary
+    #   of values in each batch.
+    #   https://arrow.apache.org/docs/python/ipc.html#using-streams
+    # - parquet: https://arrow.apache.org/docs/python/parquet.html
+    def __init__(
+        self,
+        pathname: str,
+        format: str,
+        row_group_size: int = ROW_GROUP_SIZE,
+        fieldnames: Sequence[str] = Log.DICT_KEYS,
+    ):
+        pa = import_pyarrow()
+        self.name = pathname
+        self._format = format
+        self._row_group_size = row_group_size
+        self._rows: List[tuple] = []
+        self._schema = get_schema(fieldnames)
+        self._time_parser = TimeParser()
+        if format == "parquet":
+            import pyarrow.parquet
+
+            self._writer = pyarrow.parquet.ParquetWriter(pathname, self._schema)
+        else:
+            self._writer = pa.ipc.new_stream(pathname, self._schema)
+
+    def __enter__(self) -> "ColumnarFile":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def writerows(self, rows: Iterable[tuple]):
+        self._rows.extend(rows)
+        if len(self._rows) >= self._row_group_size:
+            self.flush()
+
+    def flush(self):
+        if len(self._rows) != 0:
+            self._writer.write_table(
+                get_table(self._rows, self._schema, self._time_parser)
+            )
+            self._rows = []
+
+    def write_file_content(self, pathname: str):
+        # Writes the row groups of other file with the same format.
+        self.flush()
+        for batch in _get_batches_in_file(pathname, self._format):
+            self._writer.write_batch(batch)
+
+    def close(self):
+        self.flush()
+        self._writer.close()
+
+
+def import_pyarrow():
+    # pyarrow is only required to write these formats.
+    try:
+        import pyarrow
+    except ImportError as exception:
+        raise ImportError(
+            "pyarrow is required for the arrow and parquet formats:"
+            " pip install pyarrow"
+        ) from exception
+    return pyarrow
+
+
+def get_schema(fieldnames: Sequence[str] = Log.DICT_KEYS):
+    pa = import_pyarrow()
+    string_dictionary = pa.dictionary(pa.int32(), pa.string())
+    fields_extra = {
+        "time_epoch": pa.int64(),
+        "time_iso": pa.string(),
+        "method": string_dictionary,
+        "path": pa.string(),
+        "query": pa.string(),
+        "protocol": string_dictionary,
+        **{variable: pa.float64() for variable in log_format.VARIABLES_SECONDS},
+    }
+    return pa.schema(
+        [
+            ("remote_addr", pa.string()),
+            ("remote_user", string_dictionary),
+            # Parquet has not timestamps in seconds.
+            ("time_local", pa.timestamp("ms", tz="UTC")),
+            ("request", pa.string()),
+            ("status", pa.uint16()),
+            ("body_bytes_sent", pa.int64()),
+            ("http_referer", string_dictionary),
+            ("http_user_agent", string_dictionary),
+        ]
+        + [
+            (fieldname, fields_extra.get(fieldname, pa.string()))
+            for fieldname in fieldnames[len(Log.DICT_KEYS) :]
+        ]
+    )
+
+
+def get_table(rows: List[tuple], schema, time_parser: TimeParser):
+    pa = import_pyarrow()
+    columns = list(zip(*rows))
+    arrays = [
+        pa.array(columns[0], pa.string()),
+        pa.array(columns[1], pa.string()).dictionary_encode(),
+        pa.array(
+            [time_parser.get_epoch(value) for value in columns[2]],
+            pa.timestamp("s", "UTC"),
+        ).cast(schema.field("time_local").type),
+        pa.array(columns[3], pa.string()),
+        pa.array([int(value) for value in columns[4]], pa.uint16()),
+        pa.array([int(value) for value in columns[5]], pa.int64()),
+        pa.array(columns[6], pa.string()).dictionary_encode(),
+        pa.array(columns[7], pa.string()).dictionary_encode(),
+    ] + [
+        _get_array(column, schema.field(index).type)
+        for index, column in enumerate(
+            columns[len(Log.DICT_KEYS) :], len(Log.DICT_KEYS)
+        )
+    ]
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def _get_array(values: Sequence, type):
+    pa = import_pyarrow()
+    if pa.types.is_dictionary(type):
+        return pa.array(values, type.value_type).dictionary_encode()
+    return pa.array(values, type)
+
+
+def _get_batches_in_file(pathname: str, format: str) -> Iterator:
+    pa = import_pyarrow()
+    if format == "parquet":
+        import pyarrow.parquet
+
+        with pyarrow.parquet.ParquetFile(pathname) as file:
+            for batch in file.iter_batches():
+                yield batch
+    else:
+        with pa.memory_map(pathname) as file:
+            for batch in pa.ipc.open_stream(file):
+                yield batch
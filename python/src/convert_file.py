@@ -0,0 +1,401 @@
+from functools import partial
+from multiprocessing import Pool
+from timeit import default_timer as timer
+from typing import (
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+import itertools
+import os
+import shutil
+import tempfile
+
+from aggregate import Aggregator
+from columnar_file import FORMATS_EXTENSIONS, ColumnarFile
+from filter_log import LogFilter
+from follow_file import FileFollower
+from latency import LatencyAggregator
+from log_format import compile_log_format
+from m_row import RowBuilder
+from manifest import Manifest
+from pipeline import Pipeline
+from read_file import FileReader
+from rollup import Rollup
+from stats import FileStats, RunStats
+import aggregate
+import create_file
+import m_log
+import time_index
+import write_file
+
+BATCH_SIZE = 1000
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+T = TypeVar("T")
+
+
+class Task(NamedTuple):
+    pathname: str
+    directory: str
+    byte_range: Optional[Tuple[int, int]] = None
+
+
+class LinesConverter:
+    def __init__(
+        self,
+        get_log: Callable[[str], Optional[m_log.Log]] = m_log.get_log,
+        get_log_bytes: Callable[
+            [bytes], Optional[Tuple[bytes, ...]]
+        ] = m_log.get_log_bytes,
+        batch_size: int = BATCH_SIZE,
+        quiet: bool = False,
+        row_builder: Optional[RowBuilder] = None,
+        log_filter: Optional[LogFilter] = None,
+    ):
+        self._get_log = get_log
+        self._get_log_bytes = get_log_bytes
+        self._batch_size = batch_size
+        self._quiet = quiet
+        self._row_builder = RowBuilder() if row_builder is None else row_builder
+        self._log_filter = log_filter
+
+    def convert_lines(
+        self, lines: Iterable[str], writer_csv, file_error, stats: FileStats
+    ):
+        # The lines are parsed and written by batches to call the csv writer
+        # less times.
+        for lines_batch in get_batches(lines, self._batch_size):
+            logs, lines_not_parsed = self.parse_lines(lines_batch, stats)
+            self.write_results(logs, lines_not_parsed, writer_csv, file_error)
+
+    def parse_lines(
+        self, lines: List[str], stats: FileStats
+    ) -> Tuple[List[m_log.Log], List[str]]:
+        get_log = self._get_log
+        logs, lines_not_parsed = [], []
+        if self._log_filter is None:
+            for line in lines:
+                if len(line) != 0:
+                    log = get_log(line)
+                    if log is None:
+                        lines_not_parsed.append(line)
+                    else:
+                        logs.append(log)
+        else:
+            # The lines without the text of the conditions are not parsed.
+            # The not valid lines that pass the prefilter are rejected, the
+            # others are filtered.
+            is_line_candidate = self._log_filter.is_line_candidate
+            is_log_selected = self._log_filter.is_log_selected
+            lines_filtered = 0
+            for line in lines:
+                if len(line) != 0:
+                    if not is_line_candidate(line):
+                        lines_filtered += 1
+                        continue
+                    log = get_log(line)
+                    if log is None:
+                        lines_not_parsed.append(line)
+                    elif is_log_selected(log):
+                        logs.append(log)
+                    else:
+                        lines_filtered += 1
+            stats.lines_filtered += lines_filtered
+        stats.lines_read += len(lines)
+        stats.lines_parsed += len(logs)
+        stats.lines_rejected += len(lines_not_parsed)
+        return logs, lines_not_parsed
+
+    def write_results(
+        self, logs: List[m_log.Log], lines_not_parsed: List[str], writer_csv, file_error
+    ):
+        write_file.write_to_file_results(self._row_builder.get_rows(logs), writer_csv)
+        for line in lines_not_parsed:
+            write_file.write_to_file_error(line, file_error, not self._quiet)
+
+    def convert_lines_bytes(
+        self, lines: Iterable[memoryview], file_csv, file_error, stats: FileStats
+    ):
+        # The counters are local variables, cheaper to update in each line.
+        get_log_bytes, batch_size = self._get_log_bytes, self._batch_size
+        print_line = not self._quiet
+        lines_read, lines_parsed, lines_rejected = 0, 0, 0
+        logs_values = []
+        for line in lines:
+            lines_read += 1
+            if len(line) != 0:
+                log_values = get_log_bytes(line)
+                if log_values is None:
+                    lines_rejected += 1
+                    write_file.write_to_file_error_bytes(line, file_error, print_line)
+                else:
+                    logs_values.append(log_values)
+                    if len(logs_values) >= batch_size:
+                        lines_parsed += len(logs_values)
+                        write_file.write_to_file_results_bytes(logs_values, file_csv)
+                        logs_values = []
+        lines_parsed += len(logs_values)
+        write_file.write_to_file_results_bytes(logs_values, file_csv)
+        stats.lines_read += lines_read
+        stats.lines_parsed += lines_parsed
+        stats.lines_rejected += lines_rejected
+
+
+def get_batches(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    iterator = iter(items)
+    while True:
+        batch = list(itertools.islice(iterator, max(size, 1)))
+        if len(batch) == 0:
+            return
+        yield batch
+
+
+def get_parsers(args) -> Tuple[Callable, Callable]:
+    # Parsers of the lines as text and as bytes.
+    if args.log_format is None:
+        return m_log.PARSERS[args.parser], m_log.PARSERS_BYTES[args.parser]
+    log_format = compile_log_format(args.log_format)
+    return log_format.get_log, log_format.get_log_bytes
+
+
+def get_lines_converter(args) -> LinesConverter:
+    get_log, get_log_bytes = get_parsers(args)
+    return LinesConverter(
+        get_log=get_log,
+        get_log_bytes=get_log_bytes,
+        batch_size=args.batch_size,
+        quiet=args.quiet,
+        row_builder=get_row_builder(args),
+        log_filter=None if len(args.where) == 0 else get_log_filter(args),
+    )
+
+
+def get_log_filter(args) -> LogFilter:
+    return LogFilter(
+        args.where,
+        None if args.log_format is None else compile_log_format(args.log_format),
+    )
+
+
+def get_row_builder(args) -> RowBuilder:
+    if args.log_format is None:
+        return RowBuilder(args.time_format, args.split_request)
+    return RowBuilder(
+        args.time_format,
+        args.split_request,
+        compile_log_format(args.log_format).fieldnames,
+    )
+
+
+def open_results_file(pathname: str, args, mode: str = "w"):
+    if args.aggregate:
+        return aggregate.get_aggregator(args.top, args.sketch, pathname)
+    if args.rollup is not None:
+        return Rollup(args.rollup, args.rollup_lateness, pathname)
+    if args.latency is not None:
+        return get_latency_aggregator(args, pathname)
+    if args.format == "csv":
+        return open(pathname, mode, buffering=args.write_buffer)
+    return ColumnarFile(
+        pathname, args.format, args.row_group_size, get_row_builder(args).fieldnames
+    )
+
+
+def get_latency_aggregator(args, pathname: Optional[str] = None) -> LatencyAggregator:
+    return LatencyAggregator(
+        args.latency,
+        get_row_builder(args).fieldnames.index(args.latency_field),
+        pathname,
+    )
+
+
+def convert_pathname(
+    pathname: str,
+    file_csv,
+    file_error,
+    args,
+    byte_range: Optional[Tuple[int, int]] = None,
+) -> FileStats:
+    start = timer()
+    stats = FileStats(pathname)
+    stats.bytes_in = (
+        os.path.getsize(pathname)
+        if byte_range is None
+        else byte_range[1] - byte_range[0]
+    )
+    reader = FileReader(args.gz_reader)
+    if args.mmap and not pathname.endswith(".gz"):
+        # The text files have pending data to write before the binary one.
+        file_csv.flush()
+        file_error.flush()
+        get_lines_converter(args).convert_lines_bytes(
+            reader.get_lines_in_mmap(pathname, byte_range),
+            file_csv.buffer,
+            file_error.buffer,
+            stats,
+        )
+    else:
+        if byte_range is not None:
+            lines = reader.get_lines_in_byte_range(pathname, byte_range)
+        elif args.time_index:
+            log_filter = get_log_filter(args)
+            lines = time_index.get_lines_in_pathname(
+                pathname,
+                reader,
+                log_filter.time_start,
+                log_filter.time_end,
+                get_parsers(args)[0],
+            )
+        else:
+            lines = reader.get_lines_in_pathname(pathname)
+        convert_lines(lines, file_csv, file_error, args, stats)
+    stats.seconds = timer() - start
+    return stats
+
+
+def convert_pathname_incrementally(
+    pathname: str, file_csv, file_error, args, manifest: Manifest
+) -> Optional[FileStats]:
+    # Only the content after the offset saved in the manifest is converted.
+    # The current log file can have a last line being written, so it is
+    # converted in the next run.
+    reader = FileReader(args.gz_reader)
+    entry = manifest.get_entry(pathname, reader)
+    if entry.is_converted(pathname, reader):
+        print(f"Skip file: {pathname}")
+        entry.set_file(pathname, reader)
+        return None
+    start = timer()
+    stats = FileStats(pathname)
+    stats.bytes_in = os.path.getsize(pathname)
+    rows_start = manifest.rows
+    lines = reader.get_lines_in_pathname(
+        pathname,
+        entry.offset,
+        only_complete_lines=os.path.basename(pathname) == "access.log",
+    )
+    convert_lines(lines, file_csv, file_error, args, stats)
+    entry.offset = reader.offset
+    if stats.lines_parsed != 0:
+        entry.rows.append([rows_start, rows_start + stats.lines_parsed])
+    entry.set_file(pathname, reader)
+    stats.seconds = timer() - start
+    return stats
+
+
+def convert_followed_file(
+    follower: FileFollower, file_csv, file_error, args, stats: FileStats
+):
+    # Each batch of lines read is written at once, not when the buffer of the
+    # files is full, to see the new logs in the result files.
+    lines_converter = get_lines_converter(args)
+    writer_csv = create_file.get_results_writer(file_csv)
+    for lines in follower.get_lines_batches():
+        start = timer()
+        lines_converter.convert_lines(lines, writer_csv, file_error, stats)
+        file_csv.flush()
+        file_error.flush()
+        stats.seconds += timer() - start
+
+
+def convert_lines(lines: Iterable[str], file_csv, file_error, args, stats: FileStats):
+    lines_converter = get_lines_converter(args)
+    writer_csv = create_file.get_results_writer(file_csv)
+    if args.pipeline:
+        Pipeline(lines_converter, args.queue_size).convert_lines_batches(
+            get_batches(lines, args.batch_size), writer_csv, file_error, stats
+        )
+    else:
+        lines_converter.convert_lines(lines, writer_csv, file_error, stats)
+
+
+def convert_pathnames_in_parallel(
+    pathnames: Iterable[str], file_csv, file_error, args, run_stats: RunStats
+):
+    # Each task is converted to temporary files by a worker process and
+    # `imap` returns them in the order of the tasks, so the final files
+    # have the same content as when the files are converted one by one.
+    # https://docs.python.org/3/library/multiprocessing.html#multiprocessing.pool.Pool.imap
+    directory = os.path.dirname(os.path.abspath(file_csv.name))
+    tasks = _get_tasks(pathnames, directory, args.chunk_size)
+    with Pool(args.jobs) as pool:
+        for results, pathname_error, stats in pool.imap(
+            partial(_convert_task_to_temporary_files, args=args), tasks
+        ):
+            _move_results(results, file_csv)
+            _move_file_content(pathname_error, file_error)
+            run_stats.add(stats)
+
+
+def _get_tasks(
+    pathnames: Iterable[str], directory: str, chunk_size: int
+) -> Iterator[Task]:
+    # Plain files are split in ranges of lines to parse a big file using
+    # all the processes.
+    for pathname in pathnames:
+        if pathname.endswith(".gz"):
+            yield Task(pathname, directory)
+        else:
+            for byte_range in FileReader().get_byte_ranges(pathname, chunk_size):
+                yield Task(pathname, directory, byte_range)
+
+
+def _convert_task_to_temporary_files(
+    task: Task, args
+) -> Tuple[Union[str, Aggregator, LatencyAggregator, Rollup], str, FileStats]:
+    # The aggregators and rollup are returned to the main process instead of a
+    # file.
+    results: Union[str, Aggregator, LatencyAggregator, Rollup]
+    if args.aggregate:
+        results = file_results = aggregate.get_aggregator(args.top, args.sketch)
+    elif args.rollup is not None:
+        results = file_results = Rollup(args.rollup, args.rollup_lateness)
+    elif args.latency is not None:
+        results = file_results = get_latency_aggregator(args)
+    else:
+        results = _get_temporary_pathname(
+            task.directory, f".{FORMATS_EXTENSIONS[args.format]}"
+        )
+        file_results = open_results_file(results, args)
+    pathname_error = _get_temporary_pathname(task.directory, ".txt")
+    with file_results as file_csv, open(
+        pathname_error, "w", buffering=args.write_buffer
+    ) as file_error:
+        stats = convert_pathname(
+            task.pathname, file_csv, file_error, args, task.byte_range
+        )
+    return results, pathname_error, stats
+
+
+def _get_temporary_pathname(directory: str, suffix: str) -> str:
+    file_descriptor, pathname = tempfile.mkstemp(
+        prefix=".nginx-logs-", suffix=suffix, dir=directory
+    )
+    os.close(file_descriptor)
+    return pathname
+
+
+def _move_results(
+    results: Union[str, Aggregator, LatencyAggregator, Rollup], file_results
+):
+    if isinstance(results, str):
+        _move_file_content(results, file_results)
+    else:
+        file_results.merge(results)
+
+
+def _move_file_content(pathname: str, file):
+    if isinstance(file, ColumnarFile):
+        file.write_file_content(pathname)
+    else:
+        # `newline=""` keeps the "\r\n" line endings written by the csv writer.
+        with open(pathname, "r", newline="") as file_to_move:
+            shutil.copyfileobj(file_to_move, file)
+    os.remove(pathname)
@@ -1,21 +1,48 @@
 from pathlib import Path
-from typing import Tuple
+from typing import Sequence, Tuple
 import csv
 
+from aggregate import Aggregator
+from columnar_file import ColumnarFile
+from latency import LatencyAggregator
+from rollup import Rollup
 import m_log
 
 
-def get_pathnames_to_work_with(pathname: str) -> Tuple[str, str]:
-    path = Path(pathname)
-    path_without_filename = path.parent if path.is_file() else path
+def get_pathnames_to_work_with(
+    pathname: str,
+    filename_results: str = "result.csv",
+    description_results: str = "logs as csv",
+) -> Tuple[str, str]:
+    path_without_filename = _get_path_without_filename(pathname)
     result = (
-        str(path_without_filename.joinpath("result.csv")),
+        str(path_without_filename.joinpath(filename_results)),
         str(path_without_filename.joinpath("error.txt")),
     )
-    print(f"File with logs as csv: {result[0]}")
+    print(f"File with {description_results}: {result[0]}")
     print(f"File with not parsed logs: {result[1]}")
     return result
 
 
+def get_pathname_manifest(pathname: str) -> str:
+    return str(_get_path_without_filename(pathname).joinpath("manifest.json"))
+
+
 def get_csv_writer(file_csv):
-    return csv.DictWriter(file_csv, fieldnames=m_log.Log.DICT_KEYS)
+    return csv.writer(file_csv)
+
+
+def get_results_writer(file_results):
+    # The other results files write the logs by themselves.
+    if isinstance(file_results, (Aggregator, ColumnarFile, LatencyAggregator, Rollup)):
+        return file_results
+    return get_csv_writer(file_results)
+
+
+def write_csv_header(writer_csv, fieldnames: Sequence[str] = m_log.Log.DICT_KEYS):
+    writer_csv.writerow(fieldnames)
+
+
+def _get_path_without_filename(pathname: str) -> Path:
+    path = Path(pathname)
+    return path.parent if path.is_file() else path
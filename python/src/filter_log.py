@@ -0,0 +1,257 @@
+from datetime import datetime, timezone
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+import ipaddress
+import os
+
+from log_format import LOG_FORMATS, LogFormat
+from m_log import Log, get_log, get_request_values
+from m_time import TimeParser
+from read_file import FileReader
+
+WHERE_FIELDS = ("path", "remote_addr", "status", "time")
+# Variable of the log format with the value of each field.
+WHERE_VARIABLES = {
+    "path": "request",
+    "remote_addr": "remote_addr",
+    "status": "status",
+    "time": "time_local",
+}
+# Seconds that the logs can be out of order, for example at the start of a
+# rotated file.
+TIME_MARGIN = 300
+# Bytes read at the start and end of a file to get the time of its logs.
+TIME_CONTENT_SIZE = 64 * 1024
+
+
+class _Condition:
+    # Values of a field, any of them selects the log. The line prefilter is
+    # checked before parsing the line: if False, the log is not selected.
+    def __init__(
+        self,
+        is_log_selected: Callable[[Log], bool],
+        is_line_candidate: Optional[Callable[[str], bool]] = None,
+    ):
+        self.is_log_selected = is_log_selected
+        self.is_line_candidate = is_line_candidate
+
+
+class LogFilter:
+    # Selects the logs that match all the conditions, like `status=500-599`,
+    # `remote_addr=10.0.0.0/8`, `path=/api` or
+    # `time=2021-10-28T00:00:00Z/2021-10-28T01:00:00Z`. A condition can have
+    # values separated by commas, like `status=404,500-599`.
+    def __init__(self, conditions: List[str], log_format: Optional[LogFormat] = None):
+        self._time_parser = TimeParser()
+        self._get_log = get_log if log_format is None else log_format.get_log
+        self.time_start: Optional[int] = None
+        self.time_end: Optional[int] = None
+        self._conditions: List[_Condition] = []
+        for condition in conditions:
+            field, separator, values = condition.partition("=")
+            if separator == "" or field not in WHERE_FIELDS or values == "":
+                raise ValueError(
+                    f"Condition not valid: {condition}. Use field=value with the"
+                    f" fields {', '.join(WHERE_FIELDS)}"
+                )
+            get_condition = getattr(self, f"_get_condition_{field}")
+            self._conditions.append(get_condition(values.split(",")))
+        # The prefilters look for the text around the values in the combined
+        # format, the lines of other formats are only filtered after parsing.
+        self._prefilters = (
+            [
+                condition.is_line_candidate
+                for condition in self._conditions
+                if condition.is_line_candidate is not None
+            ]
+            if log_format is None or log_format.log_format == LOG_FORMATS["combined"]
+            else []
+        )
+
+    def is_line_candidate(self, line: str) -> bool:
+        # Cheaper than parsing the line.
+        for is_line_candidate in self._prefilters:
+            if not is_line_candidate(line):
+                return False
+        return True
+
+    def is_log_selected(self, log: Log) -> bool:
+        for condition in self._conditions:
+            if not condition.is_log_selected(log):
+                return False
+        return True
+
+    def get_pathnames_to_convert(
+        self, pathnames: List[str], reader: FileReader
+    ) -> Iterator[str]:
+        # The pathnames are sorted from the oldest to the newest file. A file
+        # is skipped if its logs are not in the time window: they are after
+        # the time of its first log and before the first log of the next
+        # file, or the last log for plain files.
+        if self.time_start is None and self.time_end is None:
+            yield from pathnames
+            return
+        times_start = [
+            self._get_time_first_log(pathname, reader) for pathname in pathnames
+        ]
+        for index, pathname in enumerate(pathnames):
+            time_start = times_start[index]
+            if pathname.endswith(".gz"):
+                time_end = (
+                    times_start[index + 1] if index + 1 < len(times_start) else None
+                )
+            else:
+                time_end = self._get_time_last_log(pathname)
+            if self._is_time_range_in_window(time_start, time_end):
+                yield pathname
+            else:
+                print(f"Skip file out of the time window: {pathname}")
+
+    def _is_time_range_in_window(
+        self, time_start: Optional[int], time_end: Optional[int]
+    ) -> bool:
+        if (
+            time_start is not None
+            and self.time_end is not None
+            and time_start - TIME_MARGIN >= self.time_end
+        ):
+            return False
+        if (
+            time_end is not None
+            and self.time_start is not None
+            and time_end + TIME_MARGIN < self.time_start
+        ):
+            return False
+        return True
+
+    def _get_time_first_log(self, pathname: str, reader: FileReader) -> Optional[int]:
+        lines = (
+            reader.get_content_start(pathname, TIME_CONTENT_SIZE)
+            .decode(errors="replace")
+            .splitlines()
+        )
+        # The last line can be incomplete.
+        return self._get_time_first_log_in_lines(lines[:-1] or lines)
+
+    def _get_time_last_log(self, pathname: str) -> Optional[int]:
+        with open(pathname, "rb") as file:
+            file.seek(0, 2)
+            file.seek(max(file.tell() - TIME_CONTENT_SIZE, 0))
+            lines = file.read().decode(errors="replace").splitlines()
+        # The first line can be incomplete.
+        return self._get_time_first_log_in_lines(reversed(lines[1:] or lines))
+
+    def _get_time_first_log_in_lines(self, lines: Iterable[str]) -> Optional[int]:
+        for line in lines:
+            log = self._get_log(line)
+            if log is not None:
+                time = self._time_parser.get_epoch(log.time_local)
+                if time is not None:
+                    return time
+        return None
+
+    def _get_condition_path(self, values: List[str]) -> _Condition:
+        prefixes = tuple(values)
+        # The path is after the method and a space.
+        substrings = [f" {prefix}" for prefix in prefixes]
+
+        def is_log_selected(log: Log) -> bool:
+            path = get_request_values(log.request)[1]
+            return path is not None and path.startswith(prefixes)
+
+        return _Condition(
+            is_log_selected,
+            lambda line: any(substring in line for substring in substrings),
+        )
+
+    def _get_condition_remote_addr(self, values: List[str]) -> _Condition:
+        networks = [ipaddress.ip_network(value, strict=False) for value in values]
+        # The line starts with the address. The networks with a prefix of
+        # complete numbers of an IPv4 address start with the same text.
+        line_starts = []
+        for network in networks:
+            if (
+                network.version != 4
+                or network.prefixlen == 0
+                or network.prefixlen % 8 != 0
+            ):
+                line_starts = None
+                break
+            numbers = str(network.network_address).split(".")[: network.prefixlen // 8]
+            line_starts.append(".".join(numbers) + (" " if len(numbers) == 4 else "."))
+
+        def is_log_selected(log: Log) -> bool:
+            try:
+                address = ipaddress.ip_address(log.remote_addr)
+            except ValueError:
+                return False
+            return any(address in network for network in networks)
+
+        return _Condition(
+            is_log_selected,
+            (
+                None
+                if line_starts is None
+                else lambda line: line.startswith(tuple(line_starts))
+            ),
+        )
+
+    def _get_condition_status(self, values: List[str]) -> _Condition:
+        ranges = [_get_status_range(value) for value in values]
+        # The status is after the quote of the request and a space. The
+        # statuses of a range start with the same digits.
+        substrings = []
+        for start, end in ranges:
+            start_text, end_text = str(start), str(end)
+            if len(start_text) != len(end_text):
+                start_text = ""
+            substrings.append(f'" {os.path.commonprefix([start_text, end_text])}')
+
+        def is_log_selected(log: Log) -> bool:
+            if not log.status.isdigit():
+                return False
+            status = int(log.status)
+            return any(start <= status <= end for start, end in ranges)
+
+        return _Condition(
+            is_log_selected,
+            lambda line: any(substring in line for substring in substrings),
+        )
+
+    def _get_condition_time(self, values: List[str]) -> _Condition:
+        if len(values) != 1:
+            raise ValueError("Only one time window is allowed")
+        start, separator, end = values[0].partition("/")
+        if separator == "":
+            raise ValueError(f"Time window not valid, use start/end: {values[0]}")
+        if start != "":
+            self.time_start = _get_epoch(start)
+        if end != "":
+            self.time_end = _get_epoch(end)
+        time_start, time_end = self.time_start, self.time_end
+        get_epoch = self._time_parser.get_epoch
+
+        def is_log_selected(log: Log) -> bool:
+            time = get_epoch(log.time_local)
+            return (
+                time is not None
+                and (time_start is None or time >= time_start)
+                and (time_end is None or time < time_end)
+            )
+
+        return _Condition(is_log_selected)
+
+
+def _get_status_range(value: str) -> Tuple[int, int]:
+    # Like `404`, `500-599` or `5xx`.
+    if len(value) == 3 and value[1:] == "xx" and value[0].isdigit():
+        return int(value[0]) * 100, int(value[0]) * 100 + 99
+    start, _, end = value.partition("-")
+    return int(start), int(end or start)
+
+
+def _get_epoch(value: str) -> int:
+    # ISO 8601 time, in UTC if it has not time zone.
+    time = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if time.tzinfo is None:
+        time = time.replace(tzinfo=timezone.utc)
+    return int(time.timestamp())
@@ -0,0 +1,243 @@
+from timeit import default_timer as timer
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+import ctypes
+import ctypes.util
+import os
+import select
+import threading
+
+from read_file import BLOCK_SIZE
+
+FOLLOW_INTERVAL = 1.0
+# Seconds that a rotated file is read without new lines before it is closed.
+ROTATED_FILE_GRACE = 5.0
+FOLLOW_WATCHERS = ("auto", "inotify", "polling")
+# https://man7.org/linux/man-pages/man7/inotify.7.html
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+INOTIFY_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+)
+
+
+class PollingWatcher:
+    def __init__(self, interval: float = FOLLOW_INTERVAL):
+        self._interval = interval
+        self._stop = threading.Event()
+
+    def wait(self):
+        self._stop.wait(self._interval)
+
+    def stop(self):
+        self._stop.set()
+
+    def is_stopped(self) -> bool:
+        return self._stop.is_set()
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher(PollingWatcher):
+    # Waits until a file of the directory changes, with the interval as
+    # timeout to check the files anyway.
+    def __init__(self, directory: str, interval: float = FOLLOW_INTERVAL):
+        super().__init__(interval)
+        libc = _get_libc()
+        self._file_descriptor = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._file_descriptor < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+        watch_descriptor = libc.inotify_add_watch(
+            self._file_descriptor, os.fsencode(directory), INOTIFY_MASK
+        )
+        if watch_descriptor < 0:
+            errno = ctypes.get_errno()
+            os.close(self._file_descriptor)
+            raise OSError(errno, f"inotify_add_watch: {directory}")
+        # `stop` writes to this pipe to end the wait.
+        self._pipe_read, self._pipe_write = os.pipe()
+
+    def wait(self):
+        if self.is_stopped():
+            return
+        ready, _, _ = select.select(
+            [self._file_descriptor, self._pipe_read], [], [], self._interval
+        )
+        if self._file_descriptor in ready:
+            # The events are not used, only that something has changed.
+            try:
+                while len(os.read(self._file_descriptor, 4096)) != 0:
+                    pass
+            except BlockingIOError:
+                pass
+
+    def stop(self):
+        super().stop()
+        os.write(self._pipe_write, b"\0")
+
+    def close(self):
+        for file_descriptor in (
+            self._file_descriptor,
+            self._pipe_read,
+            self._pipe_write,
+        ):
+            os.close(file_descriptor)
+
+
+class FileFollower:
+    # Reads the lines added to a file, like `tail -F`. When the file is
+    # rotated (renamed, so other file has its pathname), the rotated file is
+    # read until the new file has data or the rotated one is not written for
+    # `rotated_grace` seconds, because nginx writes to the renamed file until
+    # it reopens its logs. Then the new file is followed from its start.
+    # If the file is truncated, it is followed from its start.
+    def __init__(
+        self,
+        pathname: str,
+        watcher: PollingWatcher,
+        rotated_grace: float = ROTATED_FILE_GRACE,
+    ):
+        self._pathname = pathname
+        self._watcher = watcher
+        self._rotated_grace = rotated_grace
+
+    def get_lines_batches(self, offset: int = 0) -> Iterator[List[str]]:
+        # Each batch has the complete lines read, without waiting for more
+        # lines, so they can be converted with low latency.
+        file = self._open_file()
+        file_rotated: Optional[BinaryIO] = None
+        line_start_rotated = b""
+        time_rotated_read = 0.0
+        try:
+            if file is not None:
+                file.seek(offset)
+            line_start = b""
+            while not self._watcher.is_stopped():
+                if file_rotated is not None:
+                    lines, line_start_rotated = self._get_lines(
+                        file_rotated, line_start_rotated
+                    )
+                    if len(lines) != 0:
+                        time_rotated_read = timer()
+                        yield lines
+                        continue
+                    if not self._is_rotated_file_ended(file, time_rotated_read):
+                        self._watcher.wait()
+                        if file is None:
+                            file = self._open_file()
+                        continue
+                    # The writes before nginx reopened its logs are read.
+                    lines, line_start_rotated = self._get_lines(
+                        file_rotated, line_start_rotated, True
+                    )
+                    lines += _decode_lines(line_start_rotated)
+                    file_rotated.close()
+                    file_rotated, line_start_rotated = None, b""
+                    if len(lines) != 0:
+                        yield lines
+                    continue
+                if file is None:
+                    self._watcher.wait()
+                    file = self._open_file()
+                    continue
+                lines, line_start = self._get_lines(file, line_start)
+                if len(lines) != 0:
+                    yield lines
+                    continue
+                if self._is_rotated(file):
+                    file_rotated, line_start_rotated = file, line_start
+                    time_rotated_read = timer()
+                    file, line_start = self._open_file(), b""
+                    continue
+                if os.fstat(file.fileno()).st_size < file.tell():
+                    print(f"File truncated: {self._pathname}")
+                    file.seek(0)
+                    line_start = b""
+                    continue
+                self._watcher.wait()
+        finally:
+            for file_open in (file, file_rotated):
+                if file_open is not None:
+                    file_open.close()
+
+    def stop(self):
+        self._watcher.stop()
+
+    def _open_file(self) -> Optional[BinaryIO]:
+        try:
+            file = open(self._pathname, "rb")
+        except FileNotFoundError:
+            return None
+        print(f"Follow file: {self._pathname}")
+        return file
+
+    def _is_rotated_file_ended(
+        self, file: Optional[BinaryIO], time_rotated_read: float
+    ) -> bool:
+        # nginx has reopened its logs if the new file has data.
+        if file is not None and os.fstat(file.fileno()).st_size != 0:
+            return True
+        return timer() - time_rotated_read >= self._rotated_grace
+
+    def _is_rotated(self, file: BinaryIO) -> bool:
+        try:
+            return os.stat(self._pathname).st_ino != os.fstat(file.fileno()).st_ino
+        except FileNotFoundError:
+            return True
+
+    def _get_lines(
+        self, file: BinaryIO, line_start: bytes, to_end: bool = False
+    ) -> Tuple[List[str], bytes]:
+        # The text after the last new line is returned to be joined to the
+        # next data read.
+        lines: List[str] = []
+        while True:
+            block = file.read(BLOCK_SIZE)
+            if len(block) == 0:
+                return lines, line_start
+            block = line_start + block
+            lines_end = block.rfind(b"\n") + 1
+            line_start = block[lines_end:]
+            lines += _decode_lines(block[:lines_end])
+            if not to_end and len(lines) != 0:
+                return lines, line_start
+
+
+def get_watcher(
+    directory: str, watcher: str = "auto", interval: float = FOLLOW_INTERVAL
+) -> PollingWatcher:
+    # inotify is only available on Linux, other systems check the files
+    # each interval.
+    if watcher == "polling":
+        return PollingWatcher(interval)
+    try:
+        return InotifyWatcher(directory, interval)
+    except (AttributeError, OSError):
+        if watcher == "inotify":
+            raise
+        return PollingWatcher(interval)
+
+
+def _decode_lines(content: bytes) -> List[str]:
+    return content.decode().splitlines()
+
+
+def _get_libc():
+    # https://docs.python.org/3/library/ctypes.html#loading-shared-libraries
+    libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    libc.inotify_init1.argtypes = [ctypes.c_int]
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    return libc
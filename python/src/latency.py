@@ -0,0 +1,164 @@
+from typing import Dict, Iterable, Optional, Union
+import csv
+import math
+import time
+
+from aggregate import MINUTE_FORMAT
+from m_log import get_request_values
+from m_time import TimeParser
+
+LATENCY_GROUPS = ("minute", "path")
+QUANTILES = (0.5, 0.95, 0.99)
+# The values of the histogram have an error of less than this relative to
+# the real value.
+RELATIVE_ERROR = 0.01
+# Seconds counted as 0, nginx logs the times with milliseconds.
+MIN_SECONDS = 1e-6
+
+
+class LatencyHistogram:
+    # Number of values in buckets of exponential size, like HdrHistogram: the
+    # memory used depends on the range of the values, not on their number,
+    # and the histograms of different files can be added.
+    # The bucket `index` has the values in (gamma^(index - 1), gamma^index].
+    # https://www.vldb.org/pvldb/vol12/p2195-masson.pdf
+    def __init__(self, relative_error: float = RELATIVE_ERROR):
+        self.relative_error = relative_error
+        self.counts: Dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+        self.max = 0.0
+        self._gamma = (1 + relative_error) / (1 - relative_error)
+        self._log_gamma = math.log(self._gamma)
+
+    def add(self, seconds: float):
+        self.count += 1
+        if seconds > self.max:
+            self.max = seconds
+        if seconds < MIN_SECONDS:
+            self.zeros += 1
+            return
+        index = math.ceil(math.log(seconds) / self._log_gamma)
+        self.counts[index] = self.counts.get(index, 0) + 1
+
+    def merge(self, histogram: "LatencyHistogram"):
+        if histogram.relative_error != self.relative_error:
+            raise ValueError(
+                "Histograms with different relative error:"
+                f" {self.relative_error}, {histogram.relative_error}"
+            )
+        for index, count in histogram.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.zeros += histogram.zeros
+        self.count += histogram.count
+        self.max = max(self.max, histogram.max)
+
+    def get_quantile(self, quantile: float) -> Optional[float]:
+        if self.count == 0:
+            return None
+        # Number of values less than or equal to the quantile.
+        rank = max(math.ceil(quantile * self.count), 1)
+        if rank <= self.zeros:
+            return 0.0
+        count = self.zeros
+        for index in sorted(self.counts):
+            count += self.counts[index]
+            if count >= rank:
+                # The value with the same relative error to both bucket ends.
+                return min(2 * self._gamma**index / (self._gamma + 1), self.max)
+        return self.max
+
+
+class LatencyAggregator:
+    # Writes a row for each minute or path with the number of logs with a
+    # time and the quantiles of the time, instead of writing the logs. It has
+    # the `writerows` method of the csv writer, so the logs are converted in
+    # the same way, and the aggregators of different files can be merged.
+    # Without a pathname, no rows are written.
+    def __init__(self, group: str, field_index: int, pathname: Optional[str] = None):
+        self.name = pathname
+        self.group = group
+        self.field_index = field_index
+        self.logs_without_time = 0
+        # Keys are the paths or the epoch of the start of the minute, in UTC.
+        self.histograms: Dict[Union[str, int], LatencyHistogram] = {}
+        self._time_parser = TimeParser()
+
+    def __enter__(self) -> "LatencyAggregator":
+        return self
+
+    def __exit__(self, exception_type, exception, traceback):
+        # The rows of only part of the logs are not written.
+        if exception_type is None:
+            self.close()
+
+    def writerows(self, rows: Iterable[tuple]):
+        # The rows start with the values of the log, the times are floats.
+        field_index, histograms = self.field_index, self.histograms
+        get_key = self._get_minute if self.group == "minute" else self._get_path
+        for row in rows:
+            seconds = row[field_index]
+            key = get_key(row)
+            if seconds is None or key is None:
+                self.logs_without_time += 1
+                continue
+            histogram = histograms.get(key)
+            if histogram is None:
+                histogram = histograms[key] = LatencyHistogram()
+            histogram.add(seconds)
+
+    def flush(self):
+        pass
+
+    def merge(self, aggregator: "LatencyAggregator"):
+        for key, histogram in aggregator.histograms.items():
+            self.histograms.setdefault(key, LatencyHistogram()).merge(histogram)
+        self.logs_without_time += aggregator.logs_without_time
+
+    def close(self):
+        if self.name is None:
+            return
+        if self.group == "minute":
+            keys = sorted(self.histograms)
+        else:
+            keys = sorted(
+                self.histograms, key=lambda key: (-self.histograms[key].count, key)
+            )
+        with open(self.name, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(
+                [
+                    self.group,
+                    "requests",
+                    *(f"p{round(quantile * 100)}" for quantile in QUANTILES),
+                    "max",
+                ]
+            )
+            for key in keys:
+                histogram = self.histograms[key]
+                writer.writerow(
+                    [
+                        (
+                            time.strftime(MINUTE_FORMAT, time.gmtime(key))
+                            if self.group == "minute"
+                            else key
+                        ),
+                        histogram.count,
+                        *(
+                            _get_seconds_text(histogram.get_quantile(quantile))
+                            for quantile in QUANTILES
+                        ),
+                        _get_seconds_text(histogram.max),
+                    ]
+                )
+
+    def _get_minute(self, row: tuple) -> Optional[int]:
+        epoch = self._time_parser.get_epoch(row[2])
+        return None if epoch is None else epoch - epoch % 60
+
+    def _get_path(self, row: tuple) -> Optional[str]:
+        return get_request_values(row[3])[1]
+
+
+def _get_seconds_text(seconds: Optional[float]) -> str:
+    return "" if seconds is None else f"{seconds:.6f}"
@@ -1,13 +1,28 @@
+from pathlib import Path
+from typing import List, Optional, Tuple
 import argparse
+import os
 
 from filter_file import FilenamesFilter
-from read_file import FileReader
+from filter_log import WHERE_VARIABLES, LogFilter
+from follow_file import FileFollower
+from manifest import Manifest
+from stats import FileStats, RunStats
+import aggregate
+import columnar_file
+import convert_file
 import create_file
+import follow_file
+import latency
+import log_format
 import m_log
-import write_file
+import m_time
+import pipeline
+import read_file
+import rollup
 
 
-def get_args_parsed():
+def get_args_parsed(args: Optional[List[str]] = None):
     # https://docs.python.org/3/library/argparse.html#the-add-argument-method
     parser = argparse.ArgumentParser(description="Export Nginx logs to a csv file.")
     parser.add_argument(
@@ -15,20 +30,445 @@ def get_args_parsed():
         type=str,
         help="path to a folder with the log files or to an specific file",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of processes used to convert the log files in parallel",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=64 * 1024 * 1024,
+        help="with --jobs, plain files are split in parts of about this number of"
+        " bytes that are converted in parallel",
+    )
+    parser.add_argument(
+        "--mmap",
+        action="store_true",
+        help="parse plain files as bytes from a memory-mapped file, without"
+        " decoding the lines",
+    )
+    parser.add_argument(
+        "--parser",
+        choices=sorted(m_log.PARSERS),
+        default="regex",
+        help="parse the lines with a regex or by the index of the delimiters"
+        " between values, which is faster",
+    )
+    parser.add_argument(
+        "--log-format",
+        help="nginx log_format of the lines, like '$remote_addr - $remote_user"
+        ' [$time_local] "$request" $status $body_bytes_sent "$http_referer"'
+        ' "$http_user_agent" $request_time\', or combined. A parser is generated'
+        " for the format instead of --parser. The variables of the format that"
+        " are not in the combined one are added as columns",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=convert_file.BATCH_SIZE,
+        help="number of parsed lines written to the csv file at once",
+    )
+    parser.add_argument(
+        "--write-buffer",
+        type=int,
+        default=convert_file.WRITE_BUFFER_SIZE,
+        help="size in bytes of the buffer of the result files",
+    )
+    parser.add_argument(
+        "--gz-reader",
+        choices=read_file.GZ_READERS,
+        default="auto",
+        help="how to decompress the gz files: with pigz or zcat if they are"
+        " installed (auto), only with them (external), with zlib in a thread while"
+        " the lines are parsed (thread) or with zlib (zlib)",
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="read, parse and write the lines in different threads; the summary"
+        " shows the stats of each stage. Not used for plain files with --mmap",
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=pipeline.QUEUE_SIZE,
+        help="with --pipeline, maximum number of batches waiting for the next stage",
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="do not show the lines not parsed, only write them to the error file",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="append to the result files only the logs not converted in previous"
+        " runs, saved in a manifest.json file next to them",
+    )
+    parser.add_argument(
+        "--follow",
+        action="store_true",
+        help="after converting the files, keep converting the logs added to"
+        " access.log, also after it is rotated, until Ctrl+C is pressed",
+    )
+    parser.add_argument(
+        "--follow-watcher",
+        choices=follow_file.FOLLOW_WATCHERS,
+        default="auto",
+        help="with --follow, how to know that access.log has changed: with"
+        " inotify if available (auto), only with inotify (inotify) or checking it"
+        " each --follow-interval (polling)",
+    )
+    parser.add_argument(
+        "--follow-interval",
+        type=float,
+        default=follow_file.FOLLOW_INTERVAL,
+        help="with --follow, maximum seconds to wait before checking access.log",
+    )
+    parser.add_argument(
+        "--format",
+        choices=columnar_file.FORMATS,
+        default="csv",
+        help="format of the file with the logs: csv, Arrow IPC stream (arrow) or"
+        " parquet. The arrow and parquet files have typed columns and require"
+        " pyarrow",
+    )
+    parser.add_argument(
+        "--row-group-size",
+        type=int,
+        default=columnar_file.ROW_GROUP_SIZE,
+        help="with --format arrow or parquet, number of logs written at once",
+    )
+    parser.add_argument(
+        "--time-format",
+        choices=m_time.TIME_FORMATS,
+        help="add a column with the time local in UTC, as seconds since the epoch"
+        " (time_epoch) or in ISO 8601 format (time_iso)",
+    )
+    parser.add_argument(
+        "--split-request",
+        action="store_true",
+        help="add the columns method, path, query and protocol with the values of"
+        " the request, empty if it is not valid",
+    )
+    parser.add_argument(
+        "--aggregate",
+        action="store_true",
+        help="do not write the logs, write a summary.json file with the number of"
+        " logs per status, the remote addresses and paths with more logs and the"
+        " bytes sent per minute",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=aggregate.TOP_SIZE,
+        help="with --aggregate, number of remote addresses and paths in the summary",
+    )
+    parser.add_argument(
+        "--sketch",
+        action="store_true",
+        help="with --aggregate, count the remote addresses, paths and user agents"
+        " with sketches of fixed memory, with an error. The sketches are saved in"
+        " the summary",
+    )
+    parser.add_argument(
+        "--merge-summary",
+        action="append",
+        default=[],
+        help="with --aggregate and --sketch, add to the summary the counts of a"
+        " summary.json file of other run with --sketch. Can be used several times",
+    )
+    parser.add_argument(
+        "--rollup",
+        choices=sorted(rollup.ROLLUP_INTERVALS),
+        help="do not write the logs, write a rollup.csv file with the number of"
+        " logs, logs per status class and bytes sent of each minute or hour",
+    )
+    parser.add_argument(
+        "--rollup-lateness",
+        type=int,
+        default=rollup.LATENESS,
+        help="with --rollup, seconds to wait for logs of a minute or hour after"
+        " it ends before writing its row",
+    )
+    parser.add_argument(
+        "--latency",
+        choices=latency.LATENCY_GROUPS,
+        help="do not write the logs, write a latency.csv file with the number of"
+        " logs and the quantiles p50, p95 and p99 of --latency-field of each"
+        " minute or path. Requires --log-format with the variable",
+    )
+    parser.add_argument(
+        "--latency-field",
+        choices=log_format.VARIABLES_SECONDS,
+        default="request_time",
+        help="with --latency, time of the logs used",
+    )
+    parser.add_argument(
+        "--where",
+        action="append",
+        default=[],
+        help="only convert the logs with a field value, like status=500-599,"
+        " status=5xx, remote_addr=10.0.0.0/8, path=/api or"
+        " time=2021-10-28T00:00:00Z/2021-10-28T01:00:00Z (start or end can be"
+        " empty). A condition can have several values separated by commas and"
+        " can be used several times, the logs must match all the conditions."
+        " With a time window, the files without logs in it are skipped. The"
+        " lines skipped before parsing them are not written to error.txt",
+    )
+    parser.add_argument(
+        "--time-index",
+        action="store_true",
+        help="save an index with the time of the logs next to each log file"
+        " (.index.json) and, with --where time, read only the part of the files"
+        " with an index around the time window",
+    )
+    args_parsed = parser.parse_args(args)
+    for option, value in (
+        ("--batch-size", args_parsed.batch_size),
+        ("--write-buffer", args_parsed.write_buffer),
+        ("--queue-size", args_parsed.queue_size),
+        ("--follow-interval", args_parsed.follow_interval),
+        ("--jobs", args_parsed.jobs),
+        ("--chunk-size", args_parsed.chunk_size),
+        ("--row-group-size", args_parsed.row_group_size),
+        ("--top", args_parsed.top),
+    ):
+        if value <= 0:
+            parser.error(f"argument {option}: must be greater than 0")
+    if args_parsed.incremental and (args_parsed.jobs > 1 or args_parsed.mmap):
+        parser.error("argument --incremental: not allowed with --jobs or --mmap")
+    if args_parsed.incremental and args_parsed.follow:
+        parser.error("argument --follow: not allowed with --incremental")
+    if args_parsed.mmap and args_parsed.time_format is not None:
+        parser.error("argument --time-format: not allowed with --mmap")
+    if args_parsed.mmap and args_parsed.split_request:
+        parser.error("argument --split-request: not allowed with --mmap")
+    for option, value in (
+        ("--aggregate", args_parsed.aggregate),
+        ("--rollup", args_parsed.rollup is not None),
+        ("--latency", args_parsed.latency is not None),
+    ):
+        if value and (
+            args_parsed.incremental or args_parsed.mmap or args_parsed.format != "csv"
+        ):
+            parser.error(
+                f"argument {option}: not allowed with --incremental, --mmap or"
+                " --format"
+            )
+    if args_parsed.aggregate and args_parsed.rollup is not None:
+        parser.error("argument --rollup: not allowed with --aggregate")
+    if args_parsed.latency is not None:
+        if args_parsed.aggregate or args_parsed.rollup is not None:
+            parser.error("argument --latency: not allowed with --aggregate or --rollup")
+        if args_parsed.log_format is None:
+            parser.error("argument --latency: only allowed with --log-format")
+    if (args_parsed.sketch or len(args_parsed.merge_summary) != 0) and not (
+        args_parsed.aggregate
+    ):
+        parser.error(
+            "argument --sketch, --merge-summary: only allowed with --aggregate"
+        )
+    if len(args_parsed.merge_summary) != 0 and not args_parsed.sketch:
+        parser.error("argument --merge-summary: only allowed with --sketch")
+    if len(args_parsed.where) != 0:
+        if args_parsed.incremental or args_parsed.mmap:
+            parser.error("argument --where: not allowed with --incremental or --mmap")
+        try:
+            LogFilter(args_parsed.where)
+        except ValueError as exception:
+            parser.error(f"argument --where: {exception}")
+    if args_parsed.time_index and (
+        args_parsed.incremental or args_parsed.mmap or args_parsed.jobs > 1
+    ):
+        parser.error(
+            "argument --time-index: not allowed with --incremental, --mmap or --jobs"
+        )
+    if args_parsed.log_format is not None:
+        try:
+            compiled_log_format = log_format.compile_log_format(args_parsed.log_format)
+        except ValueError as exception:
+            parser.error(f"argument --log-format: {exception}")
+        if (
+            args_parsed.aggregate
+            or args_parsed.rollup is not None
+            or args_parsed.format != "csv"
+        ) and not compiled_log_format.has_variables(list(log_format.VARIABLES_NUMBER)):
+            parser.error(
+                "argument --log-format: $status and $body_bytes_sent are required"
+                " with --aggregate, --rollup or --format"
+            )
+        # The times of the logs are the values of $time_local.
+        options_time = [
+            option
+            for option, value in (
+                ("--time-format", args_parsed.time_format is not None),
+                ("--rollup", args_parsed.rollup is not None),
+                ("--latency minute", args_parsed.latency == "minute"),
+                ("--time-index", args_parsed.time_index),
+            )
+            if value
+        ]
+        if len(options_time) != 0 and not compiled_log_format.has_variables(
+            ["time_local"]
+        ):
+            parser.error(
+                "argument --log-format: $time_local is required with"
+                f" {', '.join(options_time)}"
+            )
+        for condition in args_parsed.where:
+            variable = WHERE_VARIABLES.get(condition.partition("=")[0])
+            if variable is not None and not compiled_log_format.has_variables(
+                [variable]
+            ):
+                parser.error(f"argument --where: ${variable} is not in --log-format")
+        if args_parsed.latency is not None and not (
+            compiled_log_format.has_variables([args_parsed.latency_field])
+        ):
+            parser.error(
+                f"argument --latency: ${args_parsed.latency_field} is not in"
+                " --log-format"
+            )
+    if args_parsed.format != "csv":
+        if args_parsed.incremental or args_parsed.mmap:
+            parser.error(
+                "argument --format: only csv allowed with --incremental or --mmap"
+            )
+        try:
+            columnar_file.import_pyarrow()
+        except ImportError as exception:
+            parser.error(f"argument --format: {exception}")
+    return args_parsed
 
 
 def run(args):
     print(f"Checking: {args.pathname}")
-    pathname_csv, pathname_error = create_file.get_pathnames_to_work_with(args.pathname)
-    with open(pathname_csv, "w") as file_csv, open(pathname_error, "w") as file_error:
-        writer_csv = create_file.get_csv_writer(file_csv)
-        writer_csv.writeheader()
-        for pathname in FilenamesFilter().get_pathnames_to_analyze(args.pathname):
-            for line in FileReader().get_lines_in_pathname(pathname):
-                if len(line) != 0:
-                    log = m_log.get_log(line)
-                    if log is None:
-                        write_file.write_to_file_error(line, file_error)
-                    else:
-                        write_file.write_to_file_result(log, writer_csv)
+    pathname_csv, pathname_error = create_file.get_pathnames_to_work_with(
+        args.pathname, *_get_filename_and_description_results(args)
+    )
+    pathnames = FilenamesFilter().get_pathnames_to_analyze(args.pathname)
+    if len(args.where) != 0:
+        pathnames = convert_file.get_log_filter(args).get_pathnames_to_convert(
+            list(pathnames), read_file.FileReader(args.gz_reader)
+        )
+    if args.follow:
+        # The followed file is converted from its start while it is followed.
+        pathname_to_follow = _get_pathname_to_follow(args.pathname)
+        pathnames = (
+            pathname for pathname in pathnames if pathname != pathname_to_follow
+        )
+    run_stats = RunStats()
+    pathname_manifest = create_file.get_pathname_manifest(args.pathname)
+    manifest = (
+        Manifest.load(pathname_manifest)
+        if args.incremental
+        and os.path.isfile(pathname_manifest)
+        and os.path.isfile(pathname_csv)
+        else Manifest()
+    )
+    if (
+        not args.incremental
+        and _is_result_csv(args)
+        and os.path.isfile(pathname_manifest)
+    ):
+        # The result files are created again, so the manifest is not valid.
+        os.remove(pathname_manifest)
+    fieldnames = convert_file.get_row_builder(args).fieldnames
+    if manifest.fieldnames != fieldnames:
+        # Without --incremental, the manifest is new and all the logs are
+        # converted anyway.
+        if args.incremental:
+            print("The columns are different, all the logs are converted again")
+        manifest = Manifest(fieldnames=fieldnames)
+    # Without a manifest, the result files are created again.
+    mode = "a" if len(manifest.entries) != 0 else "w"
+    with convert_file.open_results_file(pathname_csv, args, mode) as file_csv, open(
+        pathname_error, mode, buffering=args.write_buffer
+    ) as file_error:
+        for pathname_summary in args.merge_summary:
+            file_csv.merge(aggregate.load_summary(pathname_summary))
+        if mode == "w" and _is_result_csv(args):
+            writer_csv = create_file.get_csv_writer(file_csv)
+            create_file.write_csv_header(writer_csv, fieldnames)
+        if args.incremental:
+            for pathname in pathnames:
+                stats = convert_file.convert_pathname_incrementally(
+                    pathname, file_csv, file_error, args, manifest
+                )
+                if stats is not None:
+                    run_stats.add(stats)
+                # The manifest is saved after the converted logs are written.
+                file_csv.flush()
+                file_error.flush()
+                manifest.save(pathname_manifest)
+        elif args.jobs > 1:
+            convert_file.convert_pathnames_in_parallel(
+                pathnames, file_csv, file_error, args, run_stats
+            )
+        else:
+            for pathname in pathnames:
+                run_stats.add(
+                    convert_file.convert_pathname(pathname, file_csv, file_error, args)
+                )
+        if args.follow:
+            _follow_pathname(pathname_to_follow, file_csv, file_error, args, run_stats)
+    run_stats.bytes_out = os.path.getsize(pathname_csv) + os.path.getsize(
+        pathname_error
+    )
+    for summary_line in run_stats.get_summary():
+        print(summary_line)
+    if args.rollup is not None:
+        print(f"Logs without a valid time, not added: {file_csv.logs_without_time:,}")
+    elif args.latency is not None:
+        print(
+            f"Logs without {args.latency_field} or {args.latency}, not added:"
+            f" {file_csv.logs_without_time:,}"
+        )
+
+
+def _is_result_csv(args) -> bool:
+    # The logs are written to result.csv, the file of the manifest.
+    return (
+        args.format == "csv"
+        and not args.aggregate
+        and args.rollup is None
+        and args.latency is None
+    )
+
+
+def _get_filename_and_description_results(args) -> Tuple[str, str]:
+    if args.aggregate:
+        return "summary.json", "summary of the logs"
+    if args.rollup is not None:
+        return "rollup.csv", f"logs per {args.rollup}"
+    if args.latency is not None:
+        return "latency.csv", f"{args.latency_field} per {args.latency}"
+    return (
+        f"result.{columnar_file.FORMATS_EXTENSIONS[args.format]}",
+        f"logs as {args.format}",
+    )
+
+
+def _get_pathname_to_follow(pathname: str) -> str:
+    path = Path(pathname)
+    return str(path if path.is_file() else path.joinpath("access.log"))
+
+
+def _follow_pathname(pathname: str, file_csv, file_error, args, run_stats: RunStats):
+    stats = FileStats(pathname)
+    watcher = follow_file.get_watcher(
+        os.path.dirname(os.path.abspath(pathname)),
+        args.follow_watcher,
+        args.follow_interval,
+    )
+    try:
+        convert_file.convert_followed_file(
+            FileFollower(pathname, watcher), file_csv, file_error, args, stats
+        )
+    except KeyboardInterrupt:
+        print(f"Stop following file: {pathname}")
+    finally:
+        watcher.close()
+    run_stats.add(stats)
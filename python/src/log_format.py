@@ -0,0 +1,185 @@
+from collections import namedtuple
+from functools import lru_cache
+from typing import Callable, List, Optional, Tuple
+import keyword
+import re
+
+from m_log import Log
+import m_log
+
+# http://nginx.org/en/docs/http/ngx_http_log_module.html#log_format
+LOG_FORMATS = {
+    "combined": '$remote_addr - $remote_user [$time_local] "$request" $status'
+    ' $body_bytes_sent "$http_referer" "$http_user_agent"',
+}
+REGEX_VARIABLE = re.compile(r"\$(?:\{(\w+)\}|(\w+))")
+# Value of the fields of the `Log` class not in the format, as nginx logs an
+# empty variable.
+VALUE_NOT_LOGGED = "-"
+# Variables with a fixed length, their value can have the next delimiter.
+VARIABLES_LENGTH = {"time_local": 26, "time_iso8601": 25}
+# Variables checked as in `m_log.REGEX`, the lines with other values are not
+# parsed. Maximum number of digits, or None.
+VARIABLES_NUMBER = {"status": 3, "body_bytes_sent": None}
+# Variables with times in seconds, converted to floats while the line is
+# parsed. The lines as bytes keep the text.
+VARIABLES_SECONDS = (
+    "request_time",
+    "upstream_connect_time",
+    "upstream_header_time",
+    "upstream_queue_time",
+    "upstream_response_time",
+)
+
+
+class LogFormat:
+    # Parser of the lines of an nginx `log_format`. The code of the parser is
+    # generated for the format: the values are between the text of the
+    # format, found with `str.find` without regex. The logs have the fields of
+    # the `Log` class and then the other variables of the format, so the logs
+    # are converted, aggregated and filtered in the same way.
+    def __init__(self, log_format: str):
+        self.log_format = log_format
+        self.variables, self.delimiters = _get_variables_and_delimiters(log_format)
+        self.fieldnames = Log.DICT_KEYS + [
+            variable
+            for variable in dict.fromkeys(self.variables)
+            if variable not in Log.DICT_KEYS
+        ]
+        self.log_type = namedtuple("Log", self.fieldnames)  # type: ignore
+        self.get_log: Callable[[str], Optional[tuple]] = self._get_parser(False)
+        self.get_log_bytes: Callable[[bytes], Optional[Tuple[bytes, ...]]] = (
+            self._get_parser(True)
+        )
+
+    def has_variables(self, variables: List[str]) -> bool:
+        return all(variable in self.variables for variable in variables)
+
+    def _get_parser(self, is_bytes: bool) -> Callable:
+        # https://docs.python.org/3/library/functions.html#exec
+        namespace = {
+            "Log": self.log_type,
+            "is_number": m_log._is_number,
+            "get_seconds": get_seconds,
+        }
+        exec(self._get_parser_code(is_bytes), namespace)
+        return namespace["get_log"]
+
+    def _get_parser_code(self, is_bytes: bool) -> str:
+        def literal(value: str) -> str:
+            return repr(value.encode() if is_bytes else value)
+
+        delimiters = self.delimiters
+        code = ["def get_log(line):"]
+        if is_bytes:
+            # The lines of the memory-mapped files are memoryview objects,
+            # without the methods of bytes.
+            code.append("    line = bytes(line)")
+        if delimiters[0] != "":
+            code += [
+                f"    if not line.startswith({literal(delimiters[0])}):",
+                "        return None",
+            ]
+        code.append(f"    start = {len(delimiters[0])}")
+        last_index = len(self.variables) - 1
+        for index, (variable, delimiter) in enumerate(
+            zip(self.variables, delimiters[1:])
+        ):
+            length = VARIABLES_LENGTH.get(variable)
+            if index == last_index:
+                # The last value ends at the end of the line, it can have the
+                # text after it, like a quote in the user agent.
+                code += [
+                    f"    if not line.endswith({literal(delimiter)}):",
+                    "        return None",
+                    f"    end = len(line) - {len(delimiter)}",
+                    "    if end < start:",
+                    "        return None",
+                ]
+            elif length is not None:
+                code += [
+                    f"    end = start + {length}",
+                    f"    if not line.startswith({literal(delimiter)}, end):",
+                    "        return None",
+                ]
+            else:
+                code += [
+                    f"    end = line.find({literal(delimiter)}, start)",
+                    "    if end == -1:",
+                    "        return None",
+                ]
+            code.append(f"    value_{index} = line[start:end]")
+            if variable in VARIABLES_NUMBER:
+                code += [
+                    f"    if not is_number(value_{index},"
+                    f" {VARIABLES_NUMBER[variable]}):",
+                    "        return None",
+                ]
+            if variable in VARIABLES_SECONDS and not is_bytes:
+                code.append(f"    value_{index} = get_seconds(value_{index})")
+            if index != last_index:
+                code.append(f"    start = end + {len(delimiter)}")
+        values = [
+            (
+                f"value_{self.variables.index(fieldname)}"
+                if fieldname in self.variables
+                else literal(VALUE_NOT_LOGGED)
+            )
+            for fieldname in self.fieldnames
+        ]
+        if is_bytes:
+            code.append(f"    return ({', '.join(values)},)")
+        else:
+            code.append(f"    return Log({', '.join(values)})")
+        return "\n".join(code) + "\n"
+
+
+def get_seconds(value: str) -> Optional[float]:
+    # With several upstream servers, the times of each one are separated by
+    # commas, or colons after an internal redirect, and they are added. A
+    # time is `-` if there was no response.
+    # http://nginx.org/en/docs/http/ngx_http_upstream_module.html#var_upstream_response_time
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    result = None
+    for seconds in value.replace(" : ", ", ").split(", "):
+        try:
+            result = (0.0 if result is None else result) + float(seconds)
+        except ValueError:
+            pass
+    return result
+
+
+@lru_cache(maxsize=None)
+def compile_log_format(log_format: str) -> LogFormat:
+    # The format or the name of a known one. Each format is compiled once in
+    # each process.
+    return LogFormat(LOG_FORMATS.get(log_format, log_format))
+
+
+def _get_variables_and_delimiters(log_format: str) -> Tuple[List[str], List[str]]:
+    # The text before the first variable, between variables and after the
+    # last one. The delimiters between variables can not be empty, there
+    # would be no way to know where a value ends.
+    variables, delimiters = [], []
+    start = 0
+    for match in REGEX_VARIABLE.finditer(log_format):
+        delimiter = log_format[start : match.start()]
+        if len(variables) != 0 and delimiter == "":
+            raise ValueError(f"Variables without text between them: {log_format}")
+        delimiters.append(delimiter)
+        variables.append(match.group(1) or match.group(2))
+        start = match.end()
+    delimiters.append(log_format[start:])
+    if len(variables) == 0:
+        raise ValueError(f"Log format without variables: {log_format}")
+    for variable in variables:
+        if (
+            not variable.isidentifier()
+            or keyword.iskeyword(variable)
+            or variable.startswith("_")
+        ):
+            raise ValueError(f"Variable not valid: ${variable}")
+    return variables, delimiters
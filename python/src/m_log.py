@@ -1,8 +1,19 @@
-from typing import Optional
+from typing import Callable, Dict, NamedTuple, Optional, Sequence, Tuple, TypeVar
 import re
 
+AnyStr = TypeVar("AnyStr", str, bytes)
 
-class Log:
+
+class Log(NamedTuple):
+    # A tuple without a dictionary per instance, written as a csv row as it is.
+    remote_addr: str
+    remote_user: str
+    time_local: str
+    request: str
+    status: str
+    body_bytes_sent: str
+    http_referer: str
+    http_user_agent: str
 
     DICT_KEYS = [
         "remote_addr",
@@ -15,49 +26,11 @@ class Log:
         "http_user_agent",
     ]
 
-    def __init__(
-        self,
-        remote_addr: str,
-        remote_user: str,
-        time_local: str,
-        request: str,
-        status: str,
-        body_bytes_sent: str,
-        http_referer: str,
-        http_user_agent: str,
-    ):
-        self.remote_addr = remote_addr
-        self.remote_user = remote_user
-        self.time_local = time_local
-        self.request = request
-        self.status = status
-        self.body_bytes_sent = body_bytes_sent
-        self.http_referer = http_referer
-        self.http_user_agent = http_user_agent
-
     def __repr__(self):
-        return "{},{},{},{},{},{},{},{}".format(
-            self.remote_addr,
-            self.remote_user,
-            self.time_local,
-            self.request,
-            self.status,
-            self.body_bytes_sent,
-            self.http_referer,
-            self.http_user_agent,
-        )
+        return ",".join(self)
 
     def asdict(self) -> dict:
-        return {
-            "remote_addr": self.remote_addr,
-            "remote_user": self.remote_user,
-            "time_local": self.time_local,
-            "request": self.request,
-            "status": self.status,
-            "body_bytes_sent": self.body_bytes_sent,
-            "http_referer": self.http_referer,
-            "http_user_agent": self.http_user_agent,
-        }
+        return dict(zip(self.DICT_KEYS, self))
 
 
 # https://docs.nginx.com/nginx/admin-guide/monitoring/logging/
@@ -83,6 +56,7 @@ REGEX = re.compile(
 """,
     re.VERBOSE,
 )
+REGEX_BYTES = re.compile(REGEX.pattern.encode(), re.VERBOSE)
 
 
 def get_log(line: str) -> Optional[Log]:
@@ -101,3 +75,176 @@ def get_log(line: str) -> Optional[Log]:
             http_user_agent=match.group(9),
         )
     )
+
+
+def get_log_bytes(line: bytes) -> Optional[Tuple[bytes, ...]]:
+    # Same values as `get_log` but without decoding the line.
+    match = REGEX_BYTES.match(line)
+    return None if match is None else match.group(1, 3, 4, 5, 6, 7, 8, 9)
+
+
+# Without regexs, as the Rust version. The values are between fixed delimiters.
+DELIMITERS = (" - ", " [", '] "', '" ', " ", ' "', '" "', '"')
+DELIMITERS_BYTES = tuple(delimiter.encode() for delimiter in DELIMITERS)
+
+
+def get_log_by_index(line: str) -> Optional[Log]:
+    values = _get_values_by_index(line, DELIMITERS)
+    return None if values is None else Log(*values)
+
+
+def get_log_bytes_by_index(line: bytes) -> Optional[Tuple[bytes, ...]]:
+    return _get_values_by_index(bytes(line), DELIMITERS_BYTES)
+
+
+def _get_values_by_index(
+    line: AnyStr, delimiters: Sequence[AnyStr]
+) -> Optional[Tuple[AnyStr, ...]]:
+    # Each value is checked as in `REGEX`, so both parsers have the same result
+    # for the lines written by nginx, which escapes the quotes of the values as
+    # `\x22`. Other lines can have other result:
+    # - `REGEX` accepts any white space between values, like tabs, and this
+    #   parser only spaces.
+    # - If the request has `] "` or `" 200 5 "`, `REGEX` ends the time local
+    #   and the request at their last valid delimiter, and this parser at the
+    #   first one.
+    (
+        remote_addr_end,
+        remote_user_end,
+        time_local_end,
+        request_end,
+        status_end,
+        body_bytes_sent_end,
+        http_referer_end,
+        http_user_agent_end,
+    ) = delimiters
+    index_remote_addr_end = line.find(remote_addr_end)
+    if index_remote_addr_end == -1:
+        return None
+    remote_addr = line[:index_remote_addr_end]
+    if not _is_ipv4(remote_addr):
+        return None
+    index_remote_user = index_remote_addr_end + len(remote_addr_end)
+    index_time_local_end = line.find(time_local_end, index_remote_user)
+    if index_time_local_end == -1:
+        return None
+    # The remote user can have the delimiter, the time local starts at the last one.
+    index_remote_user_end = line.rfind(
+        remote_user_end, index_remote_user + 1, index_time_local_end - 1
+    )
+    if index_remote_user_end == -1:
+        return None
+    index_time_local = index_remote_user_end + len(remote_user_end)
+    index_request = index_time_local_end + len(time_local_end)
+    # The request ends at the first quote followed by a status and body bytes sent.
+    index_request_end = index_request - 1
+    while True:
+        index_request_end = line.find(request_end, index_request_end + 1)
+        if index_request_end == -1:
+            return None
+        index_status = index_request_end + len(request_end)
+        index_status_end = line.find(status_end, index_status)
+        index_body_bytes_sent = index_status_end + len(status_end)
+        index_body_bytes_sent_end = line.find(
+            body_bytes_sent_end, index_body_bytes_sent
+        )
+        if (
+            index_status_end != -1
+            and index_body_bytes_sent_end != -1
+            and _is_number(line[index_status:index_status_end], 3)
+            and _is_number(line[index_body_bytes_sent:index_body_bytes_sent_end])
+        ):
+            break
+    index_http_referer = index_body_bytes_sent_end + len(body_bytes_sent_end)
+    index_http_user_agent_end = line.rfind(http_user_agent_end)
+    index_http_referer_end = line.rfind(
+        http_referer_end, index_http_referer + 1, index_http_user_agent_end
+    )
+    if index_http_referer_end == -1:
+        return None
+    index_http_user_agent = index_http_referer_end + len(http_referer_end)
+    return (
+        remote_addr,
+        line[index_remote_user:index_remote_user_end],
+        line[index_time_local:index_time_local_end],
+        line[index_request:index_request_end],
+        line[index_status:index_status_end],
+        line[index_body_bytes_sent:index_body_bytes_sent_end],
+        line[index_http_referer:index_http_referer_end],
+        line[index_http_user_agent:index_http_user_agent_end],
+    )
+
+
+# Values of the request, like `GET /foo/bar?a=1 HTTP/1.1`.
+REQUEST_KEYS = ["method", "path", "query", "protocol"]
+REQUEST_NOT_VALID: Tuple[Optional[str], ...] = (None, None, None, None)
+# The known methods and protocols, the same string is used for all the logs
+# with each one. Other values are not saved, they can be any text sent by a
+# client.
+_REQUEST_STRINGS: Dict[str, str] = {
+    value: value
+    for value in (
+        "CONNECT",
+        "DELETE",
+        "GET",
+        "HEAD",
+        "OPTIONS",
+        "PATCH",
+        "POST",
+        "PUT",
+        "TRACE",
+        "",
+        "HTTP/1.0",
+        "HTTP/1.1",
+        "HTTP/2.0",
+        "HTTP/3.0",
+    )
+}
+
+
+def get_request_values(request: str) -> Tuple[Optional[str], ...]:
+    # The request can be other text, like "-" or the bytes of a TLS handshake.
+    # The path can have spaces if it was sent without encoding them.
+    method, _, target_and_protocol = request.partition(" ")
+    if not (method.isascii() and method.isalpha() and method.isupper()):
+        return REQUEST_NOT_VALID
+    target, _, protocol = target_and_protocol.rpartition(" ")
+    if not protocol.startswith("HTTP/"):
+        # HTTP/0.9 requests have not protocol.
+        target, protocol = target_and_protocol, ""
+    if len(target) == 0:
+        return REQUEST_NOT_VALID
+    path, separator, query = target.partition("?")
+    return (
+        _get_request_string(method),
+        path,
+        query if separator else None,
+        _get_request_string(protocol),
+    )
+
+
+def _get_request_string(value: str) -> str:
+    return _REQUEST_STRINGS.get(value, value)
+
+
+def _is_ipv4(value: AnyStr) -> bool:
+    numbers = value.split(b"." if isinstance(value, bytes) else ".")
+    return len(numbers) == 4 and all(_is_number(number, 3) for number in numbers)
+
+
+def _is_number(value: AnyStr, max_length: Optional[int] = None) -> bool:
+    return (
+        value.isdigit()
+        and value.isascii()
+        and (max_length is None or len(value) <= max_length)
+    )
+
+
+PARSERS: Dict[str, Callable[[str], Optional[Log]]] = {
+    "regex": get_log,
+    "index": get_log_by_index,
+}
+PARSERS_BYTES: Dict[str, Callable[[bytes], Optional[Tuple[bytes, ...]]]] = {
+    "regex": get_log_bytes,
+    "index": get_log_bytes_by_index,
+}
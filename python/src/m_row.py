@@ -0,0 +1,54 @@
+from typing import Callable, List, Optional, Sequence
+
+from m_log import Log
+from m_time import TimeParser
+import m_log
+
+
+class RowBuilder:
+    # Values of each row of the result file: the values of the log and the
+    # ones of the extra columns, calculated from them while the logs are
+    # converted. Each getter returns the values of one or more columns.
+    def __init__(
+        self,
+        time_format: Optional[str] = None,
+        split_request: bool = False,
+        log_fieldnames: Sequence[str] = Log.DICT_KEYS,
+    ):
+        self._time_parser = TimeParser()
+        self._getters: List[Callable[[Log], tuple]] = []
+        self.fieldnames = list(log_fieldnames)
+        if time_format == "epoch":
+            self._add_getter(["time_epoch"], self._get_time_epoch)
+        elif time_format == "iso":
+            self._add_getter(["time_iso"], self._get_time_iso)
+        if split_request:
+            self._add_getter(m_log.REQUEST_KEYS, self._get_request_values)
+
+    def get_rows(self, logs: List[Log]) -> Sequence[tuple]:
+        # Without extra columns the logs are written as they are.
+        if len(self._getters) == 0:
+            return logs
+        if len(self._getters) == 1:
+            get_values = self._getters[0]
+            return [log + get_values(log) for log in logs]
+        rows = []
+        for log in logs:
+            row: tuple = log
+            for get_values in self._getters:
+                row += get_values(log)
+            rows.append(row)
+        return rows
+
+    def _add_getter(self, fieldnames: List[str], get_values: Callable[[Log], tuple]):
+        self.fieldnames += fieldnames
+        self._getters.append(get_values)
+
+    def _get_time_epoch(self, log: Log) -> tuple:
+        return (self._time_parser.get_epoch(log.time_local),)
+
+    def _get_time_iso(self, log: Log) -> tuple:
+        return (self._time_parser.get_iso(log.time_local),)
+
+    def _get_request_values(self, log: Log) -> tuple:
+        return m_log.get_request_values(log.request)
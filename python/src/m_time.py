@@ -0,0 +1,113 @@
+from typing import Dict, Optional
+import calendar
+import datetime
+import time
+
+TIME_FORMATS = ("epoch", "iso")
+MONTHS = {
+    month: number
+    for number, month in enumerate(
+        (
+            "Jan",
+            "Feb",
+            "Mar",
+            "Apr",
+            "May",
+            "Jun",
+            "Jul",
+            "Aug",
+            "Sep",
+            "Oct",
+            "Nov",
+            "Dec",
+        ),
+        start=1,
+    )
+}
+
+
+class TimeParser:
+    # Converts the Nginx time local, like `28/Oct/2021:00:18:22 +0100`, to UTC
+    # without a `datetime.strptime` call per log:
+    # - Consecutive logs usually have the same time, the last one is saved.
+    # - The start of each day is saved by its date and offset, and the time of
+    #   the day is added to it.
+    # http://nginx.org/en/docs/http/ngx_http_log_module.html#log_format
+    def __init__(self):
+        self._days_start: Dict[str, Optional[int]] = {}
+        self._last_time_local: Optional[str] = None
+        self._last_epoch: Optional[int] = None
+        self._last_epoch_iso: Optional[int] = None
+        self._last_iso: Optional[str] = None
+
+    def get_epoch(self, time_local: str) -> Optional[int]:
+        if time_local == self._last_time_local:
+            return self._last_epoch
+        epoch = self._get_epoch(time_local)
+        self._last_time_local, self._last_epoch = time_local, epoch
+        return epoch
+
+    def get_iso(self, time_local: str) -> Optional[str]:
+        epoch = self.get_epoch(time_local)
+        if epoch is None:
+            return None
+        if epoch != self._last_epoch_iso:
+            self._last_epoch_iso = epoch
+            self._last_iso = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(epoch))
+        return self._last_iso
+
+    def _get_epoch(self, time_local: str) -> Optional[int]:
+        if (
+            len(time_local) != 26
+            or time_local[11] != ":"
+            or time_local[14] != ":"
+            or time_local[17] != ":"
+            or time_local[20] != " "
+        ):
+            return None
+        hours, minutes, seconds = (
+            time_local[12:14],
+            time_local[15:17],
+            time_local[18:20],
+        )
+        digits = hours + minutes + seconds
+        if not (digits.isascii() and digits.isdigit()):
+            return None
+        hours, minutes, seconds = int(hours), int(minutes), int(seconds)
+        if hours > 23 or minutes > 59 or seconds > 59:
+            return None
+        day = time_local[:11] + time_local[20:]
+        day_start = self._days_start.get(day)
+        if day_start is None:
+            if day in self._days_start:
+                return None
+            day_start = self._days_start[day] = get_day_start(day)
+            if day_start is None:
+                return None
+        return day_start + hours * 3600 + minutes * 60 + seconds
+
+
+def get_day_start(day: str) -> Optional[int]:
+    # The day is like `28/Oct/2021 +0100`.
+    month = MONTHS.get(day[3:6])
+    offset = day[12:]
+    if (
+        month is None
+        or day[2] != "/"
+        or day[6] != "/"
+        or day[11] != " "
+        or len(offset) != 5
+        or offset[0] not in "+-"
+        or not (day[:2] + day[7:11] + offset[1:]).isascii()
+        or not (day[:2] + day[7:11] + offset[1:]).isdigit()
+    ):
+        return None
+    year, day_of_month = int(day[7:11]), int(day[:2])
+    try:
+        datetime.date(year, month, day_of_month)
+    except ValueError:
+        return None
+    offset_seconds = int(offset[1:3]) * 3600 + int(offset[3:]) * 60
+    if offset[0] == "-":
+        offset_seconds = -offset_seconds
+    return calendar.timegm((year, month, day_of_month, 0, 0, 0)) - offset_seconds
@@ -0,0 +1,126 @@
+from typing import List, Optional, Sequence
+import hashlib
+import json
+import os
+
+from m_log import Log
+from read_file import FileReader
+
+# The start of the file content identifies a file after it is renamed or compressed.
+HASH_SIZE = 64 * 1024
+
+
+class ManifestEntry:
+    def __init__(
+        self,
+        pathname: str,
+        inode: int = 0,
+        size: int = 0,
+        mtime: float = 0,
+        hash: str = "",
+        hash_size: int = 0,
+        offset: int = 0,
+        rows: Optional[List[List[int]]] = None,
+    ):
+        self.pathname = pathname
+        self.inode = inode
+        self.size = size
+        self.mtime = mtime
+        # Hash of the first `hash_size` bytes of the content.
+        self.hash = hash
+        self.hash_size = hash_size
+        # Bytes of the content converted, decompressed for gz files.
+        self.offset = offset
+        # Ranges [start, end) of the csv rows of the file, without the header.
+        self.rows = [] if rows is None else rows
+
+    def asdict(self) -> dict:
+        return dict(vars(self))
+
+    def is_same_file(self, pathname: str) -> bool:
+        if not os.path.isfile(pathname):
+            return False
+        stat = os.stat(pathname)
+        return (
+            self.pathname == pathname
+            and self.inode == stat.st_ino
+            and self.size == stat.st_size
+            and self.mtime == stat.st_mtime
+        )
+
+    def is_converted(self, pathname: str, reader: FileReader) -> bool:
+        content_size = reader.get_content_size(pathname)
+        if pathname.endswith(".gz"):
+            # The size in the gz file is modulo 2^32.
+            return content_size == self.offset % 2**32
+        return content_size <= self.offset
+
+    def set_file(self, pathname: str, reader: FileReader):
+        stat = os.stat(pathname)
+        self.pathname = pathname
+        self.inode = stat.st_ino
+        self.size = stat.st_size
+        self.mtime = stat.st_mtime
+        if self.hash_size < min(self.offset, HASH_SIZE):
+            content_start = reader.get_content_start(pathname, HASH_SIZE)
+            self.hash_size = min(len(content_start), self.offset)
+            self.hash = _get_hash(content_start[: self.hash_size])
+
+
+class Manifest:
+    def __init__(
+        self,
+        entries: Optional[List[ManifestEntry]] = None,
+        fieldnames: Sequence[str] = Log.DICT_KEYS,
+    ):
+        self.entries = [] if entries is None else entries
+        # Columns of the result file.
+        self.fieldnames = list(fieldnames)
+
+    @classmethod
+    def load(cls, pathname: str) -> "Manifest":
+        with open(pathname, "r") as file:
+            content = json.load(file)
+        return cls(
+            [ManifestEntry(**entry) for entry in content["files"]],
+            content.get("fieldnames", Log.DICT_KEYS),
+        )
+
+    def save(self, pathname: str):
+        # Replace the file at once, to not leave a broken file if interrupted.
+        pathname_temporary = f"{pathname}.tmp"
+        content = {
+            "fieldnames": self.fieldnames,
+            "files": [entry.asdict() for entry in self.entries],
+        }
+        with open(pathname_temporary, "w") as file:
+            json.dump(content, file)
+        os.replace(pathname_temporary, pathname)
+
+    @property
+    def rows(self) -> int:
+        return max(
+            (rows[1] for entry in self.entries for rows in entry.rows), default=0
+        )
+
+    def get_entry(self, pathname: str, reader: FileReader) -> ManifestEntry:
+        for entry in self.entries:
+            if entry.is_same_file(pathname):
+                return entry
+        # The file can be other one renamed or compressed by logrotate, but not
+        # one that is still in its path.
+        content_start = reader.get_content_start(pathname, HASH_SIZE)
+        for entry in reversed(self.entries):
+            if (
+                not entry.is_same_file(entry.pathname)
+                and 0 < entry.hash_size <= len(content_start)
+                and _get_hash(content_start[: entry.hash_size]) == entry.hash
+            ):
+                return entry
+        entry = ManifestEntry(pathname)
+        self.entries.append(entry)
+        return entry
+
+
+def _get_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
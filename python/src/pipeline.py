@@ -0,0 +1,123 @@
+from queue import Queue
+from timeit import default_timer as timer
+from typing import Callable, Iterable, List, Optional
+import threading
+
+from stats import FileStats, QueueStats, StageStats
+
+QUEUE_SIZE = 16
+
+
+class _End:
+    # Put in a queue after the last item.
+    pass
+
+
+class Pipeline:
+    # The lines are read, parsed and written in different threads, connected
+    # by queues with a maximum size. The reading, decompressing and writing
+    # release the GIL, so they run at the same time as the parsing.
+    def __init__(self, lines_converter, queue_size: int = QUEUE_SIZE):
+        self._lines_converter = lines_converter
+        self._queue_size = queue_size
+
+    def convert_lines_batches(
+        self,
+        lines_batches: Iterable[List[str]],
+        writer_csv,
+        file_error,
+        stats: FileStats,
+    ):
+        stages_stats = {name: StageStats() for name in ("read", "parse", "write")}
+        queues_stats = {name: QueueStats() for name in ("lines", "logs")}
+        queue_lines: Queue = Queue(maxsize=self._queue_size)
+        queue_logs: Queue = Queue(maxsize=self._queue_size)
+        stop = threading.Event()
+        exceptions: List[BaseException] = []
+
+        def read():
+            iterator = iter(lines_batches)
+            while not stop.is_set():
+                start = timer()
+                lines = next(iterator, None)
+                stages_stats["read"].seconds += timer() - start
+                if lines is None:
+                    break
+                stages_stats["read"].items += 1
+                stages_stats["read"].lines += len(lines)
+                self._put(queue_lines, lines, queues_stats["lines"])
+
+        def write():
+            while True:
+                item = queue_logs.get()
+                if isinstance(item, _End):
+                    return
+                if len(exceptions) == 0:
+                    logs, lines_not_parsed = item
+                    start = timer()
+                    self._lines_converter.write_results(
+                        logs, lines_not_parsed, writer_csv, file_error
+                    )
+                    stages_stats["write"].seconds += timer() - start
+                    stages_stats["write"].items += 1
+                    stages_stats["write"].lines += len(logs) + len(lines_not_parsed)
+
+        reader = self._start_thread(read, queue_lines, exceptions)
+        writer = self._start_thread(write, None, exceptions)
+        try:
+            while len(exceptions) == 0:
+                lines = queue_lines.get()
+                if isinstance(lines, _End):
+                    break
+                start = timer()
+                logs_and_lines_not_parsed = self._lines_converter.parse_lines(
+                    lines, stats
+                )
+                stages_stats["parse"].seconds += timer() - start
+                stages_stats["parse"].items += 1
+                stages_stats["parse"].lines += len(lines)
+                self._put(queue_logs, logs_and_lines_not_parsed, queues_stats["logs"])
+        except BaseException as exception:
+            exceptions.append(exception)
+        finally:
+            stop.set()
+            self._join_thread(reader, queue_lines)
+            queue_logs.put(_End())
+            writer.join()
+        if len(exceptions) != 0:
+            raise exceptions[0]
+        for name, stage_stats in stages_stats.items():
+            stats.stages_stats.setdefault(name, StageStats()).add(stage_stats)
+        for name, queue_stats in queues_stats.items():
+            stats.queues_stats.setdefault(name, QueueStats()).add(queue_stats)
+
+    def _put(self, queue: Queue, item, queue_stats: QueueStats):
+        queue_stats.add_depth(queue.qsize())
+        queue.put(item)
+
+    def _start_thread(
+        self,
+        function: Callable[[], None],
+        queue_end: Optional[Queue],
+        exceptions: List[BaseException],
+    ) -> threading.Thread:
+        # The exceptions in the thread are raised in the main thread.
+        def run():
+            try:
+                function()
+            except BaseException as exception:
+                exceptions.append(exception)
+            finally:
+                if queue_end is not None:
+                    queue_end.put(_End())
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread
+
+    def _join_thread(self, thread: threading.Thread, queue: Queue):
+        # Remove items from the queue if the thread is waiting to put one.
+        while thread.is_alive():
+            while not queue.empty():
+                queue.get_nowait()
+            thread.join(timeout=0.01)
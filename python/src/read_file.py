@@ -1,26 +1,319 @@
-from typing import Iterator
+from queue import Queue
+from typing import BinaryIO, Iterator, List, Optional, Tuple, Union
 import gzip
+import mmap
+import os
+import shutil
+import subprocess
+import threading
+import zlib
+
+BLOCK_SIZE = 1024 * 1024
+# Decompress files with the gzip header and trailer.
+# https://docs.python.org/3/library/zlib.html#zlib.decompress
+GZ_WBITS = zlib.MAX_WBITS | 16
+GZ_EXTERNAL_PROGRAMS = (("pigz", "-dc"), ("zcat",))
+GZ_READERS = ("auto", "external", "thread", "zlib")
+GZ_THREAD_QUEUE_SIZE = 8
 
 
 class FileReader:
-    def get_lines_in_pathname(self, pathname: str) -> Iterator[str]:
+    def __init__(self, gz_reader: str = "auto"):
+        # Gz readers:
+        # - external: decompress with pigz or zcat in other process.
+        # - thread: decompress with zlib in a thread, while the lines are parsed.
+        # - zlib: decompress with zlib.
+        # - auto: external if pigz or zcat are installed and there are more
+        #   than one CPU, zlib otherwise.
+        self._gz_reader = gz_reader
+        self.offset = 0
+        # Compressed and decompressed offsets of the start of each member of
+        # the gz files decompressed with zlib. A gz file can be decompressed
+        # from the start of a member.
+        self.gz_members: List[Tuple[int, int]] = []
+
+    def get_lines_in_pathname(
+        self,
+        pathname: str,
+        offset: int = 0,
+        only_complete_lines: bool = False,
+        gz_member: Tuple[int, int] = (0, 0),
+    ) -> Iterator[str]:
+        # The offset is in bytes of the file content, decompressed for gz files.
+        # After reading lines, `self.offset` is where the next line starts.
+        # For gz files, the decompression starts at the member, before the offset.
         print(f"Init file: {pathname}")
-        for line in self._get_lines_in_pathname(pathname):
+        self.offset = offset
+        self.gz_members = []
+        blocks = self._get_blocks_in_pathname(pathname, offset, gz_member)
+        for line in self._get_lines_in_blocks(blocks, only_complete_lines):
             yield line
 
-    def _get_lines_in_pathname(self, pathname: str) -> Iterator[str]:
-        return (
-            self._get_lines_in_gz_file(pathname)
-            if pathname.endswith(".gz")
-            else self._get_lines_in_log_file(pathname)
-        )
+    def get_content_start(self, pathname: str, size: int) -> bytes:
+        result = b""
+        blocks = self._get_blocks_in_pathname(pathname)
+        try:
+            for block in blocks:
+                result += block
+                if len(result) >= size:
+                    break
+        finally:
+            blocks.close()
+        return result[:size]
 
-    def _get_lines_in_gz_file(self, pathname: str) -> Iterator[str]:
-        with gzip.open(pathname, mode="rt") as fp:
-            for line in fp:
+    def get_content_size(self, pathname: str) -> int:
+        # For gz files, the size stored in the last 4 bytes is correct only for
+        # files with one compressed member of less than 4 GiB.
+        # https://www.rfc-editor.org/rfc/rfc1952#page-5
+        if not pathname.endswith(".gz"):
+            return os.path.getsize(pathname)
+        with open(pathname, "rb") as file:
+            file.seek(0, os.SEEK_END)
+            if file.tell() < 4:
+                return 0
+            file.seek(-4, os.SEEK_END)
+            return int.from_bytes(file.read(4), "little")
+
+    def get_lines_in_byte_range(
+        self, pathname: str, byte_range: Tuple[int, int]
+    ) -> Iterator[str]:
+        start, end = byte_range
+        print(f"Init file: {pathname} (bytes {start}-{end})")
+        with open(pathname, "rb") as file:
+            file.seek(start)
+            for line in self._get_lines_in_blocks(self._get_blocks(file, end - start)):
                 yield line
 
-    def _get_lines_in_log_file(self, pathname: str) -> Iterator[str]:
-        with open(pathname, "r") as file:
-            for line in file.read().splitlines():
+    def get_lines_in_mmap(
+        self, pathname: str, byte_range: Optional[Tuple[int, int]] = None
+    ) -> Iterator[memoryview]:
+        # Lines are views of the memory-mapped file, without copying or
+        # decoding them. A line is only valid until the next one is returned.
+        # https://docs.python.org/3/library/mmap.html
+        print(f"Init file: {pathname}")
+        start, end = (
+            (0, os.path.getsize(pathname)) if byte_range is None else byte_range
+        )
+        if start >= end:
+            return
+        with open(pathname, "rb") as file, mmap.mmap(
+            file.fileno(), 0, access=mmap.ACCESS_READ
+        ) as file_mmap:
+            file_view = memoryview(file_mmap)
+            try:
+                while start < end:
+                    line_end = file_mmap.find(b"\n", start, end)
+                    next_start = end if line_end == -1 else line_end + 1
+                    line_end = end if line_end == -1 else line_end
+                    if line_end > start and file_mmap[line_end - 1] == ord("\r"):
+                        line_end -= 1
+                    line = file_view[start:line_end]
+                    try:
+                        yield line
+                    finally:
+                        line.release()
+                    start = next_start
+            finally:
+                file_view.release()
+
+    def get_byte_ranges(self, pathname: str, chunk_size: int) -> List[Tuple[int, int]]:
+        # Ranges of about `chunk_size` bytes that end after a new line character.
+        size = os.path.getsize(pathname)
+        result = []
+        start = 0
+        with open(pathname, "rb") as file:
+            while start < size:
+                file.seek(start + max(chunk_size, 1) - 1)
+                file.readline()
+                end = min(file.tell(), size)
+                result.append((start, end))
+                start = end
+        return result
+
+    def _get_blocks_in_pathname(
+        self, pathname: str, offset: int = 0, gz_member: Tuple[int, int] = (0, 0)
+    ) -> Iterator[bytes]:
+        if pathname.endswith(".gz"):
+            blocks = (
+                self._get_blocks_in_gz_file(pathname)
+                if gz_member == (0, 0)
+                else self._get_blocks_decompressed(pathname, gz_member)
+            )
+            for block in self._get_blocks_skipped(blocks, offset - gz_member[1]):
+                yield block
+        else:
+            with open(pathname, "rb") as file:
+                file.seek(offset)
+                for block in self._get_blocks(file):
+                    yield block
+
+    def _get_blocks_skipped(
+        self, blocks: Iterator[bytes], bytes_to_skip: int
+    ) -> Iterator[bytes]:
+        for block in blocks:
+            if bytes_to_skip >= len(block):
+                bytes_to_skip -= len(block)
+                continue
+            yield block[bytes_to_skip:]
+            bytes_to_skip = 0
+
+    def _get_blocks_in_gz_file(self, pathname: str) -> Iterator[bytes]:
+        external_program = self._get_gz_external_program()
+        if self._gz_reader == "external" and external_program is None:
+            raise FileNotFoundError(
+                "No program to decompress the gz files: "
+                + ", ".join(program[0] for program in GZ_EXTERNAL_PROGRAMS)
+            )
+        if external_program is not None and self._gz_reader in ("auto", "external"):
+            return self._get_blocks_decompressed_by_program(pathname, external_program)
+        elif self._gz_reader == "thread":
+            return self._get_blocks_in_thread(self._get_blocks_decompressed(pathname))
+        return self._get_blocks_decompressed(pathname)
+
+    def _get_gz_external_program(self) -> Optional[Tuple[str, ...]]:
+        if self._gz_reader not in ("auto", "external"):
+            return None
+        if self._gz_reader == "auto" and (os.cpu_count() or 1) == 1:
+            return None
+        for program in GZ_EXTERNAL_PROGRAMS:
+            program_pathname = shutil.which(program[0])
+            if program_pathname is not None:
+                return (program_pathname, *program[1:])
+        return None
+
+    def _get_blocks_decompressed(
+        self, pathname: str, gz_member: Tuple[int, int] = (0, 0)
+    ) -> Iterator[bytes]:
+        # A gz file can have more than one compressed member, each one needs a
+        # new decompressor.
+        # The size of the decompressed blocks is limited, the data not
+        # decompressed yet is in `unconsumed_tail`.
+        decompressor = zlib.decompressobj(GZ_WBITS)
+        is_empty_file = True
+        offset_compressed, offset_decompressed = gz_member
+        self.gz_members.append(gz_member)
+        with open(pathname, "rb") as file:
+            file.seek(offset_compressed)
+            for data in self._get_blocks(file):
+                is_empty_file = False
+                offset_compressed += len(data)
+                while True:
+                    block = decompressor.decompress(data, BLOCK_SIZE)
+                    offset_decompressed += len(block)
+                    if len(block) != 0:
+                        yield block
+                    if decompressor.eof:
+                        data = decompressor.unused_data
+                        if len(data) == 0:
+                            break
+                        decompressor = zlib.decompressobj(GZ_WBITS)
+                        self.gz_members.append(
+                            (offset_compressed - len(data), offset_decompressed)
+                        )
+                    else:
+                        data = decompressor.unconsumed_tail
+                        if len(data) == 0 and len(block) < BLOCK_SIZE:
+                            break
+        if not is_empty_file and not decompressor.eof:
+            raise EOFError(f"Compressed file ended before the end: {pathname}")
+
+    def _get_blocks_decompressed_by_program(
+        self, pathname: str, program: Tuple[str, ...]
+    ) -> Iterator[bytes]:
+        # https://docs.python.org/3/library/subprocess.html#subprocess.Popen
+        with subprocess.Popen(
+            [*program, pathname], stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        ) as process:
+            assert process.stdout is not None
+            try:
+                for block in self._get_blocks(process.stdout):
+                    yield block
+            except BaseException:
+                # Not all the lines are read, for example with an exception.
+                process.kill()
+                raise
+            process.wait()
+            if process.returncode != 0:
+                assert process.stderr is not None
+                raise gzip.BadGzipFile(
+                    f"{pathname}: {process.stderr.read().decode(errors='replace')}"
+                )
+
+    def _get_blocks_in_thread(self, blocks: Iterator[bytes]) -> Iterator[bytes]:
+        # zlib releases the GIL while it decompresses, so the blocks are
+        # decompressed at the same time as the previous ones are parsed.
+        queue: "Queue[Union[bytes, BaseException, None]]" = Queue(
+            maxsize=GZ_THREAD_QUEUE_SIZE
+        )
+        stop = threading.Event()
+
+        def put_blocks():
+            try:
+                for block in blocks:
+                    if stop.is_set():
+                        return
+                    queue.put(block)
+                queue.put(None)
+            except BaseException as exception:
+                queue.put(exception)
+
+        thread = threading.Thread(target=put_blocks, daemon=True)
+        thread.start()
+        try:
+            while True:
+                block = queue.get()
+                if block is None:
+                    break
+                if isinstance(block, BaseException):
+                    raise block
+                yield block
+        finally:
+            stop.set()
+            # Unblock the thread if it is waiting to put a block.
+            while thread.is_alive():
+                while not queue.empty():
+                    queue.get_nowait()
+                thread.join(timeout=0.01)
+
+    def _get_blocks(
+        self, file: BinaryIO, bytes_to_read: Optional[int] = None
+    ) -> Iterator[bytes]:
+        # Read blocks of a fixed size to use the same memory for any file size.
+        while bytes_to_read is None or bytes_to_read > 0:
+            block_size = (
+                BLOCK_SIZE if bytes_to_read is None else min(BLOCK_SIZE, bytes_to_read)
+            )
+            block = file.read(block_size)
+            if len(block) == 0:
+                break
+            if bytes_to_read is not None:
+                bytes_to_read -= len(block)
+            yield block
+
+    def _get_lines_in_blocks(
+        self, blocks: Iterator[bytes], only_complete_lines: bool = False
+    ) -> Iterator[str]:
+        # The text after the last new line of a block is joined to the lines
+        # of the next block, so each block splits in the same lines as the
+        # whole file. The parts of a line are joined once, when its end is
+        # read, so a long line in many blocks is not copied for each block.
+        line_start_parts: List[bytes] = []
+        for block in blocks:
+            lines_end = block.rfind(b"\n") + 1
+            if lines_end == 0:
+                line_start_parts.append(block)
+                continue
+            lines = block[:lines_end]
+            if len(line_start_parts) != 0:
+                lines = b"".join([*line_start_parts, lines])
+                line_start_parts = []
+            for line in lines.decode().splitlines():
+                yield line
+            self.offset += len(lines)
+            line_start_parts.append(block[lines_end:])
+        line_start = b"".join(line_start_parts)
+        # The last line can be incomplete if the file is being written.
+        if not only_complete_lines:
+            for line in line_start.decode().splitlines():
                 yield line
+            self.offset += len(line_start)
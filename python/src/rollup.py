@@ -0,0 +1,161 @@
+from typing import Dict, Iterable, List, Optional
+import csv
+import time
+
+from m_time import TimeParser
+
+ROLLUP_INTERVALS = {"minute": 60, "hour": 3600}
+LATENESS = 300
+FIELDNAMES = [
+    "time",
+    "requests",
+    "status_1xx",
+    "status_2xx",
+    "status_3xx",
+    "status_4xx",
+    "status_5xx",
+    "status_other",
+    "body_bytes_sent",
+]
+# Counters of each interval: the values of the row after the time.
+COUNTERS_NUMBER = len(FIELDNAMES) - 1
+# Index of the counters of each status class, the others are in `status_other`.
+STATUS_CLASSES_INDEXES = {str(number): number for number in range(1, 6)}
+INDEX_STATUS_OTHER = 6
+INDEX_BODY_BYTES_SENT = 7
+
+
+class Rollup:
+    # Writes a row for each minute or hour with the number of logs, logs per
+    # status class and bytes sent. It has the `writerows` method of the csv
+    # writer, so the logs are converted in the same way.
+    # The logs are not written in order of time, so the row of an interval is
+    # written when a log is `lateness` seconds after the interval end. A log
+    # of an interval already written is written in a new row with the same
+    # time, and the rows with the same time are added when the file is closed.
+    # Without a pathname, no rows are written until it is merged to other.
+    def __init__(
+        self,
+        interval: str = "minute",
+        lateness: int = LATENESS,
+        pathname: Optional[str] = None,
+    ):
+        self.name = pathname
+        self.interval = interval
+        self.lateness = lateness
+        self.logs_without_time = 0
+        # Keys are the epoch of the start of the interval, in UTC.
+        self.counters: Dict[int, List[int]] = {}
+        self.epoch_max: Optional[int] = None
+        self._interval_written_max: Optional[int] = None
+        self._has_late_rows = False
+        self._seconds = ROLLUP_INTERVALS[interval]
+        self._time_parser = TimeParser()
+        self._file = None
+        if pathname is not None:
+            self._file = open(pathname, "w", newline="")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(FIELDNAMES)
+
+    def __enter__(self) -> "Rollup":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def writerows(self, rows: Iterable[tuple]):
+        # The rows start with the values of the log.
+        get_epoch, seconds = self._time_parser.get_epoch, self._seconds
+        counters = self.counters
+        epoch_max = self.epoch_max
+        for row in rows:
+            epoch = get_epoch(row[2])
+            if epoch is None:
+                self.logs_without_time += 1
+                continue
+            if epoch_max is None or epoch > epoch_max:
+                epoch_max = epoch
+            interval_start = epoch - epoch % seconds
+            interval_counters = counters.get(interval_start)
+            if interval_counters is None:
+                interval_counters = counters[interval_start] = [0] * COUNTERS_NUMBER
+            status = row[4]
+            index_status = (
+                STATUS_CLASSES_INDEXES.get(status[0], INDEX_STATUS_OTHER)
+                if len(status) == 3
+                else INDEX_STATUS_OTHER
+            )
+            interval_counters[0] += 1
+            interval_counters[index_status] += 1
+            interval_counters[INDEX_BODY_BYTES_SENT] += int(row[5])
+        self.epoch_max = epoch_max
+        self._write_intervals_ended()
+
+    def merge(self, rollup: "Rollup"):
+        for interval_start, interval_counters in rollup.counters.items():
+            counters = self.counters.setdefault(interval_start, [0] * COUNTERS_NUMBER)
+            for index, count in enumerate(interval_counters):
+                counters[index] += count
+        self.logs_without_time += rollup.logs_without_time
+        if self.epoch_max is None or (
+            rollup.epoch_max is not None and rollup.epoch_max > self.epoch_max
+        ):
+            self.epoch_max = rollup.epoch_max
+        self._write_intervals_ended()
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._write_intervals(list(self.counters))
+            self._file.close()
+            if self._has_late_rows:
+                _merge_rows(self.name)
+
+    def _write_intervals_ended(self):
+        if self._file is None or self.epoch_max is None:
+            return
+        epoch_end = self.epoch_max - self.lateness - self._seconds
+        self._write_intervals(
+            [
+                interval_start
+                for interval_start in self.counters
+                if interval_start <= epoch_end
+            ]
+        )
+
+    def _write_intervals(self, intervals_start: List[int]):
+        for interval_start in sorted(intervals_start):
+            if (
+                self._interval_written_max is not None
+                and interval_start <= self._interval_written_max
+            ):
+                self._has_late_rows = True
+            else:
+                self._interval_written_max = interval_start
+            self._writer.writerow(
+                [
+                    time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(interval_start)),
+                    *self.counters.pop(interval_start),
+                ]
+            )
+
+
+def _merge_rows(pathname: str):
+    # One row for each time, with the counters of its rows added.
+    with open(pathname, newline="") as file:
+        reader = csv.reader(file)
+        next(reader)
+        counters: Dict[str, List[int]] = {}
+        for row in reader:
+            time_counters = counters.setdefault(row[0], [0] * COUNTERS_NUMBER)
+            for index, count in enumerate(row[1:]):
+                time_counters[index] += int(count)
+    with open(pathname, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(FIELDNAMES)
+        # The times in ISO 8601 are sorted as text.
+        for time_text in sorted(counters):
+            writer.writerow([time_text, *counters[time_text]])
@@ -0,0 +1,210 @@
+from array import array
+from typing import Dict, List, Tuple
+import base64
+import hashlib
+import heapq
+import math
+
+# Sketches that count values with a fixed memory, with an error.
+# They can be merged and saved as dictionaries with values for JSON.
+
+HLL_PRECISION = 14
+COUNT_MIN_WIDTH = 2048
+COUNT_MIN_DEPTH = 4
+SPACE_SAVING_SIZE = 1000
+
+
+class HyperLogLog:
+    # Number of distinct values, with a standard error of 1.04 / sqrt(2^precision),
+    # 0.8 % and 16 KiB with the default precision.
+    # https://en.wikipedia.org/wiki/HyperLogLog
+    def __init__(self, precision: int = HLL_PRECISION):
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value: str):
+        hash_value = _get_hash(value)
+        index = hash_value >> (64 - self.precision)
+        bits_length = 64 - self.precision
+        # Position of the first 1 bit in the remaining bits.
+        rank = bits_length - (hash_value & ((1 << bits_length) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self) -> int:
+        registers_number = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / registers_number)
+        estimate = (
+            alpha
+            * registers_number**2
+            / sum(2.0**-register for register in self.registers)
+        )
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * registers_number and zeros != 0:
+            # Linear counting is better for few values.
+            estimate = registers_number * math.log(registers_number / zeros)
+        return round(estimate)
+
+    def merge(self, sketch: "HyperLogLog"):
+        _check_same_parameters(self.precision, sketch.precision)
+        self.registers = bytearray(map(max, self.registers, sketch.registers))
+
+    def asdict(self) -> dict:
+        return {"precision": self.precision, "registers": _encode(self.registers)}
+
+    @classmethod
+    def from_dict(cls, values: dict) -> "HyperLogLog":
+        result = cls(values["precision"])
+        result.registers = bytearray(_decode(values["registers"]))
+        return result
+
+
+class CountMinSketch:
+    # Number of times that a value has been added, never less than the real
+    # one and with an error of less than 2.7 / width * total count with a
+    # probability of 1 - 0.37^depth.
+    # https://en.wikipedia.org/wiki/Count%E2%80%93min_sketch
+    def __init__(self, width: int = COUNT_MIN_WIDTH, depth: int = COUNT_MIN_DEPTH):
+        self.width = width
+        self.depth = depth
+        self.counters = array("Q", bytes(8 * width * depth))
+
+    def add(self, value: str, count: int = 1):
+        for index in self._get_indexes(value):
+            self.counters[index] += count
+
+    def get_count(self, value: str) -> int:
+        return min(self.counters[index] for index in self._get_indexes(value))
+
+    def merge(self, sketch: "CountMinSketch"):
+        _check_same_parameters((self.width, self.depth), (sketch.width, sketch.depth))
+        self.counters = array("Q", map(sum, zip(self.counters, sketch.counters)))
+
+    def asdict(self) -> dict:
+        return {
+            "width": self.width,
+            "depth": self.depth,
+            "counters": _encode(self.counters.tobytes()),
+        }
+
+    @classmethod
+    def from_dict(cls, values: dict) -> "CountMinSketch":
+        result = cls(values["width"], values["depth"])
+        result.counters = array("Q", _decode(values["counters"]))
+        return result
+
+    def _get_indexes(self, value: str) -> List[int]:
+        # Each row uses other hash, calculated from two hashes.
+        # https://www.eecs.harvard.edu/~michaelm/postscripts/rsa2008.pdf
+        hash_value = _get_hash(value)
+        hash_1, hash_2 = hash_value >> 32, hash_value & 0xFFFFFFFF
+        width = self.width
+        return [
+            row * width + (hash_1 + row * hash_2) % width for row in range(self.depth)
+        ]
+
+
+class SpaceSaving:
+    # The `size` values added more times with their count. A value not kept
+    # replaces the one with the minimum count and its count starts at that
+    # minimum, saved as its error: the count is never less than the real one.
+    # https://www.cs.ucsb.edu/sites/default/files/documents/2005-23.pdf
+    def __init__(self, size: int = SPACE_SAVING_SIZE):
+        self.size = size
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        # The counts in the heap can be lower than the current ones, they are
+        # updated when they are at the top.
+        self._heap: List[Tuple[int, str]] = []
+
+    def add(self, value: str, count: int = 1):
+        counts = self.counts
+        if value in counts:
+            counts[value] += count
+        elif len(counts) < self.size:
+            counts[value] = count
+            self.errors[value] = 0
+            heapq.heappush(self._heap, (count, value))
+        else:
+            count_min, value_min = self._pop_min()
+            del counts[value_min], self.errors[value_min]
+            counts[value] = count_min + count
+            self.errors[value] = count_min
+            heapq.heappush(self._heap, (count_min + count, value))
+
+    def get_top(self, size: int) -> List[Tuple[str, int, int]]:
+        # Values with their count and error.
+        return [
+            (value, count, self.errors[value])
+            for value, count in heapq.nlargest(
+                size, self.counts.items(), key=lambda item: item[1]
+            )
+        ]
+
+    def get_min_count(self) -> int:
+        if len(self.counts) < self.size:
+            return 0
+        return min(self.counts.values())
+
+    def merge(self, sketch: "SpaceSaving"):
+        # The values not kept by a sketch can have been added up to its
+        # minimum count times.
+        # https://www.cs.utah.edu/~jeffp/papers/merge-summ.pdf
+        min_count, min_count_other = self.get_min_count(), sketch.get_min_count()
+        counts, errors = {}, {}
+        values_other = [value for value in sketch.counts if value not in self.counts]
+        for value in [*self.counts, *values_other]:
+            counts[value] = self.counts.get(value, min_count) + sketch.counts.get(
+                value, min_count_other
+            )
+            errors[value] = self.errors.get(value, min_count) + sketch.errors.get(
+                value, min_count_other
+            )
+        values = heapq.nlargest(self.size, counts, key=counts.__getitem__)
+        self._set_counts(
+            {value: counts[value] for value in values},
+            {value: errors[value] for value in values},
+        )
+
+    def asdict(self) -> dict:
+        return {"size": self.size, "counts": self.counts, "errors": self.errors}
+
+    @classmethod
+    def from_dict(cls, values: dict) -> "SpaceSaving":
+        result = cls(values["size"])
+        result._set_counts(values["counts"], values["errors"])
+        return result
+
+    def _pop_min(self) -> Tuple[int, str]:
+        while True:
+            count, value = heapq.heappop(self._heap)
+            if count == self.counts[value]:
+                return count, value
+            heapq.heappush(self._heap, (self.counts[value], value))
+
+    def _set_counts(self, counts: Dict[str, int], errors: Dict[str, int]):
+        self.counts, self.errors = dict(counts), dict(errors)
+        self._heap = [(count, value) for value, count in self.counts.items()]
+        heapq.heapify(self._heap)
+
+
+def _get_hash(value: str) -> int:
+    # The built-in `hash` of strings changes in each process.
+    return int.from_bytes(
+        hashlib.blake2b(value.encode(), digest_size=8).digest(), "little"
+    )
+
+
+def _check_same_parameters(parameters, parameters_other):
+    if parameters != parameters_other:
+        raise ValueError(
+            f"Sketches with different parameters: {parameters}, {parameters_other}"
+        )
+
+
+def _encode(content: bytes) -> str:
+    return base64.b64encode(content).decode()
+
+
+def _decode(content: str) -> bytes:
+    return base64.b64decode(content)
@@ -0,0 +1,126 @@
+from typing import Dict, List
+
+
+class StageStats:
+    # Work of a pipeline stage, without the time waiting for other stages.
+    def __init__(self, items: int = 0, lines: int = 0, seconds: float = 0):
+        self.items = items
+        self.lines = lines
+        self.seconds = seconds
+
+    def __repr__(self):
+        lines_per_second = self.lines / self.seconds if self.seconds > 0 else 0
+        return (
+            f"batches {self.items}, lines {self.lines}, busy time"
+            f" {self.seconds:.3f}s, {lines_per_second:.0f} lines/s"
+        )
+
+    def add(self, stats: "StageStats"):
+        self.items += stats.items
+        self.lines += stats.lines
+        self.seconds += stats.seconds
+
+
+class QueueStats:
+    # Number of items in the queue each time an item is put.
+    def __init__(self, puts: int = 0, depth_sum: int = 0, depth_max: int = 0):
+        self.puts = puts
+        self.depth_sum = depth_sum
+        self.depth_max = depth_max
+
+    def __repr__(self):
+        depth_mean = self.depth_sum / self.puts if self.puts > 0 else 0
+        return f"depth mean {depth_mean:.2f}, depth max {self.depth_max}"
+
+    def add_depth(self, depth: int):
+        self.puts += 1
+        self.depth_sum += depth
+        self.depth_max = max(self.depth_max, depth)
+
+    def add(self, stats: "QueueStats"):
+        self.puts += stats.puts
+        self.depth_sum += stats.depth_sum
+        self.depth_max = max(self.depth_max, stats.depth_max)
+
+
+class FileStats:
+    def __init__(
+        self,
+        pathname: str,
+        lines_read: int = 0,
+        lines_parsed: int = 0,
+        lines_rejected: int = 0,
+        bytes_in: int = 0,
+        seconds: float = 0,
+        lines_filtered: int = 0,
+    ):
+        self.pathname = pathname
+        self.lines_read = lines_read
+        self.lines_parsed = lines_parsed
+        self.lines_rejected = lines_rejected
+        self.bytes_in = bytes_in
+        self.seconds = seconds
+        # Only with conditions to select the logs.
+        self.lines_filtered = lines_filtered
+        # Only with the pipeline.
+        self.stages_stats: Dict[str, StageStats] = {}
+        self.queues_stats: Dict[str, QueueStats] = {}
+
+    def __repr__(self):
+        filtered = (
+            "" if self.lines_filtered == 0 else f" filtered {self.lines_filtered},"
+        )
+        return (
+            f"lines read {self.lines_read}, parsed {self.lines_parsed},"
+            f" rejected {self.lines_rejected},{filtered} bytes in {self.bytes_in},"
+            f" time {self.seconds:.3f}s"
+        )
+
+    def add(self, stats: "FileStats"):
+        self.lines_read += stats.lines_read
+        self.lines_parsed += stats.lines_parsed
+        self.lines_rejected += stats.lines_rejected
+        self.lines_filtered += stats.lines_filtered
+        self.bytes_in += stats.bytes_in
+        self.seconds += stats.seconds
+        for name, stage_stats in stats.stages_stats.items():
+            self.stages_stats.setdefault(name, StageStats()).add(stage_stats)
+        for name, queue_stats in stats.queues_stats.items():
+            self.queues_stats.setdefault(name, QueueStats()).add(queue_stats)
+
+
+class RunStats:
+    def __init__(self):
+        # Parts of a file converted in parallel are added to the same stats.
+        self.files_stats: Dict[str, FileStats] = {}
+        self.bytes_out = 0
+
+    @property
+    def total(self) -> FileStats:
+        result = FileStats("Total")
+        for file_stats in self.files_stats.values():
+            result.add(file_stats)
+        return result
+
+    def add(self, stats: FileStats):
+        if stats.pathname not in self.files_stats:
+            self.files_stats[stats.pathname] = FileStats(stats.pathname)
+        self.files_stats[stats.pathname].add(stats)
+
+    def get_summary(self) -> List[str]:
+        total = self.total
+        return [
+            *(
+                f"File {file_stats.pathname}: {file_stats}"
+                for file_stats in self.files_stats.values()
+            ),
+            f"Total: {total}, bytes out {self.bytes_out}",
+            *(
+                f"Stage {name}: {stage_stats}"
+                for name, stage_stats in total.stages_stats.items()
+            ),
+            *(
+                f"Queue {name}: {queue_stats}"
+                for name, queue_stats in total.queues_stats.items()
+            ),
+        ]
@@ -0,0 +1,149 @@
+from typing import Callable, Iterator, List, Optional, Tuple
+import json
+import os
+
+from filter_log import TIME_MARGIN
+from m_time import TimeParser
+from read_file import FileReader
+import m_log
+
+# The index of a log file is saved in a file next to it, with this suffix.
+# The files are not converted because their name does not end with a number.
+INDEX_SUFFIX = ".index.json"
+
+
+class TimeIndex:
+    # Sparse index of the time of the logs in a file, to read only the part
+    # of the file with the logs of a time window. It has the time of the
+    # first log of each block read and where the log starts in the content,
+    # decompressed for gz files.
+    # A gz file can only be decompressed from the start of a member, so its
+    # members are saved too. Most gz files have one member, so the content
+    # before the offset is decompressed but not split in lines nor parsed.
+    # https://github.com/madler/zlib/blob/master/examples/zran.c
+    def __init__(
+        self,
+        pathname: str,
+        inode: int = 0,
+        size: int = 0,
+        mtime: float = 0,
+        checkpoints: Optional[List[List[int]]] = None,
+        gz_members: Optional[List[List[int]]] = None,
+    ):
+        self.pathname = pathname
+        self.inode = inode
+        self.size = size
+        self.mtime = mtime
+        # Pairs [epoch, offset], in order of offset.
+        self.checkpoints = [] if checkpoints is None else checkpoints
+        # Pairs [compressed offset, decompressed offset], in order of offset.
+        self.gz_members = [] if gz_members is None else gz_members
+
+    def asdict(self) -> dict:
+        return dict(vars(self))
+
+    @classmethod
+    def load(cls, pathname: str) -> Optional["TimeIndex"]:
+        # Only the index of the current content of the file.
+        pathname_index = get_pathname_index(pathname)
+        if not os.path.isfile(pathname_index):
+            return None
+        with open(pathname_index, "r") as file:
+            result = cls(**json.load(file))
+        if not result.is_same_file(pathname):
+            return None
+        return result
+
+    def save(self):
+        # Replace the file at once, to not leave a broken file if interrupted.
+        pathname_index = get_pathname_index(self.pathname)
+        pathname_temporary = f"{pathname_index}.tmp"
+        with open(pathname_temporary, "w") as file:
+            json.dump(self.asdict(), file)
+        os.replace(pathname_temporary, pathname_index)
+
+    def is_same_file(self, pathname: str) -> bool:
+        stat = os.stat(pathname)
+        return (
+            self.pathname == pathname
+            and self.inode == stat.st_ino
+            and self.size == stat.st_size
+            and self.mtime == stat.st_mtime
+        )
+
+    def set_file(self, pathname: str):
+        stat = os.stat(pathname)
+        self.pathname = pathname
+        self.inode = stat.st_ino
+        self.size = stat.st_size
+        self.mtime = stat.st_mtime
+
+    def get_offsets(
+        self, time_start: Optional[int], time_end: Optional[int]
+    ) -> Tuple[int, Optional[int]]:
+        # Content to read for the logs of the time window [start, end). The
+        # logs are not always in order of time: they can be up to
+        # `TIME_MARGIN` seconds before or after the logs around them.
+        offset_start, offset_end = 0, None
+        for epoch, offset in self.checkpoints:
+            if time_start is not None and epoch < time_start - TIME_MARGIN:
+                offset_start = offset
+            if time_end is not None and epoch >= time_end + TIME_MARGIN:
+                offset_end = offset
+                break
+        return offset_start, offset_end
+
+    def get_gz_member(self, offset: int) -> Tuple[int, int]:
+        result = (0, 0)
+        for offset_compressed, offset_decompressed in self.gz_members:
+            if offset_decompressed > offset:
+                break
+            result = (offset_compressed, offset_decompressed)
+        return result
+
+
+def get_pathname_index(pathname: str) -> str:
+    return f"{pathname}{INDEX_SUFFIX}"
+
+
+def get_lines_in_pathname(
+    pathname: str,
+    reader: FileReader,
+    time_start: Optional[int] = None,
+    time_end: Optional[int] = None,
+    get_log: Callable[[str], Optional[m_log.Log]] = m_log.get_log,
+) -> Iterator[str]:
+    # With an index, only the lines around the time window are read. Without
+    # it, all the lines are read and the index is saved after the last one.
+    index = TimeIndex.load(pathname)
+    if index is None:
+        yield from _get_lines_indexed(pathname, reader, get_log)
+        return
+    offset_start, offset_end = index.get_offsets(time_start, time_end)
+    for line in reader.get_lines_in_pathname(
+        pathname, offset_start, gz_member=index.get_gz_member(offset_start)
+    ):
+        # The lines of a block start after the offset of the block.
+        if offset_end is not None and reader.offset >= offset_end:
+            return
+        yield line
+
+
+def _get_lines_indexed(
+    pathname: str, reader: FileReader, get_log: Callable[[str], Optional[m_log.Log]]
+) -> Iterator[str]:
+    # The first line after each block read starts at the offset of the reader.
+    index = TimeIndex(pathname)
+    time_parser = TimeParser()
+    offset_checked = None
+    for line in reader.get_lines_in_pathname(pathname):
+        if reader.offset != offset_checked:
+            offset_checked = reader.offset
+            log = get_log(line)
+            epoch = None if log is None else time_parser.get_epoch(log.time_local)
+            if epoch is not None:
+                index.checkpoints.append([epoch, reader.offset])
+        yield line
+    index.gz_members = [list(gz_member) for gz_member in reader.gz_members]
+    index.set_file(pathname)
+    index.save()
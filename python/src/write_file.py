@@ -1,10 +1,37 @@
-from m_log import Log
+from typing import BinaryIO, List, Sequence, Tuple
+import re
 
+# Characters that make the csv writer quote a value.
+REGEX_CSV_QUOTE = re.compile(rb'[,"\r\n]')
 
-def write_to_file_error(line: str, writer):
-    print(f"Not parsed: {line}")
+
+def write_to_file_error(line: str, writer, print_line: bool = True):
+    if print_line:
+        print(f"Not parsed: {line}")
     writer.write(f"{line}\n")
 
 
-def write_to_file_result(log: Log, writer):
-    writer.writerow(log.asdict())
+def write_to_file_error_bytes(line: bytes, writer: BinaryIO, print_line: bool = True):
+    if print_line:
+        print(f"Not parsed: {str(line, 'utf-8', 'replace')}")
+    writer.write(line)
+    writer.write(b"\n")
+
+
+def write_to_file_results(rows: Sequence[tuple], writer):
+    writer.writerows(rows)
+
+
+def write_to_file_results_bytes(logs_values: List[Tuple[bytes, ...]], writer: BinaryIO):
+    writer.write(b"".join([_get_csv_row(values) for values in logs_values]))
+
+
+def _get_csv_row(values: Tuple[bytes, ...]) -> bytes:
+    # Same format as the csv module writer.
+    return b",".join([_get_csv_value(value) for value in values]) + b"\r\n"
+
+
+def _get_csv_value(value: bytes) -> bytes:
+    if REGEX_CSV_QUOTE.search(value) is None:
+        return value
+    return b'"' + value.replace(b'"', b'""') + b'"'
@@ -0,0 +1,95 @@
+from pathlib import Path
+import sys
+import unittest
+
+project_main_path = Path(__file__).parent.parent.parent
+sys.path.append(str(project_main_path.joinpath("src")))
+
+from src import aggregate
+from src import m_log
+
+LOGS = [
+    m_log.Log(
+        "8.8.8.8",
+        "-",
+        "28/Oct/2021:00:18:22 +0100",
+        "GET / HTTP/1.1",
+        "200",
+        "77",
+        "-",
+        "foo",
+    ),
+    m_log.Log(
+        "8.8.8.8",
+        "-",
+        "28/Oct/2021:00:18:59 +0100",
+        "GET /a?b=1 HTTP/1.1",
+        "404",
+        "5",
+        "-",
+        "foo",
+    ),
+    m_log.Log(
+        "1.2.3.4", "-", "28/Oct/2021:00:19:00 +0100", "-", "400", "0", "-", "foo"
+    ),
+]
+
+
+class TestAggregator(unittest.TestCase):
+    def test_get_summary(self):
+        aggregator = aggregate.Aggregator(top_size=1)
+        aggregator.writerows(LOGS)
+        self.assertEqual(
+            {
+                "logs": 3,
+                "bytes": 82,
+                "statuses": {"200": 1, "400": 1, "404": 1},
+                "distinct_remote_addrs": 2,
+                "top_remote_addrs": [("8.8.8.8", 2)],
+                "top_paths": [("/", 1)],
+                "top_user_agents": [("foo", 3)],
+                "bytes_per_minute": {"2021-10-27T23:18Z": 82, "2021-10-27T23:19Z": 0},
+            },
+            aggregator.get_summary(),
+        )
+
+    def test_merge_has_same_summary_as_one_aggregator(self):
+        aggregator = aggregate.Aggregator()
+        aggregator.writerows(LOGS)
+        aggregator_merged = aggregate.Aggregator()
+        for log in LOGS:
+            aggregator_part = aggregate.Aggregator()
+            aggregator_part.writerows([log])
+            aggregator_merged.merge(aggregator_part)
+        self.assertEqual(aggregator.get_summary(), aggregator_merged.get_summary())
+
+    def test_sketch_aggregator_has_same_summary_as_aggregator(self):
+        aggregator = aggregate.Aggregator()
+        aggregator.writerows(LOGS)
+        sketch_aggregator = aggregate.SketchAggregator()
+        sketch_aggregator.writerows(LOGS)
+        summary = sketch_aggregator.get_summary()
+        del summary["sketches"]
+        self.assertEqual(aggregator.get_summary(), summary)
+
+    def test_sketch_aggregator_from_summary(self):
+        sketch_aggregator = aggregate.SketchAggregator()
+        sketch_aggregator.writerows(LOGS)
+        sketch_aggregator_from_summary = aggregate.SketchAggregator.from_summary(
+            sketch_aggregator.get_summary()
+        )
+        sketch_aggregator.merge(sketch_aggregator_from_summary)
+        summary = sketch_aggregator.get_summary()
+        self.assertEqual(6, summary["logs"])
+        self.assertEqual(2, summary["distinct_remote_addrs"])
+        self.assertEqual([("8.8.8.8", 4)], summary["top_remote_addrs"][:1])
+        self.assertEqual(164, summary["bytes_per_minute"]["2021-10-27T23:18Z"])
+
+    def test_get_top(self):
+        self.assertEqual(
+            [("c", 3), ("a", 2)], aggregate.get_top({"a": 2, "b": 1, "c": 3}, 2)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+from pathlib import Path
+import contextlib
+import csv
+import datetime
+import io
+import sys
+import tempfile
+import unittest
+
+project_main_path = Path(__file__).parent.parent.parent
+sys.path.append(str(project_main_path.joinpath("src")))
+
+from src import columnar_file
+from src import lib
+from tests.unit.test_convert_file import LINES
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+@unittest.skipUnless(pyarrow is not None, "pyarrow is not installed")
+class TestRunWithFormat(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.path = Path(self._directory.name)
+        content = "\n".join(LINES) + "\n"
+        self.path.joinpath("access.log").write_text(content)
+        self.path.joinpath("access.log.1").write_text(content)
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def _run(self, *args: str):
+        with contextlib.redirect_stdout(io.StringIO()):
+            lib.run(lib.get_args_parsed([str(self.path), *args]))
+
+    def _get_csv_rows(self) -> list:
+        self._run()
+        with open(self.path.joinpath("result.csv"), newline="") as file:
+            return list(csv.reader(file))[1:]
+
+    def _get_table(self, format: str, *args: str):
+        self._run("--format", format, *args)
+        pathname = self.path.joinpath(
+            f"result.{columnar_file.FORMATS_EXTENSIONS[format]}"
+        )
+        if format == "parquet":
+            return pyarrow.parquet.read_table(pathname)
+        with pyarrow.memory_map(str(pathname)) as file:
+            return pyarrow.ipc.open_stream(file).read_all()
+
+    def test_run_with_format_has_typed_columns(self):
+        rows = self._get_csv_rows()
+        for format in ("arrow", "parquet"):
+            with self.subTest(format=format):
+                table = self._get_table(
+                    format,
+                    "--row-group-size",
+                    "2",
+                    "--time-format",
+                    "epoch",
+                    "--split-request",
+                )
+                self.assertEqual(
+                    columnar_file.get_schema(
+                        columnar_file.Log.DICT_KEYS
+                        + ["time_epoch", "method", "path", "query", "protocol"]
+                    ),
+                    table.schema,
+                )
+                self.assertEqual(["/", "/foo/bar"], table["path"].to_pylist()[:2])
+                self.assertEqual(len(rows), table.num_rows)
+                self.assertEqual(
+                    [int(row[4]) for row in rows], table["status"].to_pylist()
+                )
+                self.assertEqual(
+                    [int(row[5]) for row in rows],
+                    table["body_bytes_sent"].to_pylist(),
+                )
+                self.assertEqual(
+                    [row[7] for row in rows], table["http_user_agent"].to_pylist()
+                )
+                self.assertEqual(
+                    datetime.datetime(
+                        2021, 10, 27, 23, 18, 22, tzinfo=datetime.timezone.utc
+                    ),
+                    table["time_local"][0].as_py(),
+                )
+                self.assertEqual(1635376702, table["time_epoch"][0].as_py())
+
+    def test_run_with_format_and_jobs_has_same_result(self):
+        for format in ("arrow", "parquet"):
+            with self.subTest(format=format):
+                # The dictionaries of each row group can be different.
+                self.assertEqual(
+                    self._get_table(format).to_pylist(),
+                    self._get_table(
+                        format, "--jobs", "2", "--chunk-size", "100"
+                    ).to_pylist(),
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,449 @@
+from pathlib import Path
+import contextlib
+import gzip
+import io
+import json
+import sys
+import tempfile
+import unittest
+
+project_main_path = Path(__file__).parent.parent.parent
+sys.path.append(str(project_main_path.joinpath("src")))
+
+from src import lib
+from src import log_format
+from src import m_log
+
+LINES = [
+    '8.8.8.8 - - [28/Oct/2021:00:18:22 +0100] "GET / HTTP/1.1" 200 77 "-" "foo, bar 1"',
+    '8.8.8.8 - - [28/Oct/2021:10:00:01 +0100 "GET / HTTP/1.1" 200 77 "-" "foo, bar 1"',
+    '111.222.33.4 - abc [28/Nov/2021:06:08:15 +0100] "GET /foo/bar HTTP/1.1" 404 118'
+    ' "-" "foo, bar 2"',
+    '1.2.3.4 - - [28/Nov/2021:06:08:16 +0100] "GET / HTTP/1.1" 200 5 "-" "a "b" c"\r',
+    "",
+    "not a log",
+]
+
+
+class TestRun(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.path = Path(self._directory.name)
+        content = "\n".join(LINES) + "\n"
+        self.path.joinpath("access.log").write_text(content)
+        self.path.joinpath("access.log.1").write_text(content)
+        for number in range(2, 5):
+            with gzip.open(self.path.joinpath(f"access.log.{number}.gz"), "wt") as f:
+                f.write(content)
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def _get_result_files_content(self, *args: str) -> tuple:
+        with contextlib.redirect_stdout(io.StringIO()) as stdout:
+            lib.run(lib.get_args_parsed([str(self.path), *args]))
+        self.stdout = stdout.getvalue()
+        return (
+            self.path.joinpath("result.csv").read_bytes(),
+            self.path.joinpath("error.txt").read_bytes(),
+        )
+
+    def test_run_with_jobs_has_same_result_as_without_jobs(self):
+        result_serial = self._get_result_files_content()
+        result_parallel = self._get_result_files_content("--jobs", "3")
+        self.assertEqual(result_serial, result_parallel)
+        self.assertEqual(16, result_serial[0].count(b"\n"))
+        self.assertEqual([], list(self.path.glob(".nginx-logs-*")))
+
+    def test_run_with_jobs_and_file_chunks_has_same_result_as_without_jobs(self):
+        result_serial = self._get_result_files_content()
+        result_parallel = self._get_result_files_content(
+            "--jobs", "2", "--chunk-size", "100"
+        )
+        self.assertEqual(result_serial, result_parallel)
+
+    def test_run_with_mmap_has_same_result_as_without_mmap(self):
+        result = self._get_result_files_content()
+        self.assertEqual(result, self._get_result_files_content("--mmap"))
+        self.assertEqual(
+            result,
+            self._get_result_files_content(
+                "--mmap", "--jobs", "2", "--chunk-size", "100"
+            ),
+        )
+
+    def test_run_with_mmap_and_log_format_has_same_result_as_without_mmap(self):
+        args = ["--log-format", "combined"]
+        result = self._get_result_files_content(*args)
+        self.assertEqual(result, self._get_result_files_content(*args, "--mmap"))
+        self.assertEqual(self._get_result_files_content(), result)
+
+    def test_run_with_index_parser_has_same_result_as_regex_parser(self):
+        result = self._get_result_files_content()
+        self.assertEqual(result, self._get_result_files_content("--parser", "index"))
+        self.assertEqual(
+            result, self._get_result_files_content("--parser", "index", "--mmap")
+        )
+
+    def test_run_with_batch_size_and_write_buffer_has_same_result(self):
+        result = self._get_result_files_content()
+        self.assertEqual(
+            result,
+            self._get_result_files_content("--batch-size", "2", "--write-buffer", "16"),
+        )
+        self.assertEqual(
+            result,
+            self._get_result_files_content("--batch-size", "2", "--mmap"),
+        )
+
+    def test_run_with_quiet_does_not_show_lines_not_parsed(self):
+        result = self._get_result_files_content()
+        self.assertIn("Not parsed: not a log", self.stdout)
+        self.assertEqual(result, self._get_result_files_content("--quiet"))
+        self.assertNotIn("Not parsed", self.stdout)
+
+    def test_run_shows_summary(self):
+        self._get_result_files_content("--jobs", "2", "--chunk-size", "100")
+        summary = self.stdout.splitlines()
+        self.assertTrue(
+            summary[-1].startswith(
+                "Total: lines read 30, parsed 15, rejected 10, bytes in "
+            )
+        )
+        self.assertTrue(
+            summary[-2].startswith(
+                f"File {self.path.joinpath('access.log')}: lines read 6, parsed 3,"
+                " rejected 2,"
+            )
+        )
+
+    def test_run_with_gz_readers_has_same_result(self):
+        result = self._get_result_files_content("--gz-reader", "zlib")
+        for gz_reader in ("auto", "thread"):
+            self.assertEqual(
+                result, self._get_result_files_content("--gz-reader", gz_reader)
+            )
+
+    def test_run_with_pipeline_has_same_result(self):
+        result = self._get_result_files_content()
+        self.assertEqual(
+            result,
+            self._get_result_files_content(
+                "--pipeline", "--batch-size", "2", "--queue-size", "1"
+            ),
+        )
+        self.assertIn("Stage parse: batches 15, lines 30, busy time", self.stdout)
+        self.assertIn("Queue logs: depth mean", self.stdout)
+
+    def test_run_with_incremental_converts_only_new_logs(self):
+        result = self._get_result_files_content()
+        self.assertEqual(result, self._get_result_files_content("--incremental"))
+        self.assertTrue(self.path.joinpath("manifest.json").is_file())
+        self.assertEqual(result, self._get_result_files_content("--incremental"))
+        self.assertIn(
+            f"Skip file: {self.path.joinpath('access.log.4.gz')}", self.stdout
+        )
+        # The last line is being written, it is converted in the next run.
+        with open(self.path.joinpath("access.log"), "a") as file:
+            file.write(LINES[0] + "\n" + LINES[2][:20])
+        result_incremental = self._get_result_files_content("--incremental")
+        row = result[0].splitlines(keepends=True)[1]
+        self.assertEqual(result[0] + row, result_incremental[0])
+        self._rotate_files()
+        self.path.joinpath("access.log").write_text(LINES[3] + "\n")
+        result_incremental = self._get_result_files_content("--incremental")
+        self.assertNotIn(
+            f"Init file: {self.path.joinpath('access.log.5.gz')}", self.stdout
+        )
+        self.assertEqual(self._get_result_files_content(), result_incremental)
+
+    def test_run_with_other_columns_converts_again_only_with_incremental(self):
+        message = "The columns are different, all the logs are converted again"
+        self._get_result_files_content("--split-request")
+        self.assertNotIn(message, self.stdout)
+        self._get_result_files_content("--incremental")
+        self.assertNotIn(message, self.stdout)
+        result = self._get_result_files_content("--incremental", "--split-request")
+        self.assertIn(message, self.stdout)
+        self.assertEqual(self._get_result_files_content("--split-request"), result)
+
+    def test_run_without_incremental_removes_manifest(self):
+        self._get_result_files_content("--incremental")
+        self._get_result_files_content()
+        self.assertFalse(self.path.joinpath("manifest.json").exists())
+
+    def test_run_without_result_csv_keeps_manifest(self):
+        self._get_result_files_content("--incremental")
+        for args in (["--aggregate"], ["--rollup", "hour"]):
+            with self.subTest(args=args):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    lib.run(lib.get_args_parsed([str(self.path), *args]))
+                self.assertTrue(self.path.joinpath("manifest.json").is_file())
+        self._get_result_files_content("--incremental")
+        self.assertIn(
+            f"Skip file: {self.path.joinpath('access.log.4.gz')}", self.stdout
+        )
+
+    def test_run_with_time_format_adds_column(self):
+        result = self._get_result_files_content()
+        for time_format, value in (
+            ("epoch", b"1635376702"),
+            ("iso", b"2021-10-27T23:18:22Z"),
+        ):
+            rows = self._get_result_files_content("--time-format", time_format)[
+                0
+            ].splitlines()
+            self.assertEqual(
+                result[0].splitlines()[0] + f",time_{time_format}".encode(), rows[0]
+            )
+            self.assertEqual(result[0].splitlines()[1] + b"," + value, rows[1])
+
+    def test_run_with_split_request_adds_columns(self):
+        result = self._get_result_files_content()
+        rows = self._get_result_files_content(
+            "--split-request", "--time-format", "epoch"
+        )[0].splitlines()
+        self.assertEqual(
+            result[0].splitlines()[0] + b",time_epoch,method,path,query,protocol",
+            rows[0],
+        )
+        self.assertEqual(
+            result[0].splitlines()[2] + b",1638076095,GET,/foo/bar,,HTTP/1.1",
+            rows[2],
+        )
+
+    def test_run_with_aggregate_writes_summary(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            lib.run(lib.get_args_parsed([str(self.path), "--aggregate", "--top", "1"]))
+        summary = json.loads(self.path.joinpath("summary.json").read_text())
+        self.assertFalse(self.path.joinpath("result.csv").exists())
+        self.assertEqual(15, summary["logs"])
+        self.assertEqual({"200": 10, "404": 5}, summary["statuses"])
+        self.assertEqual([["8.8.8.8", 5]], summary["top_remote_addrs"])
+        with contextlib.redirect_stdout(io.StringIO()):
+            lib.run(
+                lib.get_args_parsed(
+                    [str(self.path), "--aggregate", "--top", "1", "--jobs", "2"]
+                )
+            )
+        self.assertEqual(
+            summary, json.loads(self.path.joinpath("summary.json").read_text())
+        )
+
+    def test_run_with_rollup_has_same_result_with_jobs(self):
+        pathname = str(self.path.joinpath("access.log"))
+        with contextlib.redirect_stdout(io.StringIO()) as stdout:
+            lib.run(lib.get_args_parsed([pathname, "--rollup", "hour"]))
+        self.assertIn("Logs without a valid time, not added: 0", stdout.getvalue())
+        rows = self.path.joinpath("rollup.csv").read_text().splitlines()
+        self.assertEqual(
+            [
+                "2021-10-27T23:00:00Z,1,0,1,0,0,0,0,77",
+                "2021-11-28T05:00:00Z,2,0,1,0,1,0,0,123",
+            ],
+            rows[1:],
+        )
+        with contextlib.redirect_stdout(io.StringIO()):
+            lib.run(
+                lib.get_args_parsed(
+                    [pathname, "--rollup", "hour", "--jobs", "2", "--chunk-size", "100"]
+                )
+            )
+        self.assertEqual(
+            rows, self.path.joinpath("rollup.csv").read_text().splitlines()
+        )
+
+    def test_run_with_where_converts_selected_logs(self):
+        result = self._get_result_files_content("--where", "status=4xx,500-599")
+        self.assertEqual(
+            ["111.222.33.4"] * 5,
+            [line.split(",")[0] for line in result[0].decode().splitlines()[1:]],
+        )
+        # The lines without the text of the conditions are not parsed.
+        self.assertEqual(b"", result[1])
+        self.assertIn("filtered 20,", self.stdout)
+        self.assertEqual(
+            result,
+            self._get_result_files_content(
+                "--where", "status=4xx,500-599", "--jobs", "2"
+            ),
+        )
+
+    def test_run_with_where_and_log_format(self):
+        self.path.joinpath("access.log").write_text(
+            "1.2.3.4 500 0.005 GET /api HTTP/1.1\n8.8.8.8 200 0.001 GET / HTTP/1.1\n"
+        )
+        with contextlib.redirect_stdout(io.StringIO()) as stdout:
+            lib.run(
+                lib.get_args_parsed(
+                    [
+                        str(self.path.joinpath("access.log")),
+                        "--log-format",
+                        "$remote_addr $status $request_time $request",
+                        "--where",
+                        "status=5xx",
+                    ]
+                )
+            )
+        self.assertEqual(
+            ["1.2.3.4", "-", "-", "GET /api HTTP/1.1", "500", "-", "-", "-", "0.005"],
+            self.path.joinpath("result.csv").read_text().splitlines()[1].split(","),
+        )
+        self.assertEqual(
+            2, len(self.path.joinpath("result.csv").read_text().splitlines())
+        )
+        self.assertIn("filtered 1,", stdout.getvalue())
+
+    def test_numeric_options_not_greater_than_zero_not_allowed(self):
+        for option in (
+            "--batch-size",
+            "--write-buffer",
+            "--queue-size",
+            "--follow-interval",
+            "--jobs",
+            "--chunk-size",
+            "--row-group-size",
+            "--top",
+        ):
+            for value, error in (
+                ("1", None),
+                ("0", "must be greater than 0"),
+                ("-1", "must be greater than 0"),
+            ):
+                with self.subTest(option=option, value=value):
+                    args = [str(self.path), option, value]
+                    if error is None:
+                        lib.get_args_parsed(args)
+                        continue
+                    with contextlib.redirect_stderr(io.StringIO()) as stderr:
+                        with self.assertRaises(SystemExit):
+                            lib.get_args_parsed(args)
+                    self.assertIn(f"argument {option}: {error}", stderr.getvalue())
+
+    def test_log_format_without_variables_of_options_not_allowed(self):
+        log_format_iso = (
+            "$remote_addr [$time_iso8601] $status $body_bytes_sent $request"
+        )
+        for args, error in (
+            (["--where", "time=2021-11-28T05:30:00Z/"], "$time_local is not in"),
+            (["--where", "status=5xx,404"], None),
+            (["--time-format", "epoch"], "$time_local is required"),
+            (["--rollup", "minute"], "$time_local is required"),
+            (["--time-index"], "$time_local is required"),
+        ):
+            with self.subTest(args=args):
+                args = [str(self.path), "--log-format", log_format_iso, *args]
+                if error is None:
+                    lib.get_args_parsed(args)
+                    continue
+                with contextlib.redirect_stderr(io.StringIO()) as stderr:
+                    with self.assertRaises(SystemExit):
+                        lib.get_args_parsed(args)
+                self.assertIn(error, stderr.getvalue())
+
+    def test_run_with_where_time_skips_files(self):
+        for number in range(2, 5):
+            self.path.joinpath(f"access.log.{number}.gz").unlink()
+        with gzip.open(self.path.joinpath("access.log.2.gz"), "wt") as file:
+            file.write(LINES[0] + "\n")
+        self.path.joinpath("access.log.1").write_text(LINES[2] + "\n")
+        self.path.joinpath("access.log").write_text(
+            LINES[3].replace("06:08:16", "07:08:16") + "\n"
+        )
+        result = self._get_result_files_content("--where", "time=2021-11-28T05:30:00Z/")
+        for filename in ("access.log.2.gz", "access.log.1"):
+            self.assertIn(
+                "Skip file out of the time window:"
+                f" {self.path.joinpath(filename)}\n",
+                self.stdout,
+            )
+        self.assertEqual(2, self.stdout.count("Skip file"))
+        self.assertEqual(
+            ["1.2.3.4"],
+            [line.split(",")[0] for line in result[0].decode().splitlines()[1:]],
+        )
+
+    def test_run_with_time_index_has_same_result(self):
+        args = ["--where", "time=2021-11-28T05:08:16Z/"]
+        result = self._get_result_files_content(*args)
+        self.assertEqual(result, self._get_result_files_content(*args, "--time-index"))
+        self.assertTrue(self.path.joinpath("access.log.1.index.json").is_file())
+        self.assertEqual(result, self._get_result_files_content(*args, "--time-index"))
+
+    def test_run_with_log_format_adds_columns(self):
+        self.assertEqual(
+            self._get_result_files_content(),
+            self._get_result_files_content("--log-format", "combined"),
+        )
+        pathname = self.path.joinpath("access.log")
+        pathname.write_text(LINES[0] + " 0.005 example.com\n")
+        with contextlib.redirect_stdout(io.StringIO()):
+            lib.run(
+                lib.get_args_parsed(
+                    [
+                        str(pathname),
+                        "--log-format",
+                        f"{log_format.LOG_FORMATS['combined']} $request_time $host",
+                        "--split-request",
+                    ]
+                )
+            )
+        self.assertEqual(
+            [
+                ",".join([*m_log.Log.DICT_KEYS, "request_time", "host"])
+                + ",method,path,query,protocol",
+                "8.8.8.8,-,28/Oct/2021:00:18:22 +0100,GET / HTTP/1.1,200,77,-,"
+                '"foo, bar 1",0.005,example.com,GET,/,,HTTP/1.1',
+            ],
+            self.path.joinpath("result.csv").read_text().splitlines(),
+        )
+
+    def test_run_with_latency_has_same_result_with_jobs(self):
+        for number, pathname in enumerate(sorted(self.path.iterdir())):
+            if pathname.suffix != ".gz":
+                pathname.write_text(
+                    "".join(
+                        f"{line} 0.{number}{index}0\n"
+                        for index, line in enumerate(LINES)
+                    )
+                )
+        args = [
+            str(self.path),
+            "--log-format",
+            f"{log_format.LOG_FORMATS['combined']} $request_time",
+            "--latency",
+            "path",
+        ]
+        with contextlib.redirect_stdout(io.StringIO()) as stdout:
+            lib.run(lib.get_args_parsed(args))
+        self.assertIn(
+            "Logs without request_time or path, not added: 5", stdout.getvalue()
+        )
+        rows = self.path.joinpath("latency.csv").read_text().splitlines()
+        self.assertEqual(
+            [
+                "path,requests,p50,p95,p99,max",
+                "/,2,0.000000,0.099249,0.099249,0.100000",
+                "/foo/bar,2,0.020037,0.118823,0.118823,0.120000",
+            ],
+            rows,
+        )
+        with contextlib.redirect_stdout(io.StringIO()):
+            lib.run(lib.get_args_parsed([*args, "--jobs", "2"]))
+        self.assertEqual(
+            rows, self.path.joinpath("latency.csv").read_text().splitlines()
+        )
+
+    def _rotate_files(self):
+        # Like logrotate with the compress and delaycompress options.
+        for number in range(4, 1, -1):
+            self.path.joinpath(f"access.log.{number}.gz").rename(
+                self.path.joinpath(f"access.log.{number + 1}.gz")
+            )
+        with gzip.open(self.path.joinpath("access.log.2.gz"), "wb") as file:
+            file.write(self.path.joinpath("access.log.1").read_bytes())
+        self.path.joinpath("access.log").rename(self.path.joinpath("access.log.1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
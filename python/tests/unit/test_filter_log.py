@@ -0,0 +1,115 @@
+from pathlib import Path
+import sys
+import unittest
+
+project_main_path = Path(__file__).parent.parent.parent
+sys.path.append(str(project_main_path.joinpath("src")))
+
+from src import filter_log
+from src import log_format
+from src import m_log
+
+LINE = (
+    '111.222.33.4 - abc [28/Nov/2021:06:08:15 +0100] "GET /foo/bar?a=1 HTTP/1.1"'
+    ' 404 118 "-" "foo, bar 2"'
+)
+
+
+class TestLogFilter(unittest.TestCase):
+    def _is_selected(self, *conditions: str, line: str = LINE) -> bool:
+        log_filter = filter_log.LogFilter(list(conditions))
+        log = m_log.get_log(line)
+        return log_filter.is_line_candidate(line) and log_filter.is_log_selected(log)
+
+    def test_status(self):
+        for condition, expected_result in (
+            ("status=404", True),
+            ("status=4xx", True),
+            ("status=400-499", True),
+            ("status=99-404", True),
+            ("status=500-599", False),
+            ("status=5xx,404", True),
+            ("status=405", False),
+        ):
+            with self.subTest(condition=condition):
+                self.assertEqual(expected_result, self._is_selected(condition))
+
+    def test_remote_addr(self):
+        for condition, expected_result in (
+            ("remote_addr=111.222.33.4", True),
+            ("remote_addr=111.222.33.44", False),
+            ("remote_addr=111.0.0.0/8", True),
+            ("remote_addr=111.222.32.0/23", True),
+            ("remote_addr=11.0.0.0/8", False),
+            ("remote_addr=0.0.0.0/0", True),
+            ("remote_addr=1.2.3.4,111.222.0.0/16", True),
+        ):
+            with self.subTest(condition=condition):
+                self.assertEqual(expected_result, self._is_selected(condition))
+
+    def test_path(self):
+        for condition, expected_result in (
+            ("path=/foo", True),
+            ("path=/foo/bar", True),
+            ("path=/bar", False),
+            ("path=/bar,/foo/", True),
+        ):
+            with self.subTest(condition=condition):
+                self.assertEqual(expected_result, self._is_selected(condition))
+
+    def test_time(self):
+        for condition, expected_result in (
+            ("time=2021-11-28T05:08:15Z/2021-11-28T05:08:16Z", True),
+            ("time=2021-11-28T06:08:15+01:00/", True),
+            ("time=2021-11-28T05:08:16/", False),
+            ("time=/2021-11-28T05:08:15", False),
+            ("time=/2021-11-28T05:08:16", True),
+        ):
+            with self.subTest(condition=condition):
+                self.assertEqual(expected_result, self._is_selected(condition))
+
+    def test_conditions_must_match(self):
+        self.assertTrue(self._is_selected("status=4xx", "path=/foo"))
+        self.assertFalse(self._is_selected("status=4xx", "path=/bar"))
+
+    def test_line_candidate_with_status_in_other_field(self):
+        log_filter = filter_log.LogFilter(["status=200"])
+        line = LINE.replace('"foo, bar 2"', '"foo" 200"')
+        self.assertTrue(log_filter.is_line_candidate(line))
+        self.assertFalse(log_filter.is_log_selected(m_log.get_log(line)))
+
+    def test_line_candidate_with_log_format(self):
+        # The text around the values is not the one of the combined format.
+        compiled_log_format = log_format.compile_log_format(
+            "$remote_addr $status $request_time $request"
+        )
+        line = "1.2.3.4 500 0.005 GET /api HTTP/1.1"
+        log = compiled_log_format.get_log(line)
+        for condition in ("status=5xx", "path=/api", "remote_addr=1.2.3.0/24"):
+            with self.subTest(condition=condition):
+                log_filter = filter_log.LogFilter([condition], compiled_log_format)
+                self.assertTrue(log_filter.is_line_candidate(line))
+                self.assertTrue(log_filter.is_log_selected(log))
+        log_filter = filter_log.LogFilter(
+            ["status=4xx"], log_format.compile_log_format("combined")
+        )
+        self.assertFalse(log_filter.is_line_candidate(LINE.replace(" 404 ", " 500 ")))
+
+    def test_conditions_not_valid(self):
+        for condition in (
+            "status",
+            "foo=1",
+            "status=",
+            "status=a",
+            "remote_addr=foo",
+            "time=2021-11-28",
+            "time=a/",
+            "time=/,/",
+        ):
+            with self.subTest(condition=condition):
+                with self.assertRaises(ValueError):
+                    filter_log.LogFilter([condition])
+
+
+if __name__ == "__main__":
+    unittest.main()
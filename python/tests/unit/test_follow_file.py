@@ -0,0 +1,105 @@
+from pathlib import Path
+import contextlib
+import io
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+project_main_path = Path(__file__).parent.parent.parent
+sys.path.append(str(project_main_path.joinpath("src")))
+
+from src import follow_file
+
+
+def _is_inotify_available() -> bool:
+    try:
+        follow_file.InotifyWatcher(tempfile.gettempdir()).close()
+    except (AttributeError, OSError):
+        return False
+    return True
+
+
+class TestFileFollower(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.path = Path(self._directory.name)
+        self.pathname = self.path.joinpath("access.log")
+        self.pathname.write_text("a\nb")
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def _follow(self, watcher: follow_file.PollingWatcher):
+        follower = follow_file.FileFollower(str(self.pathname), watcher)
+        pathname_rotated = self.path.joinpath("access.log.1")
+        self.lines = []
+
+        def follow():
+            with contextlib.redirect_stdout(io.StringIO()):
+                for lines in follower.get_lines_batches():
+                    self.lines += lines
+
+        thread = threading.Thread(target=follow)
+        thread.start()
+        try:
+            self._wait_lines(["a"])
+            with open(self.pathname, "a") as file:
+                file.write("c\nd\n")
+            self._wait_lines(["a", "bc", "d"])
+            # Rotation as logrotate with `create`: nginx writes to the renamed
+            # file until it reopens its logs and writes to the new file.
+            self.pathname.rename(pathname_rotated)
+            self.pathname.write_text("")
+            time.sleep(0.1)
+            with open(pathname_rotated, "a") as file:
+                file.write("e\n")
+            self._wait_lines(["a", "bc", "d", "e"])
+            with open(pathname_rotated, "a") as file:
+                file.write("f")
+            self.pathname.write_text("g\n")
+            self._wait_lines(["a", "bc", "d", "e", "f", "g"])
+            # Truncation.
+            self.pathname.write_text("")
+            time.sleep(0.1)
+            self.pathname.write_text("h\n")
+            self._wait_lines(["a", "bc", "d", "e", "f", "g", "h"])
+        finally:
+            follower.stop()
+            thread.join(timeout=5)
+            watcher.close()
+        self.assertFalse(thread.is_alive())
+
+    def test_rotated_file_closed_after_grace_without_new_file(self):
+        watcher = follow_file.PollingWatcher(0.01)
+        follower = follow_file.FileFollower(str(self.pathname), watcher, 0.2)
+        with contextlib.redirect_stdout(io.StringIO()):
+            batches = follower.get_lines_batches()
+            self.assertEqual(["a"], next(batches))
+            self.pathname.rename(self.path.joinpath("access.log.1"))
+            # The rest of the rotated file is read when the grace period ends.
+            time_start = time.monotonic()
+            self.assertEqual(["b"], next(batches))
+            self.assertGreaterEqual(time.monotonic() - time_start, 0.2)
+            self.pathname.write_text("c\n")
+            self.assertEqual(["c"], next(batches))
+            batches.close()
+
+    def _wait_lines(self, expected_lines):
+        for _ in range(500):
+            if self.lines == expected_lines:
+                return
+            time.sleep(0.01)
+        self.assertEqual(expected_lines, self.lines)
+
+    def test_follow_with_polling(self):
+        self._follow(follow_file.PollingWatcher(0.01))
+
+    @unittest.skipUnless(_is_inotify_available(), "inotify is not available")
+    def test_follow_with_inotify(self):
+        self._follow(follow_file.InotifyWatcher(str(self.path), 5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+from pathlib import Path
+import random
+import sys
+import tempfile
+import unittest
+
+project_main_path = Path(__file__).parent.parent.parent
+sys.path.append(str(project_main_path.joinpath("src")))
+
+from src import latency
+
+
+def _get_row(time_local: str, request: str, seconds):
+    return ("8.8.8.8", "-", time_local, request, "200", "10", "-", "-", seconds)
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_get_quantile_has_relative_error(self):
+        values = [random.Random(1).lognormvariate(-3, 1.5) for _ in range(10_000)]
+        histogram = latency.LatencyHistogram()
+        for value in values:
+            histogram.add(value)
+        values.sort()
+        for quantile in latency.QUANTILES:
+            with self.subTest(quantile=quantile):
+                value = values[round(quantile * len(values)) - 1]
+                self.assertLessEqual(
+                    abs(histogram.get_quantile(quantile) - value),
+                    value * latency.RELATIVE_ERROR,
+                )
+        self.assertEqual(values[-1], histogram.max)
+
+    def test_get_quantile_with_zeros(self):
+        histogram = latency.LatencyHistogram()
+        self.assertIsNone(histogram.get_quantile(0.5))
+        for value in (0.0, 0.0, 0.0, 2.0):
+            histogram.add(value)
+        self.assertEqual(0.0, histogram.get_quantile(0.5))
+        self.assertAlmostEqual(
+            2.0, histogram.get_quantile(0.99), delta=2.0 * latency.RELATIVE_ERROR
+        )
+
+    def test_merge(self):
+        histogram, histogram_1, histogram_2 = (
+            latency.LatencyHistogram() for _ in "123"
+        )
+        for index, value in enumerate((0.0, 0.001, 0.002, 0.5, 1.2, 0.001)):
+            histogram.add(value)
+            (histogram_1 if index % 2 == 0 else histogram_2).add(value)
+        histogram_1.merge(histogram_2)
+        self.assertEqual(vars(histogram), vars(histogram_1))
+        with self.assertRaises(ValueError):
+            histogram.merge(latency.LatencyHistogram(0.05))
+
+
+class TestLatencyAggregator(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.pathname = Path(self._directory.name).joinpath("latency.csv")
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_close_writes_quantiles_per_minute(self):
+        with latency.LatencyAggregator("minute", 8, str(self.pathname)) as result:
+            result.writerows(
+                [
+                    _get_row("28/Oct/2021:00:18:22 +0100", "GET / HTTP/1.1", 0.1),
+                    _get_row("28/Oct/2021:00:19:01 +0100", "GET / HTTP/1.1", 0.2),
+                    _get_row("28/Oct/2021:00:18:59 +0100", "-", 0.0),
+                    _get_row("28/Oct/2021:00:18:59 +0100", "-", None),
+                    _get_row("foo", "-", 0.1),
+                ]
+            )
+        self.assertEqual(2, result.logs_without_time)
+        self.assertEqual(
+            [
+                "minute,requests,p50,p95,p99,max",
+                "2021-10-27T23:18Z,2,0.000000,0.099249,0.099249,0.100000",
+                "2021-10-27T23:19Z,1,0.199867,0.199867,0.199867,0.200000",
+            ],
+            self.pathname.read_text().splitlines(),
+        )
+
+    def test_merge_per_path(self):
+        rows = [
+            _get_row("28/Oct/2021:00:18:22 +0100", "GET /foo?a=1 HTTP/1.1", 0.1),
+            _get_row("28/Oct/2021:00:18:22 +0100", "GET / HTTP/1.1", 0.3),
+            _get_row("28/Oct/2021:00:18:22 +0100", "GET /foo HTTP/1.1", 0.2),
+            _get_row("28/Oct/2021:00:18:22 +0100", "-", 0.2),
+        ]
+        aggregator = latency.LatencyAggregator("path", 8)
+        aggregator.writerows(rows[:2])
+        with latency.LatencyAggregator("path", 8, str(self.pathname)) as result:
+            result.writerows(rows[2:])
+            result.merge(aggregator)
+        self.assertEqual(
+            [
+                "path,requests,p50,p95,p99,max",
+                "/foo,2,0.099249,0.199867,0.199867,0.200000",
+                "/,1,0.298170,0.298170,0.298170,0.300000",
+            ],
+            self.pathname.read_text().splitlines(),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+from pathlib import Path
+import sys
+import unittest
+
+project_main_path = Path(__file__).parent.parent.parent
+sys.path.append(str(project_main_path.joinpath("src")))
+
+from src import log_format
+from src import m_log
+
+LOG_FORMAT_TIMES = (
+    '$remote_addr - $remote_user [$time_local] "$request" $status $body_bytes_sent'
+    ' "$http_referer" "$http_user_agent" rt=$request_time'
+    ' urt="$upstream_response_time" $host'
+)
+
+
+class TestLogFormat(unittest.TestCase):
+    def test_combined_has_same_result_as_regex(self):
+        combined = log_format.compile_log_format("combined")
+        pathname = project_main_path.parent.joinpath("example-log-files", "access.log")
+        for line in pathname.read_text().splitlines():
+            log = m_log.get_log(line)
+            self.assertEqual(log, combined.get_log(line), line)
+            self.assertEqual(
+                m_log.get_log_bytes(line.encode()),
+                combined.get_log_bytes(line.encode()),
+                line,
+            )
+
+    def test_get_log_with_other_variables(self):
+        result = log_format.compile_log_format(LOG_FORMAT_TIMES)
+        self.assertEqual(
+            m_log.Log.DICT_KEYS + ["request_time", "upstream_response_time", "host"],
+            result.fieldnames,
+        )
+        line = (
+            '2001:db8::1 - - [28/Oct/2021:00:18:22 +0100] "GET / HTTP/1.1" 200 77 "-"'
+            ' "foo bar" rt=0.005 urt="0.004, 0.001" example.com'
+        )
+        log = result.get_log(line)
+        self.assertEqual("2001:db8::1", log.remote_addr)
+        self.assertEqual("foo bar", log.http_user_agent)
+        self.assertEqual((0.005, 0.005, "example.com"), log[8:])
+        self.assertEqual(
+            (*(value.encode() for value in log[:8]), b"0.005", b"0.004, 0.001"),
+            result.get_log_bytes(line.encode())[:10],
+        )
+        self.assertIsNone(result.get_log(line.replace(" 200 ", " 2000 ")))
+        self.assertIsNone(result.get_log(line.replace(" rt=", " ")))
+
+    def test_get_log_without_variables_of_combined(self):
+        result = log_format.compile_log_format("${remote_addr}|$status|$msec")
+        self.assertEqual(
+            ("1.2.3.4", "-", "-", "-", "404", "-", "-", "-", "1635379102.123"),
+            result.get_log("1.2.3.4|404|1635379102.123"),
+        )
+        self.assertFalse(result.has_variables(["status", "body_bytes_sent"]))
+
+    def test_get_seconds(self):
+        for value, expected_result in (
+            ("0.005", 0.005),
+            ("-", None),
+            ("0.004, 0.002 : 0.001", 0.007),
+            ("-, 0.002", 0.002),
+            ("foo", None),
+        ):
+            with self.subTest(value=value):
+                self.assertEqual(expected_result, log_format.get_seconds(value))
+
+    def test_compile_log_format_is_cached(self):
+        self.assertIs(
+            log_format.compile_log_format(LOG_FORMAT_TIMES),
+            log_format.compile_log_format(LOG_FORMAT_TIMES),
+        )
+
+    def test_log_format_not_valid(self):
+        for value in ("foo", "$remote_addr$status", "$class $status", "$_a $status"):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    log_format.LogFormat(value)
+
+
+if __name__ == "__main__":
+    unittest.main()
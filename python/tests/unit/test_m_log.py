@@ -1,3 +1,5 @@
+from pathlib import Path
+import random
 import unittest
 
 from src import m_log
@@ -26,6 +28,157 @@ class TestFunctions(unittest.TestCase):
         )
         self.assertIsNone(m_log.get_log(line))
 
+    def test_get_log_bytes_has_same_values_as_get_log(self):
+        line = (
+            '8.8.8.8 - abc [28/Nov/2021:00:18:22 +0100] "GET / HTTP/1.1" 200 77 "-"'
+            ' "foo, bar"'
+        )
+        self.assertEqual(
+            tuple(value.encode() for value in m_log.get_log(line).asdict().values()),
+            m_log.get_log_bytes(line.encode()),
+        )
+
+    def test_get_log_by_index_for_parsed_log(self):
+        line = (
+            '8.8.8.8 - - [28/Oct/2021:00:18:22 +0100] "GET / HTTP/1.1" 200 77 "-"'
+            ' "foo bar 1"'
+        )
+        self.assertEqual(
+            "8.8.8.8,-,28/Oct/2021:00:18:22 +0100,GET / HTTP/1.1,200,77,-,foo bar 1",
+            repr(m_log.get_log_by_index(line)),
+        )
+
+    def test_get_log_by_index_for_not_parsed_log(self):
+        line = (
+            '8.8.8.8 - - [28/Oct/2021:00:18:22 +0100 "GET / HTTP/1.1" 200 77 "-"'
+            ' "foo bar 1"'
+        )
+        self.assertIsNone(m_log.get_log_by_index(line))
+
+    def test_get_request_values(self):
+        for request, expected_result in (
+            ("GET /foo/bar HTTP/1.1", ("GET", "/foo/bar", None, "HTTP/1.1")),
+            ("GET /foo?a=1&b= HTTP/2.0", ("GET", "/foo", "a=1&b=", "HTTP/2.0")),
+            ("GET /foo? HTTP/1.1", ("GET", "/foo", "", "HTTP/1.1")),
+            ("GET /foo bar HTTP/1.1", ("GET", "/foo bar", None, "HTTP/1.1")),
+            ("GET /", ("GET", "/", None, "")),
+            ("-", m_log.REQUEST_NOT_VALID),
+            ("", m_log.REQUEST_NOT_VALID),
+            ("GET", m_log.REQUEST_NOT_VALID),
+            ("\\x16\\x03\\x01\\x00\\xF4\\x01", m_log.REQUEST_NOT_VALID),
+        ):
+            self.assertEqual(expected_result, m_log.get_request_values(request))
+
+    def test_get_request_values_uses_same_string_for_method(self):
+        method = m_log.get_request_values("".join(["G", "ET / HTTP/1.1"]))[0]
+        self.assertIs(method, m_log.get_request_values("GET /foo HTTP/1.1")[0])
+
+    def test_get_request_values_does_not_save_other_methods(self):
+        request_strings = dict(m_log._REQUEST_STRINGS)
+        for number in range(100):
+            method = "".join("ABCDEFGHIJ"[int(digit)] for digit in str(number))
+            self.assertEqual(
+                method, m_log.get_request_values(f"{method} / HTTP/9.{number}")[0]
+            )
+        self.assertEqual(request_strings, m_log._REQUEST_STRINGS)
+
+
+class TestParsersEquivalence(unittest.TestCase):
+    ALPHABET = "abcXYZ019 /?=&,.;:()-_%'"
+
+    def setUp(self):
+        self._random = random.Random(0)
+
+    def _assert_parsers_have_same_result(self, line: str):
+        log_regex = m_log.get_log(line)
+        log_index = m_log.get_log_by_index(line)
+        self.assertEqual(
+            None if log_regex is None else repr(log_regex),
+            None if log_index is None else repr(log_index),
+            line,
+        )
+        self.assertEqual(
+            m_log.get_log_bytes(line.encode()),
+            m_log.get_log_bytes_by_index(line.encode()),
+            line,
+        )
+
+    def test_example_log_files(self):
+        project_path = Path(__file__).parent.parent.parent.parent
+        pathname = project_path.joinpath("example-log-files", "access.log")
+        for line in pathname.read_text().splitlines():
+            self._assert_parsers_have_same_result(line)
+
+    def test_lines_with_different_result(self):
+        start = "8.8.8.8 - - [28/Oct/2021:00:18:22 +0100]"
+        for line, expected_result_regex, expected_result_index in (
+            (
+                f'{start}\t"GET / HTTP/1.1" 200 77 "-" "ua"',
+                "8.8.8.8,-,28/Oct/2021:00:18:22 +0100,GET / HTTP/1.1,200,77,-,ua",
+                None,
+            ),
+            (
+                f'{start} "GET /a] "b HTTP/1.1" 200 77 "-" "ua"',
+                '8.8.8.8,-,28/Oct/2021:00:18:22 +0100] "GET /a,b HTTP/1.1,200,77,-,ua',
+                '8.8.8.8,-,28/Oct/2021:00:18:22 +0100,GET /a] "b HTTP/1.1,200,77,-,ua',
+            ),
+            (
+                f'{start} "GET /a" 200 5 "b HTTP/1.1" 200 77 "-" "ua"',
+                '8.8.8.8,-,28/Oct/2021:00:18:22 +0100,GET /a" 200 5 "b HTTP/1.1,200,77'
+                ",-,ua",
+                '8.8.8.8,-,28/Oct/2021:00:18:22 +0100,GET /a,200,5,b HTTP/1.1" 200 77'
+                ' "-,ua',
+            ),
+        ):
+            with self.subTest(line=line):
+                log_regex = m_log.get_log(line)
+                log_index = m_log.get_log_by_index(line)
+                self.assertEqual(
+                    expected_result_regex,
+                    None if log_regex is None else repr(log_regex),
+                )
+                self.assertEqual(
+                    expected_result_index,
+                    None if log_index is None else repr(log_index),
+                )
+
+    def test_fuzzed_lines(self):
+        for _ in range(20_000):
+            line = self._get_line()
+            mutation = self._random.random()
+            index = self._random.randrange(len(line))
+            if mutation < 0.3:
+                line = line[:index] + line[index + 1 :]
+            elif mutation < 0.6:
+                line = line[:index] + self._random.choice('"[] ') + line[index:]
+            self._assert_parsers_have_same_result(line)
+
+    def _get_line(self) -> str:
+        choice = self._random.choice
+        randint = self._random.randint
+        remote_addr = ".".join(
+            str(randint(0, 999 if self._random.random() < 0.05 else 255))
+            for _ in range(choice([4] * 20 + [3, 5]))
+        )
+        remote_user = choice(["-", "abc", "user name", ""])
+        time_local = f"{randint(1, 28):02d}/Oct/2021:{randint(0, 23):02d}:00:22 +0100"
+        request = choice(["GET / HTTP/1.1", "-", "", self._get_text(40)])
+        status = str(randint(0, 10 ** randint(1, 4)))
+        body_bytes_sent = choice([str(randint(0, 99999)), "-", ""])
+        http_referer = choice(["-", "", "http://foo.com/" + self._get_text(20)])
+        http_user_agent = self._get_text(60)
+        return (
+            f"{remote_addr} - {remote_user} [{time_local}]"
+            f' "{request}" {status} {body_bytes_sent}'
+            f' "{http_referer}" "{http_user_agent}"'
+        )
+
+    def _get_text(self, max_length: int) -> str:
+        return "".join(
+            self._random.choice(self.ALPHABET)
+            for _ in range(self._random.randint(0, max_length))
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,61 @@
+import datetime
+import random
+import unittest
+
+from src import m_time
+
+
+class TestTimeParser(unittest.TestCase):
+    def setUp(self):
+        self.time_parser = m_time.TimeParser()
+
+    def test_get_epoch(self):
+        self.assertEqual(
+            1635376702, self.time_parser.get_epoch("28/Oct/2021:00:18:22 +0100")
+        )
+        self.assertEqual(
+            946771199, self.time_parser.get_epoch("01/Jan/2000:23:59:59 +0000")
+        )
+        self.assertEqual(
+            946787400, self.time_parser.get_epoch("01/Jan/2000:23:00:00 -0530")
+        )
+
+    def test_get_epoch_of_invalid_time(self):
+        for time_local in (
+            "28/Oct/2021:00:18:22",
+            "29/Feb/2021:00:00:00 +0000",
+            "28/Foo/2021:00:18:22 +0100",
+            "28/Oct/2021:24:00:00 +0100",
+            "28/Oct/2021:00:1a:22 +0100",
+            "28/Oct/2021:00:18:22 0100",
+            "",
+        ):
+            self.assertIsNone(self.time_parser.get_epoch(time_local), time_local)
+
+    def test_get_epoch_as_strptime(self):
+        random_generator = random.Random(0)
+        for _ in range(1000):
+            time = datetime.datetime(2020, 1, 1) + datetime.timedelta(
+                seconds=random_generator.randrange(3 * 365 * 24 * 3600)
+            )
+            offset = random_generator.choice(("+0100", "-0330", "+0000", "+1400"))
+            time_local = time.strftime("%d/%b/%Y:%H:%M:%S ") + offset
+            self.assertEqual(
+                int(
+                    datetime.datetime.strptime(
+                        time_local, "%d/%b/%Y:%H:%M:%S %z"
+                    ).timestamp()
+                ),
+                self.time_parser.get_epoch(time_local),
+            )
+
+    def test_get_iso(self):
+        self.assertEqual(
+            "2021-10-27T23:18:22Z",
+            self.time_parser.get_iso("28/Oct/2021:00:18:22 +0100"),
+        )
+        self.assertIsNone(self.time_parser.get_iso("28/Oct/2021:00:18:22"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+from pathlib import Path
+import gzip
+import sys
+import tempfile
+import unittest
+
+project_main_path = Path(__file__).parent.parent.parent
+sys.path.append(str(project_main_path.joinpath("src")))
+
+from src import manifest
+from src import read_file
+
+
+class TestManifest(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.path = Path(self._directory.name)
+        self.reader = read_file.FileReader()
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_save_and_load(self):
+        pathname = self.path.joinpath("manifest.json")
+        manifest.Manifest(
+            [manifest.ManifestEntry("access.log", 1, 2, 3.5, "abc", 2, 2, [[0, 4]])]
+        ).save(str(pathname))
+        result = manifest.Manifest.load(str(pathname))
+        self.assertEqual(1, len(result.entries))
+        self.assertEqual(
+            {
+                "pathname": "access.log",
+                "inode": 1,
+                "size": 2,
+                "mtime": 3.5,
+                "hash": "abc",
+                "hash_size": 2,
+                "offset": 2,
+                "rows": [[0, 4]],
+            },
+            result.entries[0].asdict(),
+        )
+        self.assertEqual(4, result.rows)
+
+    def test_get_entry_of_file_renamed_and_compressed(self):
+        pathname = self.path.joinpath("access.log")
+        pathname.write_bytes(b"foo\nbar\n")
+        entry = manifest.Manifest().get_entry(str(pathname), self.reader)
+        entry.offset = 4
+        entry.set_file(str(pathname), self.reader)
+        result = manifest.Manifest([entry])
+        pathname_gz = self.path.joinpath("access.log.2.gz")
+        with gzip.open(pathname_gz, "wb") as file:
+            file.write(pathname.read_bytes())
+        pathname.write_bytes(b"baz\n")
+        self.assertIs(entry, result.get_entry(str(pathname_gz), self.reader))
+        self.assertFalse(entry.is_converted(str(pathname_gz), self.reader))
+        self.assertIsNot(entry, result.get_entry(str(pathname), self.reader))
+        self.assertEqual(2, len(result.entries))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+from pathlib import Path
+import io
+import sys
+import unittest
+
+project_main_path = Path(__file__).parent.parent.parent
+sys.path.append(str(project_main_path.joinpath("src")))
+
+from src import pipeline, stats
+
+
+class LinesConverter:
+    def __init__(self, line_to_fail: str = ""):
+        self.line_to_fail = line_to_fail
+
+    def parse_lines(self, lines, file_stats):
+        if self.line_to_fail in lines:
+            raise ValueError(self.line_to_fail)
+        return [line.upper() for line in lines], []
+
+    def write_results(self, logs, lines_not_parsed, writer_csv, file_error):
+        writer_csv.write("".join(logs))
+
+
+class TestPipeline(unittest.TestCase):
+    def setUp(self):
+        self.lines_batches = [[str(number), "a", "b"] for number in range(100)]
+
+    def _convert(self, lines_batches, lines_converter) -> stats.FileStats:
+        file_stats = stats.FileStats("access.log")
+        self.writer = io.StringIO()
+        pipeline.Pipeline(lines_converter, queue_size=2).convert_lines_batches(
+            lines_batches, self.writer, io.StringIO(), file_stats
+        )
+        return file_stats
+
+    def test_convert_lines_batches(self):
+        file_stats = self._convert(self.lines_batches, LinesConverter())
+        self.assertEqual(
+            "".join(f"{number}AB" for number in range(100)), self.writer.getvalue()
+        )
+        self.assertEqual(100, file_stats.stages_stats["write"].items)
+        self.assertEqual(300, file_stats.stages_stats["read"].lines)
+        self.assertLessEqual(file_stats.queues_stats["lines"].depth_max, 2)
+
+    def test_convert_lines_batches_raises_exception_when_parsing(self):
+        with self.assertRaises(ValueError):
+            self._convert(self.lines_batches, LinesConverter("50"))
+
+    def test_convert_lines_batches_raises_exception_when_reading(self):
+        def get_lines_batches():
+            yield from self.lines_batches[:50]
+            raise OSError("read")
+
+        with self.assertRaises(OSError):
+            self._convert(get_lines_batches(), LinesConverter())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+from pathlib import Path
+from typing import Iterator
+import contextlib
+import gzip
+import io
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from src import read_file
+
+
+class TestFileReader(unittest.TestCase):
+    def setUp(self):
+        self._class = read_file.FileReader()
+        self._directory = tempfile.TemporaryDirectory()
+        self.pathname = str(Path(self._directory.name).joinpath("access.log"))
+        self.lines = [f"line {number}" * (number % 7) for number in range(100)]
+        with open(self.pathname, "w") as file:
+            file.write("\n".join(self.lines))
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_get_byte_ranges_are_contiguous_and_end_after_new_line(self):
+        byte_ranges = self._class.get_byte_ranges(self.pathname, 50)
+        with open(self.pathname, "rb") as file:
+            content = file.read()
+        self.assertEqual(0, byte_ranges[0][0])
+        self.assertEqual(len(content), byte_ranges[-1][1])
+        for (_, end), (start, _) in zip(byte_ranges, byte_ranges[1:]):
+            self.assertEqual(end, start)
+            self.assertEqual(b"\n", content[end - 1 : end])
+
+    def test_get_lines_in_byte_range_returns_file_lines_in_order(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(
+                self.lines,
+                [
+                    line
+                    for byte_range in self._class.get_byte_ranges(self.pathname, 50)
+                    for line in self._class.get_lines_in_byte_range(
+                        self.pathname, byte_range
+                    )
+                ],
+            )
+
+    def test_get_lines_in_blocks_with_line_in_several_blocks(self):
+        blocks = [b"a", b"b", b"c\nd", b"e", b"\nf\n", b"g"]
+        self._class.offset = 0
+        self.assertEqual(
+            ["abc", "de", "f"],
+            list(self._class._get_lines_in_blocks(iter(blocks), True)),
+        )
+        self.assertEqual(9, self._class.offset)
+        self._class.offset = 0
+        self.assertEqual(
+            ["abc", "de", "f", "g"],
+            list(self._class._get_lines_in_blocks(iter(blocks))),
+        )
+        self.assertEqual(10, self._class.offset)
+
+
+class TestFileReaderGz(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.pathname = str(Path(self._directory.name).joinpath("access.log.2.gz"))
+        self.lines = [f"line {number} ñ" * (number % 5) for number in range(50_000)]
+        content = "\n".join(self.lines).encode()
+        # Two compressed members, as when a file is appended to a gz file.
+        with open(self.pathname, "wb") as file:
+            file.write(gzip.compress(content[:100_000]))
+            file.write(gzip.compress(content[100_000:]))
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def _get_lines(self, gz_reader: str) -> Iterator[str]:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield from read_file.FileReader(gz_reader).get_lines_in_pathname(
+                self.pathname
+            )
+
+    def _skip_without_external_program(self, gz_reader: str):
+        if gz_reader == "external" and all(
+            shutil.which(program[0]) is None
+            for program in read_file.GZ_EXTERNAL_PROGRAMS
+        ):
+            self.skipTest("pigz and zcat are not installed")
+
+    def test_get_lines_in_gz_file_with_all_readers(self):
+        for gz_reader in read_file.GZ_READERS:
+            with self.subTest(gz_reader=gz_reader):
+                self._skip_without_external_program(gz_reader)
+                self.assertEqual(self.lines, list(self._get_lines(gz_reader)))
+
+    def test_get_lines_in_gz_file_not_read_until_the_end(self):
+        for gz_reader in read_file.GZ_READERS:
+            with self.subTest(gz_reader=gz_reader):
+                self._skip_without_external_program(gz_reader)
+                lines = self._get_lines(gz_reader)
+                self.assertEqual(self.lines[:2], [next(lines), next(lines)])
+                lines.close()
+
+    def test_get_lines_in_truncated_gz_file(self):
+        with open(self.pathname, "rb") as file:
+            content = file.read()
+        with open(self.pathname, "wb") as file:
+            file.write(content[:-100])
+        with self.assertRaises(EOFError):
+            list(self._get_lines("zlib"))
+        with self.assertRaises(EOFError):
+            list(self._get_lines("thread"))
+
+
+class TestFileReaderMemory(unittest.TestCase):
+    # Peak resident memory of a process that reads all the lines of a file.
+    SCRIPT = """
+import resource
+import sys
+sys.path.append(sys.argv[1])
+from read_file import FileReader
+for line in FileReader().get_lines_in_pathname(sys.argv[2]):
+    pass
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.path = Path(self._directory.name)
+        self.src_pathname = str(Path(read_file.__file__).parent)
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def _get_peak_memory_kb(self, megabytes: int) -> int:
+        line = (
+            '8.8.8.8 - - [28/Oct/2021:00:18:22 +0100] "GET / HTTP/1.1" 200 77 "-"'
+            ' "foo, bar 1"\n'
+        )
+        pathname = self.path.joinpath(f"access.log.{megabytes}")
+        # Write by parts, the child process starts with the peak memory of this one.
+        with open(pathname, "w") as file:
+            for _ in range(megabytes):
+                file.write(line * (1024 * 1024 // len(line)))
+        result = subprocess.run(
+            [sys.executable, "-c", self.SCRIPT, self.src_pathname, str(pathname)],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        # The last line, after the lines of the reader.
+        return int(result.stdout.splitlines()[-1])
+
+    def test_peak_memory_does_not_depend_on_file_size(self):
+        peak_memory_kb_small_file = self._get_peak_memory_kb(4)
+        peak_memory_kb_big_file = self._get_peak_memory_kb(64)
+        self.assertLess(peak_memory_kb_big_file - peak_memory_kb_small_file, 8 * 1024)
+
+
+if __name__ == "__main__":
+    unittest.main()
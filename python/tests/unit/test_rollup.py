@@ -0,0 +1,91 @@
+from pathlib import Path
+import sys
+import tempfile
+import unittest
+
+project_main_path = Path(__file__).parent.parent.parent
+sys.path.append(str(project_main_path.joinpath("src")))
+
+from src import m_log
+from src import rollup
+
+
+def _get_log(time_local: str, status: str = "200", body_bytes_sent: str = "10"):
+    return m_log.Log(
+        "8.8.8.8", "-", time_local, "GET / HTTP/1.1", status, body_bytes_sent, "-", "-"
+    )
+
+
+class TestRollup(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.pathname = Path(self._directory.name).joinpath("rollup.csv")
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def _get_rows(self) -> list:
+        return self.pathname.read_text().splitlines()
+
+    def test_writerows_with_logs_not_in_order(self):
+        with rollup.Rollup("minute", 60, str(self.pathname)) as result:
+            result.writerows(
+                [
+                    _get_log("28/Oct/2021:00:18:22 +0100"),
+                    _get_log("28/Oct/2021:00:19:01 +0100", "404", "5"),
+                    _get_log("28/Oct/2021:00:18:59 +0100", "503"),
+                    _get_log("28/Oct/2021:00:20:00 +0100", "99"),
+                    _get_log("foo"),
+                ]
+            )
+            # The interval of 00:18 is written after its end and the lateness.
+            result.flush()
+            self.assertEqual(2, len(self._get_rows()))
+            result.writerows([_get_log("28/Oct/2021:00:21:00 +0100")])
+            result.flush()
+            self.assertEqual(3, len(self._get_rows()))
+            # Log after the lateness, in a new row with the same time.
+            result.writerows(
+                [
+                    _get_log("28/Oct/2021:00:18:00 +0100"),
+                    _get_log("28/Oct/2021:00:23:00 +0100"),
+                ]
+            )
+            result.flush()
+            self.assertEqual(
+                "2021-10-27T23:18:00Z,1,0,1,0,0,0,0,10", self._get_rows()[3]
+            )
+        # The rows with the same time are added at the end.
+        self.assertEqual(
+            [
+                ",".join(rollup.FIELDNAMES),
+                "2021-10-27T23:18:00Z,3,0,2,0,0,1,0,30",
+                "2021-10-27T23:19:00Z,1,0,0,0,1,0,0,5",
+                "2021-10-27T23:20:00Z,1,0,0,0,0,0,1,10",
+                "2021-10-27T23:21:00Z,1,0,1,0,0,0,0,10",
+                "2021-10-27T23:23:00Z,1,0,1,0,0,0,0,10",
+            ],
+            self._get_rows(),
+        )
+        self.assertEqual(1, result.logs_without_time)
+
+    def test_merge_has_same_rows_as_one_rollup(self):
+        logs = [
+            _get_log("28/Oct/2021:00:18:22 +0100"),
+            _get_log("28/Oct/2021:01:19:01 +0100"),
+            _get_log("28/Oct/2021:01:59:01 +0100"),
+        ]
+        with rollup.Rollup("hour", pathname=str(self.pathname)) as result:
+            result.writerows(logs)
+        rows = self._get_rows()
+        with rollup.Rollup("hour", pathname=str(self.pathname)) as result:
+            for log in logs:
+                result_part = rollup.Rollup("hour")
+                result_part.writerows([log])
+                result.merge(result_part)
+        self.assertEqual(rows, self._get_rows())
+        self.assertEqual(3, len(rows))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import random
+import unittest
+
+from src import sketch
+
+
+class TestHyperLogLog(unittest.TestCase):
+    def test_count(self):
+        hyper_log_log = sketch.HyperLogLog()
+        for number in range(20000):
+            hyper_log_log.add(str(number % 10000))
+        self.assertAlmostEqual(10000, hyper_log_log.count(), delta=300)
+        self.assertEqual(0, sketch.HyperLogLog().count())
+
+    def test_merge_has_count_of_union(self):
+        hyper_log_log, hyper_log_log_other = sketch.HyperLogLog(), sketch.HyperLogLog()
+        for number in range(3000):
+            hyper_log_log.add(str(number))
+            hyper_log_log_other.add(str(number + 1000))
+        hyper_log_log.merge(hyper_log_log_other)
+        self.assertAlmostEqual(4000, hyper_log_log.count(), delta=120)
+        with self.assertRaises(ValueError):
+            hyper_log_log.merge(sketch.HyperLogLog(10))
+
+    def test_from_dict(self):
+        hyper_log_log = sketch.HyperLogLog(10)
+        hyper_log_log.add("foo")
+        result = sketch.HyperLogLog.from_dict(hyper_log_log.asdict())
+        self.assertEqual(hyper_log_log.registers, result.registers)
+
+
+class TestCountMinSketch(unittest.TestCase):
+    def test_get_count_is_not_less_than_real_count(self):
+        count_min_sketch = sketch.CountMinSketch(width=64)
+        random_generator = random.Random(0)
+        values = [str(random_generator.randrange(500)) for _ in range(5000)]
+        for value in values:
+            count_min_sketch.add(value)
+        for value in set(values):
+            self.assertGreaterEqual(
+                count_min_sketch.get_count(value), values.count(value)
+            )
+
+    def test_merge_and_from_dict(self):
+        count_min_sketch = sketch.CountMinSketch()
+        count_min_sketch.add("foo", 2)
+        count_min_sketch_other = sketch.CountMinSketch.from_dict(
+            count_min_sketch.asdict()
+        )
+        count_min_sketch_other.add("foo")
+        count_min_sketch.merge(count_min_sketch_other)
+        self.assertEqual(5, count_min_sketch.get_count("foo"))
+        self.assertEqual(0, count_min_sketch.get_count("bar"))
+
+
+class TestSpaceSaving(unittest.TestCase):
+    def test_get_top_with_heavy_hitters(self):
+        space_saving = sketch.SpaceSaving(size=10)
+        random_generator = random.Random(0)
+        values = ["a"] * 300 + ["b"] * 200 + [str(number) for number in range(1000)]
+        random_generator.shuffle(values)
+        for value in values:
+            space_saving.add(value)
+        top = space_saving.get_top(2)
+        self.assertEqual(["a", "b"], [value for value, _, _ in top])
+        for value, count, error in top:
+            self.assertGreaterEqual(count, values.count(value))
+            self.assertLessEqual(count - error, values.count(value))
+
+    def test_get_top_is_exact_with_less_values_than_size(self):
+        space_saving = sketch.SpaceSaving(size=10)
+        for value in "abacab":
+            space_saving.add(value)
+        self.assertEqual(
+            [("a", 3, 0), ("b", 2, 0), ("c", 1, 0)], space_saving.get_top(5)
+        )
+
+    def test_merge_and_from_dict(self):
+        space_saving = sketch.SpaceSaving(size=2)
+        for value in "aab":
+            space_saving.add(value)
+        space_saving_other = sketch.SpaceSaving.from_dict(space_saving.asdict())
+        space_saving_other.add("c")
+        space_saving.merge(space_saving_other)
+        self.assertEqual([("a", 4, 0), ("b", 3, 2)], space_saving.get_top(2))
+
+
+if __name__ == "__main__":
+    unittest.main()
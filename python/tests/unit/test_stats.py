@@ -0,0 +1,24 @@
+import unittest
+
+from src import stats
+
+
+class TestRunStats(unittest.TestCase):
+    def test_add_stats_of_same_file(self):
+        run_stats = stats.RunStats()
+        run_stats.add(stats.FileStats("access.log", 3, 2, 1, 100, 1))
+        run_stats.add(stats.FileStats("access.log.1", 1, 1, 0, 10, 0.5))
+        run_stats.add(stats.FileStats("access.log", 2, 1, 0, 50, 1))
+        self.assertEqual(["access.log", "access.log.1"], list(run_stats.files_stats))
+        self.assertEqual(
+            "lines read 5, parsed 3, rejected 1, bytes in 150, time 2.000s",
+            repr(run_stats.files_stats["access.log"]),
+        )
+        self.assertEqual(
+            "lines read 6, parsed 4, rejected 1, bytes in 160, time 2.500s",
+            repr(run_stats.total),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
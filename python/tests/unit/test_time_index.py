@@ -0,0 +1,121 @@
+from pathlib import Path
+from unittest import mock
+import gzip
+import sys
+import tempfile
+import unittest
+
+project_main_path = Path(__file__).parent.parent.parent
+sys.path.append(str(project_main_path.joinpath("src")))
+
+from src import log_format
+from src import read_file
+from src import time_index
+
+# Logs of each minute, 80 bytes with the new line character.
+LINES = [
+    f'8.8.8.8 - - [28/Oct/2021:00:{minute:02}:00 +0000] "GET / HTTP/1.1" 200 77'
+    ' "-" "curl/8.0"'
+    for minute in range(10)
+]
+EPOCH_START = 1635379200
+
+
+class TestTimeIndex(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.path = Path(self._directory.name)
+        self.reader = read_file.FileReader("zlib")
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def _get_lines(self, pathname: str, *time_window) -> list:
+        with mock.patch.object(read_file, "BLOCK_SIZE", 160), mock.patch(
+            "builtins.print"
+        ):
+            return list(
+                time_index.get_lines_in_pathname(pathname, self.reader, *time_window)
+            )
+
+    def test_get_lines_in_pathname_saves_and_uses_index(self):
+        pathname = str(self.path.joinpath("access.log"))
+        Path(pathname).write_text("\n".join(LINES) + "\n")
+        self.assertEqual(LINES, self._get_lines(pathname))
+        index = time_index.TimeIndex.load(pathname)
+        self.assertEqual(
+            [[EPOCH_START + minute * 60, minute * 80] for minute in range(0, 10, 2)],
+            index.checkpoints,
+        )
+        # The logs can be up to 5 minutes out of order.
+        self.assertEqual(
+            LINES[2:],
+            self._get_lines(pathname, EPOCH_START + 8 * 60, EPOCH_START + 9 * 60),
+        )
+        self.assertEqual(LINES[:6], self._get_lines(pathname, None, EPOCH_START + 60))
+        self.assertEqual(LINES, self._get_lines(pathname, None, None))
+
+    def test_get_lines_in_pathname_of_gz_file_with_members(self):
+        pathname = str(self.path.joinpath("access.log.2.gz"))
+        with open(pathname, "wb") as file:
+            for lines in (LINES[:4], LINES[4:]):
+                file.write(gzip.compress(("\n".join(lines) + "\n").encode()))
+        self.assertEqual(LINES, self._get_lines(pathname))
+        index = time_index.TimeIndex.load(pathname)
+        self.assertEqual(2, len(index.gz_members))
+        self.assertEqual(320, index.gz_members[1][1])
+        self.assertEqual(
+            LINES[4:], self._get_lines(pathname, EPOCH_START + 10 * 60, None)
+        )
+        self.assertEqual(index.gz_members[1], list(self.reader.gz_members[0]))
+
+    def test_get_lines_in_pathname_with_log_format(self):
+        pathname = str(self.path.joinpath("access.log"))
+        # 80 bytes with the new line character, as the combined lines.
+        lines = [
+            line.replace('77 "-" "curl/8.0"', "example.com".ljust(17)) for line in LINES
+        ]
+        Path(pathname).write_text("\n".join(lines) + "\n")
+        get_log = log_format.compile_log_format(
+            '$remote_addr - $remote_user [$time_local] "$request" $status $host'
+        ).get_log
+        with mock.patch.object(read_file, "BLOCK_SIZE", 160):
+            self.assertEqual(
+                lines,
+                list(
+                    time_index.get_lines_in_pathname(
+                        pathname, self.reader, get_log=get_log
+                    )
+                ),
+            )
+        self.assertEqual(
+            [[EPOCH_START + minute * 60, minute * 80] for minute in range(0, 10, 2)],
+            time_index.TimeIndex.load(pathname).checkpoints,
+        )
+
+    def test_index_of_other_file_is_not_used(self):
+        pathname = str(self.path.joinpath("access.log"))
+        Path(pathname).write_text("\n".join(LINES) + "\n")
+        self._get_lines(pathname)
+        Path(pathname).write_text("\n".join(LINES[:5]) + "\n")
+        self.assertIsNone(time_index.TimeIndex.load(pathname))
+        self.assertEqual(LINES[:5], self._get_lines(pathname, EPOCH_START + 600, None))
+
+    def test_get_offsets(self):
+        index = time_index.TimeIndex(
+            "foo", checkpoints=[[0, 0], [300, 10], [600, 20], [900, 30]]
+        )
+        for time_start, time_end, expected_result in (
+            (None, None, (0, None)),
+            (601, None, (10, None)),
+            (901, 1000, (20, None)),
+            (0, 300, (0, 20)),
+        ):
+            with self.subTest(time_start=time_start, time_end=time_end):
+                self.assertEqual(
+                    expected_result, index.get_offsets(time_start, time_end)
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()